@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import redis
+
+from tma.core.settings import settings
+
+
+class CacheBackend:
+    """
+    A key-value store of serialized values (bytes) shared by the caches of the application: the measured data of
+    the specimen items, the parsed uploaded files and the analysis results.
+
+    Attributes:
+    - shared (bool): Whether the values are shared with the other workers of the deployment.
+    """
+    shared = False
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Returns the cached values of the keys, missing keys are left out.
+        """
+        raise NotImplementedError
+
+    def set_many(self, values: Dict[str, bytes]):
+        raise NotImplementedError
+
+    def delete(self, *keys: str):
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: bytes):
+        self.set_many({key: value})
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    The cache of a single worker: a dict with a memory budget, evicting the least recently used values and the
+    values older than the TTL.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: float = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_bytes <= 0 or ttl <= 0:
+            raise ValueError("Cache limits must be positive numbers.")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        result = {}
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    self._remove(key)
+                    continue
+                self._entries.move_to_end(key)
+                result[key] = value
+        return result
+
+    def set_many(self, values: Dict[str, bytes]):
+        with self._lock:
+            expires_at = self._clock() + self.ttl
+            for key, value in values.items():
+                self._remove(key)
+                if len(value) > self.max_bytes:
+                    continue
+                self._entries[key] = (value, expires_at)
+                self.size_bytes += len(value)
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[0])
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    The cache shared by all the workers of the deployment, stored in Redis with the TTL as expiry. The eviction
+    under the memory budget is left to the maxmemory policy of the Redis server.
+
+    The cache is best-effort: when Redis is unreachable, reads miss and writes are skipped.
+    """
+    shared = True
+
+    def __init__(self, client: redis.Redis, ttl: float = 3600, prefix: str = 'tma:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float = 3600) -> 'RedisCacheBackend':
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = self.client.mget([self.prefix + key for key in keys])
+        except redis.RedisError:
+            return {}
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, values: Dict[str, bytes]):
+        if not values:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(self.prefix + key, value, ex=int(self.ttl))
+            pipeline.execute()
+        except redis.RedisError:
+            pass
+
+    def delete(self, *keys: str):
+        if not keys:
+            return
+        try:
+            self.client.delete(*[self.prefix + key for key in keys])
+        except redis.RedisError:
+            pass
+
+
+@cache
+def get_cache_backend() -> CacheBackend:
+    """
+    Returns the cache backend chosen in the settings, created on first use.
+    """
+    if settings.cache_backend == 'redis':
+        if not settings.redis_dsn:
+            raise ValueError("The redis cache backend requires the redis_dsn setting.")
+        return RedisCacheBackend.from_url(settings.redis_dsn, settings.cache_ttl)
+    return MemoryCacheBackend(settings.cache_max_bytes, settings.cache_ttl)
+
+
+def measured_data_key(specimen_item_id: int) -> str:
+    return f'measured_data:{specimen_item_id}'
+
+
+def parsed_file_key(digest: str) -> str:
+    return f'parsed_file:{digest}'
+
+
+def analysis_key(digest: str) -> str:
+    return f'analysis:{digest}'
@@ -1,20 +1,161 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+from functools import cache
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from tma.core.settings import settings
 
-engine = create_engine(settings.pg_dsn)
+
+def get_database_url() -> str:
+    """
+    Returns the URL of the database selected by the settings.
+    """
+    if settings.database_backend == 'sqlite':
+        if settings.sqlite_path == ':memory:':
+            return 'sqlite://'
+        return f'sqlite:///{settings.sqlite_path}'
+    return settings.pg_dsn
+
+
+def is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def create_database_engine(url: str) -> Engine:
+    """
+    Creates the engine of a PostgreSQL or SQLite database.
+
+    An in-memory SQLite database exists only in the connection that opened it, so all the sessions share one
+    connection. A file database is opened in WAL mode, see _set_sqlite_pragmas.
+    """
+    if not is_sqlite(url):
+        return create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+        )
+
+    # The sessions of the Solara kernels run in several threads, SQLite serializes their writes
+    connect_args = {'check_same_thread': False, 'timeout': settings.db_pool_timeout}
+    if make_url(url).database in (None, '', ':memory:'):
+        sqlite_engine = create_engine(url, poolclass=StaticPool, connect_args=connect_args)
+    else:
+        sqlite_engine = create_engine(url, poolclass=QueuePool, pool_size=settings.db_pool_size,
+                                      max_overflow=settings.db_max_overflow, connect_args=connect_args)
+    event.listen(sqlite_engine, 'connect', _set_sqlite_pragmas)
+    return sqlite_engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    In WAL mode the readers are not blocked by a write, and with synchronous=NORMAL a commit appends to the log
+    without waiting for the disk, so the batched writes of the repositories and of the write-behind queue cost one
+    cheap commit each. SQLite enforces the foreign keys, and their cascades, only when asked.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute(f'PRAGMA cache_size=-{settings.sqlite_cache_kib}')
+    cursor.close()
+
+
+engine = create_database_engine(get_database_url())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_session_scope():
+    """
+    Returns the key of the current session scope: the Solara kernel (one per browser tab) and the thread.
+    Outside of Solara, every thread gets its own session.
+    """
+    try:
+        import solara.server.kernel_context
+        context_id = solara.server.kernel_context.get_current_context().id
+    except Exception:
+        context_id = None
+    return context_id, threading.get_ident()
+
+
+# Sessions are not thread-safe, so every Solara kernel and thread works with its own session
+Session = scoped_session(SessionLocal, scopefunc=get_session_scope)
+
 Base = declarative_base()
 
 
+def get_async_dsn(dsn: str) -> str:
+    """
+    Returns the DSN with the asyncio driver: psycopg 3, or aiosqlite for SQLite.
+    """
+    if is_sqlite(dsn):
+        return make_url(dsn).set(drivername='sqlite+aiosqlite').render_as_string(hide_password=False)
+    return make_url(dsn).set(drivername='postgresql+psycopg').render_as_string(hide_password=False)
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the engine of the asyncio repositories, created on first use with the same pool settings.
+    With SQLite it needs the aiosqlite package and a database file, an in-memory database is not shared with it.
+    """
+    url = get_database_url()
+    if is_sqlite(url):
+        async_engine = create_async_engine(get_async_dsn(url), connect_args={'timeout': settings.db_pool_timeout})
+        event.listen(async_engine.sync_engine, 'connect', _set_sqlite_pragmas)
+        return async_engine
+    return create_async_engine(
+        get_async_dsn(url),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+def async_session() -> AsyncSession:
+    """
+    Opens a new AsyncSession. An AsyncSession must not be shared by concurrent tasks,
+    so every task awaiting the database opens its own.
+    """
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)()
+
+
+def close_sessions(context_id) -> int:
+    """
+    Closes the sessions of a Solara kernel and returns their connections to the pool.
+
+    Returns:
+    - The number of closed sessions.
+    """
+    registry = Session.registry.registry
+    scopes = [scope for scope in list(registry) if scope[0] == context_id]
+    for scope in scopes:
+        session = registry.pop(scope, None)
+        if session is not None:
+            session.close()
+    return len(scopes)
+
+
 def create_database() -> None:
-    with engine.begin() as session:
-        Base.metadata.create_all(session)
+    """
+    Creates the schema or migrates it to the latest revision, see tma.core.model.migrations.upgrade.
+    """
+    from tma.core.model.migrations.upgrade import upgrade_database
+    upgrade_database(engine)
 
 
 def drop_database() -> None:
     with engine.begin() as session:
         Base.metadata.drop_all(session)
+        session.execute(text('DROP TABLE IF EXISTS alembic_version'))
@@ -0,0 +1,175 @@
+import struct
+import zlib
+from typing import Dict, Optional, Iterable
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'TMAC'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBBB')
+_ARRAY_HEADER = struct.Struct('<BI')
+
+_DTYPES = {'float64': (0, np.dtype('<f8')), 'float32': (1, np.dtype('<f4'))}
+_DTYPES_BY_CODE = {code: dtype for code, dtype in _DTYPES.values()}
+_COMPRESSIONS = {None: 0, 'zlib': 1, 'zstd': 2}
+
+_SEPARATOR = '/'
+_PHASES = ('increasing', 'decreasing')
+
+
+def encode_columns(arrays: Dict[str, np.ndarray], dtype: str = 'float64', compression: Optional[str] = None) -> bytes:
+    """
+    Packs named numeric arrays into one binary blob.
+
+    The blob starts with a small header (magic, version, dtype, compression and the name and length of every array)
+    followed by the little-endian values of all the arrays laid out one after another.
+
+    Parameters:
+    - arrays (dict): The arrays to pack, e.g. {'increasing': [...], 'decreasing': [...]}.
+    - dtype (str): 'float64' or 'float32'.
+    - compression (str): None, 'zlib' or 'zstd'.
+
+    Returns:
+    - The encoded blob.
+    """
+    if dtype not in _DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype}. Allowed dtypes: {', '.join(_DTYPES)}.")
+    if compression not in _COMPRESSIONS:
+        raise ValueError(f"Unsupported compression {compression}.")
+    dtype_code, numpy_dtype = _DTYPES[dtype]
+
+    header = [_HEADER.pack(MAGIC, VERSION, dtype_code, _COMPRESSIONS[compression], len(arrays))]
+    payload = []
+    for name, values in arrays.items():
+        encoded_name = name.encode('utf-8')
+        values = np.ascontiguousarray(values, dtype=numpy_dtype)
+        header.append(_ARRAY_HEADER.pack(len(encoded_name), values.size))
+        header.append(encoded_name)
+        payload.append(values.tobytes())
+
+    return b''.join(header) + _compress(b''.join(payload), compression)
+
+
+def decode_columns(blob, names: Optional[Iterable[str]] = None, writable: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Unpacks a blob written by encode_columns.
+
+    Uncompressed blobs are read without copying, the arrays are read-only views into the blob. With writable=True
+    the payload is copied once into a buffer shared by all the arrays.
+
+    Parameters:
+    - blob (bytes or memoryview): The encoded blob.
+    - names (iterable): The names of the arrays to unpack, all of them if None.
+    - writable (bool): Whether the returned arrays can be modified in place.
+
+    Returns:
+    - A dict of arrays keyed by name.
+    """
+    buffer = memoryview(blob)
+    magic, version, dtype_code, compression_code, array_count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a measured data blob.")
+    numpy_dtype = _DTYPES_BY_CODE[dtype_code]
+
+    offset = _HEADER.size
+    layout = []
+    for _ in range(array_count):
+        name_length, count = _ARRAY_HEADER.unpack_from(buffer, offset)
+        offset += _ARRAY_HEADER.size
+        name = bytes(buffer[offset:offset + name_length]).decode('utf-8')
+        offset += name_length
+        layout.append((name, count))
+
+    payload = buffer[offset:]
+    if compression_code:
+        payload = _decompress(payload, compression_code)
+    if writable:
+        payload = bytearray(payload)
+
+    names = None if names is None else set(names)
+    result = {}
+    position = 0
+    for name, count in layout:
+        if names is None or name in names:
+            result[name] = np.frombuffer(payload, dtype=numpy_dtype, count=count, offset=position)
+        position += count * numpy_dtype.itemsize
+    return result
+
+
+def encode_measurement(measured_data: Dict[str, Dict[str, np.ndarray]], dtype: str = 'float64',
+                       compression: Optional[str] = None) -> bytes:
+    """
+    Packs all the columns of a measurement, both phases, into one blob.
+
+    The header of the blob is the column directory: every curve is stored under the name 'column/phase'.
+
+    Parameters:
+    - measured_data (dict): The curves keyed by column and phase, as returned by Measurement.get_measured_data.
+
+    Returns:
+    - The encoded blob.
+    """
+    arrays = {}
+    for column, phases in measured_data.items():
+        for phase, values in phases.items():
+            arrays[_curve_name(column, phase)] = values
+    return encode_columns(arrays, dtype, compression)
+
+
+def decode_measurement(blob, columns: Optional[Iterable[str]] = None,
+                       writable: bool = False) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Unpacks a blob written by encode_measurement.
+
+    Parameters:
+    - blob (bytes or memoryview): The encoded blob.
+    - columns (iterable): The columns to unpack, all of them if None.
+    - writable (bool): Whether the returned arrays can be modified in place.
+
+    Returns:
+    - The curves keyed by column and phase.
+    """
+    columns = None if columns is None else set(columns)
+    names = None
+    if columns is not None:
+        names = {_curve_name(column, phase) for column in columns for phase in _PHASES}
+
+    result = {}
+    for name, values in decode_columns(blob, names, writable).items():
+        column, _, phase = name.rpartition(_SEPARATOR)
+        result.setdefault(column, {})[phase] = values
+    return result
+
+
+def _curve_name(column: str, phase: str) -> str:
+    return f'{column}{_SEPARATOR}{phase}'
+
+
+def is_encoded(blob) -> bool:
+    return blob is not None and bytes(memoryview(blob)[:len(MAGIC)]) == MAGIC
+
+
+def _compress(payload: bytes, compression: Optional[str]) -> bytes:
+    if compression == 'zlib':
+        return zlib.compress(payload)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package.")
+        return zstandard.ZstdCompressor().compress(payload)
+    return payload
+
+
+def _decompress(payload, compression_code: int) -> bytes:
+    if compression_code == _COMPRESSIONS['zlib']:
+        return zlib.decompress(payload)
+    if compression_code == _COMPRESSIONS['zstd']:
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package.")
+        return zstandard.ZstdDecompressor().decompress(bytes(payload))
+    raise ValueError(f"Unsupported compression code {compression_code}.")
@@ -0,0 +1,124 @@
+import argparse
+import json
+
+from sqlalchemy import inspect, text, LargeBinary
+from sqlalchemy.engine import Connection, Engine
+
+from tma.core.model.column_codec import encode_columns, decode_columns
+
+TABLE_NAME = 'measured_data'
+BLOB_COLUMN = 'data_blob'
+
+
+def add_binary_column(connection: Connection) -> bool:
+    """
+    Adds the data_blob column to a measured_data table created before binary storage existed.
+
+    Returns:
+    - True if the column was added, False if it already exists.
+    """
+    inspector = inspect(connection)
+    if not inspector.has_table(TABLE_NAME):
+        return False
+    if BLOB_COLUMN in {column['name'] for column in inspector.get_columns(TABLE_NAME)}:
+        return False
+    column_type = LargeBinary().compile(dialect=connection.dialect)
+    connection.execute(text(f'ALTER TABLE {TABLE_NAME} ADD COLUMN {BLOB_COLUMN} {column_type}'))
+    return True
+
+
+def convert_to_binary(engine: Engine, batch_size: int = 500, dtype: str = 'float64', compression=None) -> int:
+    """
+    Rewrites the JSON measured data as binary blobs, one transaction per batch, so the conversion
+    can be stopped and resumed.
+
+    Parameters:
+    - engine (Engine): The database engine.
+    - batch_size (int): The number of records converted per transaction.
+    - dtype (str): The dtype of the stored values, 'float64' or 'float32'.
+    - compression (str): None, 'zlib' or 'zstd'.
+
+    Returns:
+    - The number of converted records.
+    """
+    with engine.begin() as connection:
+        add_binary_column(connection)
+
+    converted = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text(f'SELECT measurement_data_id, data FROM {TABLE_NAME} '
+                     f'WHERE {BLOB_COLUMN} IS NULL AND data IS NOT NULL '
+                     f'ORDER BY measurement_data_id LIMIT :limit'),
+                {'limit': batch_size}
+            ).all()
+            if not rows:
+                return converted
+            updates = [
+                {'measurement_data_id': measurement_data_id,
+                 'data_blob': encode_columns(load_json(data), dtype, compression)}
+                for measurement_data_id, data in rows
+            ]
+            connection.execute(
+                text(f'UPDATE {TABLE_NAME} SET {BLOB_COLUMN} = :data_blob, data = NULL '
+                     f'WHERE measurement_data_id = :measurement_data_id'),
+                updates
+            )
+            converted += len(updates)
+
+
+def convert_to_json(engine: Engine, batch_size: int = 500) -> int:
+    """
+    Reverts convert_to_binary, writing the binary blobs back as JSON.
+
+    Returns:
+    - The number of converted records.
+    """
+    converted = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text(f'SELECT measurement_data_id, {BLOB_COLUMN} FROM {TABLE_NAME} '
+                     f'WHERE {BLOB_COLUMN} IS NOT NULL ORDER BY measurement_data_id LIMIT :limit'),
+                {'limit': batch_size}
+            ).all()
+            if not rows:
+                return converted
+            updates = [
+                {'measurement_data_id': measurement_data_id,
+                 'data': json.dumps({key: value.tolist() for key, value in decode_columns(blob).items()})}
+                for measurement_data_id, blob in rows
+            ]
+            connection.execute(
+                text(f'UPDATE {TABLE_NAME} SET data = :data, {BLOB_COLUMN} = NULL '
+                     f'WHERE measurement_data_id = :measurement_data_id'),
+                updates
+            )
+            converted += len(updates)
+
+
+def load_json(data):
+    # The JSON type returns parsed values on PostgreSQL, raw text elsewhere
+    return json.loads(data) if isinstance(data, str) else data
+
+
+def main():
+    from tma.core.database import engine
+    from tma.core.settings import settings
+
+    parser = argparse.ArgumentParser(description='Convert the stored measured data between JSON and binary.')
+    parser.add_argument('direction', choices=['binary', 'json'])
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.direction == 'binary':
+        converted = convert_to_binary(engine, args.batch_size, settings.measured_data_dtype,
+                                      settings.measured_data_compression)
+    else:
+        converted = convert_to_json(engine, args.batch_size)
+    print(f'Converted {converted} measured data records.')
+
+
+if __name__ == '__main__':
+    main()
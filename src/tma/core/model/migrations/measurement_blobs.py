@@ -0,0 +1,79 @@
+import argparse
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+from tma.core.model.column_codec import encode_measurement, decode_columns
+from tma.core.model.migrations.binary_measured_data import add_binary_column, load_json
+
+
+def convert_to_measurement_blobs(engine: Engine, batch_size: int = 100, dtype: str = 'float64',
+                                 compression=None) -> int:
+    """
+    Packs the measured_data rows of every measurement into one measurement_blobs row, one transaction per batch
+    of measurements. Measurements that already have a blob are skipped, so the conversion can be resumed.
+    The measured_data rows are left in place.
+
+    Parameters:
+    - engine (Engine): The database engine.
+    - batch_size (int): The number of measurements converted per transaction.
+    - dtype (str): The dtype of the stored values, 'float64' or 'float32'.
+    - compression (str): None, 'zlib' or 'zstd'.
+
+    Returns:
+    - The number of converted measurements.
+    """
+    with engine.begin() as connection:
+        add_binary_column(connection)
+
+    converted = 0
+    while True:
+        with engine.begin() as connection:
+            measurement_ids = connection.execute(
+                text('SELECT DISTINCT measured_data.measurement_id FROM measured_data '
+                     'LEFT JOIN measurement_blobs ON measurement_blobs.measurement_id = measured_data.measurement_id '
+                     'WHERE measurement_blobs.measurement_id IS NULL '
+                     'ORDER BY measured_data.measurement_id LIMIT :limit'),
+                {'limit': batch_size}
+            ).scalars().all()
+            if not measurement_ids:
+                return converted
+
+            rows = connection.execute(
+                text('SELECT measurement_id, specimen_item_id, column_name, data, data_blob FROM measured_data '
+                     'WHERE measurement_id IN :measurement_ids').bindparams(
+                    bindparam('measurement_ids', expanding=True)),
+                {'measurement_ids': measurement_ids}
+            ).all()
+            measurements = {}
+            for measurement_id, specimen_item_id, column_name, data, data_blob in rows:
+                curves = decode_columns(data_blob) if data is None else load_json(data)
+                measurement = measurements.setdefault(measurement_id, (specimen_item_id, {}))
+                measurement[1][column_name] = curves
+
+            connection.execute(
+                text('INSERT INTO measurement_blobs (measurement_id, specimen_item_id, data) '
+                     'VALUES (:measurement_id, :specimen_item_id, :data)'),
+                [{'measurement_id': measurement_id, 'specimen_item_id': specimen_item_id,
+                  'data': encode_measurement(measured_data, dtype, compression)}
+                 for measurement_id, (specimen_item_id, measured_data) in measurements.items()]
+            )
+            converted += len(measurements)
+
+
+def main():
+    from tma.core.database import engine, create_database
+    from tma.core.settings import settings
+
+    parser = argparse.ArgumentParser(description='Convert the stored measured data to one row per measurement.')
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    create_database()
+    converted = convert_to_measurement_blobs(engine, args.batch_size, settings.measured_data_dtype,
+                                             settings.measured_data_compression)
+    print(f'Converted {converted} measurements.')
+
+
+if __name__ == '__main__':
+    main()
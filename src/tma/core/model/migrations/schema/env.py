@@ -0,0 +1,41 @@
+from alembic import context
+
+from tma.core.database import Base, create_database_engine, get_database_url
+# The models register their tables in Base.metadata
+from tma.core.model.models import curie_point, measurement, measurement_blob, measurement_content, \
+    measurement_data, sample, specimen_item, user  # noqa: F401
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(url=config.get_main_option('sqlalchemy.url') or get_database_url(),
+                      target_metadata=target_metadata, literal_binds=True, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # upgrade_database passes its connection, the alembic command line connects with the settings
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
+    engine = create_database_engine(config.get_main_option('sqlalchemy.url') or get_database_url())
+    with engine.begin() as connection:
+        _run_migrations(connection)
+    engine.dispose()
+
+
+def _run_migrations(connection):
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
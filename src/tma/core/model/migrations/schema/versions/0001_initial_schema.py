@@ -0,0 +1,70 @@
+"""Initial schema, as created by create_database before the migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('session_id', sa.String(255), nullable=False),
+        sa.UniqueConstraint('session_id', name='unique_session_id'),
+    )
+    op.create_table(
+        'samples',
+        sa.Column('sample_id', sa.Integer, primary_key=True),
+        sa.Column('user_id', sa.Integer, nullable=False),
+        sa.Column('x_column', sa.String(255), nullable=False),
+        sa.Column('y_column', sa.String(255), nullable=False),
+        sa.Column('selected_file_index', sa.Integer, nullable=False),
+        sa.Column('name', sa.String(255)),
+    )
+    op.create_table(
+        'specimenitems',
+        sa.Column('specimen_item_id', sa.Integer, primary_key=True),
+        sa.Column('sample_id', sa.Integer, nullable=False),
+        sa.Column('filename', sa.String(255)),
+        sa.Column('uploaded', sa.Boolean),
+        sa.Column('file_extension', sa.String(255)),
+        sa.Column('is_empty_source', sa.Boolean),
+        sa.UniqueConstraint('sample_id', 'filename', name='unique_sample_id_filename'),
+    )
+    op.create_table(
+        'measurements',
+        sa.Column('measurement_id', sa.Integer, primary_key=True),
+        sa.Column('specimen_item_id', sa.Integer, nullable=False),
+        sa.Column('measurement_type', sa.String(255), nullable=False),
+        sa.Column('columns', sa.JSON),
+    )
+    op.create_table(
+        'measured_data',
+        sa.Column('measurement_data_id', sa.Integer, primary_key=True),
+        sa.Column('measurement_id', sa.Integer, nullable=False),
+        sa.Column('specimen_item_id', sa.Integer, nullable=False),
+        sa.Column('column_name', sa.String(255), nullable=False),
+        sa.Column('data', sa.JSON),
+    )
+    op.create_table(
+        'curie_points',
+        sa.Column('curie_point_id', sa.Integer, primary_key=True),
+        sa.Column('specimen_item_id', sa.Integer, nullable=False),
+        sa.Column('column_name', sa.String(255), nullable=False),
+        sa.Column('id_plot_selected', sa.Integer, nullable=False),
+        sa.Column('temperature_value', sa.Float, nullable=False),
+        sa.Column('magnetization_value', sa.Float, nullable=False),
+    )
+
+
+def downgrade():
+    for table_name in ('curie_points', 'measured_data', 'measurements', 'specimenitems', 'samples', 'users'):
+        op.drop_table(table_name)
@@ -0,0 +1,37 @@
+"""Binary measured data: the measured_data.data_blob column and the measurement_blobs table
+
+Both were created by create_database before the migrations, so they are only added when missing.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'data_blob' not in {column['name'] for column in inspector.get_columns('measured_data')}:
+        op.add_column('measured_data', sa.Column('data_blob', sa.LargeBinary))
+
+    if not inspector.has_table('measurement_blobs'):
+        op.create_table(
+            'measurement_blobs',
+            sa.Column('measurement_id', sa.Integer, primary_key=True, autoincrement=False),
+            sa.Column('specimen_item_id', sa.Integer, nullable=False),
+            sa.Column('data', sa.LargeBinary, nullable=False),
+        )
+        op.create_index('ix_measurement_blobs_specimen_item_id', 'measurement_blobs', ['specimen_item_id'])
+
+
+def downgrade():
+    op.drop_index('ix_measurement_blobs_specimen_item_id', table_name='measurement_blobs')
+    op.drop_table('measurement_blobs')
+    with op.batch_alter_table('measured_data') as batch_op:
+        batch_op.drop_column('data_blob')
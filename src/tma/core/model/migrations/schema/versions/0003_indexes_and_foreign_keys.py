@@ -0,0 +1,54 @@
+"""Indexes on the lookup columns and foreign keys between the tables
+
+users.session_id and specimenitems.sample_id are already served by the indexes of their unique constraints.
+Deleting a row deletes the rows that reference it. On PostgreSQL the foreign keys are created NOT VALID, so rows
+left behind by earlier versions do not block the upgrade; only new and updated rows are checked.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('samples', 'user_id'),
+    ('measurements', 'specimen_item_id'),
+    ('measured_data', 'measurement_id'),
+    ('measured_data', 'specimen_item_id'),
+    ('curie_points', 'specimen_item_id'),
+]
+
+FOREIGN_KEYS = [
+    ('samples', 'user_id', 'users'),
+    ('specimenitems', 'sample_id', 'samples'),
+    ('measurements', 'specimen_item_id', 'specimenitems'),
+    ('measured_data', 'measurement_id', 'measurements'),
+    ('measured_data', 'specimen_item_id', 'specimenitems'),
+    ('measurement_blobs', 'measurement_id', 'measurements'),
+    ('measurement_blobs', 'specimen_item_id', 'specimenitems'),
+    ('curie_points', 'specimen_item_id', 'specimenitems'),
+]
+
+
+def upgrade():
+    for table_name, column in INDEXES:
+        op.create_index(f'ix_{table_name}_{column}', table_name, [column])
+
+    for table_name, column, referent_table in FOREIGN_KEYS:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.create_foreign_key(f'fk_{table_name}_{column}', referent_table, [column], [column],
+                                        ondelete='CASCADE', postgresql_not_valid=True)
+
+
+def downgrade():
+    for table_name, column, _ in reversed(FOREIGN_KEYS):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_constraint(f'fk_{table_name}_{column}', type_='foreignkey')
+
+    for table_name, column in reversed(INDEXES):
+        op.drop_index(f'ix_{table_name}_{column}', table_name=table_name)
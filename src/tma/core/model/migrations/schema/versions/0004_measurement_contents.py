@@ -0,0 +1,38 @@
+"""Content-addressed storage of uploaded files: the measurement_contents table and measurements.content_hash
+
+An uploaded file is stored once in measurement_contents, keyed by the hash of its bytes, and referenced by the
+measurements parsed from it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'measurement_contents',
+        sa.Column('content_hash', sa.String(64), primary_key=True),
+        sa.Column('data', sa.LargeBinary, nullable=False),
+        sa.Column('ref_count', sa.Integer, nullable=False),
+    )
+    with op.batch_alter_table('measurements') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(64)))
+        batch_op.create_index('ix_measurements_content_hash', ['content_hash'])
+        batch_op.create_foreign_key('fk_measurements_content_hash', 'measurement_contents', ['content_hash'],
+                                    ['content_hash'])
+
+
+def downgrade():
+    with op.batch_alter_table('measurements') as batch_op:
+        batch_op.drop_constraint('fk_measurements_content_hash', type_='foreignkey')
+        batch_op.drop_index('ix_measurements_content_hash')
+        batch_op.drop_column('content_hash')
+    op.drop_table('measurement_contents')
@@ -0,0 +1,94 @@
+import argparse
+from contextlib import contextmanager
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+SCRIPT_LOCATION = Path(__file__).resolve().parent / 'schema'
+
+# The revision of the schema created by create_database before the migrations existed
+INITIAL_REVISION = '0001'
+
+
+def get_alembic_config() -> Config:
+    config = Config()
+    config.set_main_option('script_location', str(SCRIPT_LOCATION))
+    return config
+
+
+def get_current_revision(engine: Engine):
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def upgrade_database(engine: Engine, revision: str = 'head') -> None:
+    """
+    Migrates the database to the revision. A database created by create_database before the migrations existed
+    is first stamped with the initial revision, the later revisions add what it is missing.
+
+    Parameters:
+    - engine (Engine): The database engine.
+    - revision (str): The target revision, the latest one by default.
+    """
+    config = get_alembic_config()
+    with _migration_connection(engine) as connection:
+        config.attributes['connection'] = connection
+        inspector = inspect(connection)
+        if inspector.has_table('users') and not inspector.has_table('alembic_version'):
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, revision)
+
+
+def downgrade_database(engine: Engine, revision: str) -> None:
+    config = get_alembic_config()
+    with _migration_connection(engine) as connection:
+        config.attributes['connection'] = connection
+        command.downgrade(config, revision)
+
+
+@contextmanager
+def _migration_connection(engine: Engine):
+    """
+    Opens the connection of a migration, in one transaction.
+
+    On SQLite a migration recreates the altered tables, and dropping a table with the foreign keys enforced would
+    run the cascades of its rows, so they are not enforced during the migration.
+    """
+    with engine.connect() as connection:
+        if engine.dialect.name != 'sqlite':
+            with connection.begin():
+                yield connection
+            return
+
+        foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+        connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+        connection.commit()
+        try:
+            with connection.begin():
+                yield connection
+        finally:
+            connection.exec_driver_sql(f'PRAGMA foreign_keys={foreign_keys}')
+            connection.commit()
+
+
+def main():
+    from tma.core.database import engine
+
+    parser = argparse.ArgumentParser(description='Migrate the database schema.')
+    parser.add_argument('revision', nargs='?', default='head')
+    parser.add_argument('--downgrade', action='store_true', help='Downgrade to the revision instead.')
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade_database(engine, args.revision)
+    else:
+        upgrade_database(engine, args.revision)
+    print(f'The database is at revision {get_current_revision(engine)}.')
+
+
+if __name__ == '__main__':
+    main()
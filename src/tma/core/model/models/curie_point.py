@@ -1,14 +1,18 @@
-from sqlalchemy import Column, Integer, Float, String
+from sqlalchemy import Column, Integer, Float, String, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 
 from tma.core.database import Base
+from tma.core.model.models.specimen_item import SpecimenItem  # noqa: F401, the referenced table
 
 
 class CuriePoint(Base):
     __tablename__ = 'curie_points'
 
     curie_point_id = Column(Integer, primary_key=True)
-    specimen_item_id = Column(Integer, nullable=False)
+    specimen_item_id = Column(
+        Integer,
+        ForeignKey('specimenitems.specimen_item_id', name='fk_curie_points_specimen_item_id', ondelete='CASCADE'),
+        nullable=False, index=True)
     column_name = Column(String(255), nullable=False)
     id_plot_selected = Column(Integer, nullable=False, default=0)
     temperature_value = Column(Float, nullable=False, default=0.0)
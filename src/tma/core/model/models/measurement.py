@@ -3,14 +3,25 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 from tma.core.database import Base
+from tma.core.model.models.measurement_content import MeasurementContent  # noqa: F401, the referenced table
+from tma.core.model.models.specimen_item import SpecimenItem  # noqa: F401, the referenced table
 
 
 class Measurement(Base):
     __tablename__ = 'measurements'
 
     measurement_id = Column(Integer, primary_key=True)
-    specimen_item_id = Column(Integer, nullable=False)
+    specimen_item_id = Column(
+        Integer,
+        ForeignKey('specimenitems.specimen_item_id', name='fk_measurements_specimen_item_id', ondelete='CASCADE'),
+        nullable=False, index=True)
     measurement_type = Column(String(255), nullable=False)
     columns = Column(JSON)
+    # Set for an uploaded file stored once for all its uploads, the measured data records of the measurement
+    # then only hold the columns edited since
+    content_hash = Column(
+        String(64),
+        ForeignKey('measurement_contents.content_hash', name='fk_measurements_content_hash'),
+        index=True)
 
     # specimen_item = relationship("SpecimenItem", back_populates="measurements")
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey
+
+from tma.core.database import Base
+from tma.core.model.models.measurement import Measurement  # noqa: F401, the referenced table
+
+
+class MeasurementBlob(Base):
+    __tablename__ = 'measurement_blobs'
+
+    measurement_id = Column(
+        Integer,
+        ForeignKey('measurements.measurement_id', name='fk_measurement_blobs_measurement_id', ondelete='CASCADE'),
+        primary_key=True, autoincrement=False)
+    specimen_item_id = Column(
+        Integer,
+        ForeignKey('specimenitems.specimen_item_id', name='fk_measurement_blobs_specimen_item_id', ondelete='CASCADE'),
+        nullable=False, index=True)
+    # All the columns of the measurement written by tma.core.model.column_codec.encode_measurement
+    data = Column(LargeBinary, nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, LargeBinary, String
+
+from tma.core.database import Base
+
+
+class MeasurementContent(Base):
+    __tablename__ = 'measurement_contents'
+
+    # SHA-256 of the uploaded file, measurements parsed from the same bytes share the row
+    content_hash = Column(String(64), primary_key=True)
+    # All the columns of the parsed file written by tma.core.model.column_codec.encode_measurement
+    data = Column(LargeBinary, nullable=False)
+    # The number of measurements referencing the row, it is deleted with the last one
+    ref_count = Column(Integer, nullable=False, default=0)
@@ -1,18 +1,27 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, JSON
+from sqlalchemy import Column, Integer, ForeignKey, String, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 from tma.core.database import Base
+from tma.core.model.models.measurement import Measurement  # noqa: F401, the referenced table
 
 
 class MeasuredData(Base):
     __tablename__ = 'measured_data'
 
     measurement_data_id = Column(Integer, primary_key=True)
-    measurement_id = Column(Integer, nullable=False)
-    specimen_item_id = Column(Integer, nullable=False)
+    measurement_id = Column(
+        Integer,
+        ForeignKey('measurements.measurement_id', name='fk_measured_data_measurement_id', ondelete='CASCADE'),
+        nullable=False, index=True)
+    specimen_item_id = Column(
+        Integer,
+        ForeignKey('specimenitems.specimen_item_id', name='fk_measured_data_specimen_item_id', ondelete='CASCADE'),
+        nullable=False, index=True)
     column_name = Column(String(255), nullable=False)
     data = Column(JSON)
+    # Binary columns written by tma.core.model.column_codec, used instead of data when set
+    data_blob = Column(LargeBinary)
 
     # Relationship to Measurement
     # measurement = relationship("Measurement", back_populates="measured_data")
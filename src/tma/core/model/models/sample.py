@@ -1,13 +1,17 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, ForeignKey
 
 from tma.core.database import Base
+from tma.core.model.models.user import User  # noqa: F401, the referenced table
 
 
 class Sample(Base):
     __tablename__ = 'samples'
 
     sample_id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, nullable=False)
+    user_id = Column(
+        Integer,
+        ForeignKey('users.user_id', name='fk_samples_user_id', ondelete='CASCADE'),
+        nullable=False, index=True)
     x_column = Column(String(255), nullable=False, default='')
     y_column = Column(String(255), nullable=False, default='')
     selected_file_index = Column(Integer, nullable=False, default=0)
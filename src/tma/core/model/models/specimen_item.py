@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, UniqueConstraint, ForeignKey
 
 from tma.core.database import Base
+from tma.core.model.models.sample import Sample  # noqa: F401, the referenced table
 
 
 class SpecimenItem(Base):
     __tablename__ = 'specimenitems'
 
     specimen_item_id = Column(Integer, primary_key=True)
-    sample_id = Column(Integer, nullable=False)
+    # Looked up through the index of unique_sample_id_filename
+    sample_id = Column(
+        Integer,
+        ForeignKey('samples.sample_id', name='fk_specimenitems_sample_id', ondelete='CASCADE'),
+        nullable=False)
     filename = Column(String(255))
     uploaded = Column(Boolean, default=True)
     file_extension = Column(String(255))
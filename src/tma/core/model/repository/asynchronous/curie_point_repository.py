@@ -0,0 +1,85 @@
+from typing import Iterable, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.curie_point import CuriePoint
+
+
+class AsyncCuriePointRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_curie_point(
+        self,
+        specimen_item_id: int,
+        column_name: str,
+        id_plot_selected: int,
+        temperature_value: float,
+        magnetization_value: float
+    ):
+        """
+        Adds a new CuriePoint record to the database.
+        """
+        curie_point_model = CuriePoint(
+            specimen_item_id=specimen_item_id,
+            column_name=column_name,
+            id_plot_selected=id_plot_selected,
+            temperature_value=temperature_value,
+            magnetization_value=magnetization_value,
+        )
+        self.session.add(curie_point_model)
+        await self.session.commit()
+        return curie_point_model
+
+    async def get_curie_point(self, **filters) -> List[CuriePoint]:
+        """
+        Retrieves CuriePoint records based on variable filtering criteria.
+        """
+        query = select(CuriePoint)
+        for attr, value in filters.items():
+            query = query.where(getattr(CuriePoint, attr) == value)
+        return list(await self.session.scalars(query))
+
+    async def get_curie_points_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> List[CuriePoint]:
+        """
+        Retrieves the CuriePoint records of several specimen items with one query.
+        """
+        result = await self.session.scalars(
+            select(CuriePoint).where(CuriePoint.specimen_item_id.in_(list(specimen_item_ids))))
+        return list(result)
+
+    async def get_all_curie_points(self) -> List[CuriePoint]:
+        return list(await self.session.scalars(select(CuriePoint)))
+
+    async def update_curie_point(self, curie_point_id, **kwargs):
+        """
+        Updates specific fields of a CuriePoint record.
+        """
+        await self.session.execute(
+            update(CuriePoint).where(CuriePoint.curie_point_id == curie_point_id).values(**kwargs)
+            .execution_options(synchronize_session=False))
+        await self.session.commit()
+
+    async def delete_curie_point(self, curie_point_id):
+        """
+        Deletes a CuriePoint record from the database.
+        """
+        curie_point = await self.session.scalar(select(CuriePoint).where(CuriePoint.curie_point_id == curie_point_id))
+        if curie_point:
+            await self.session.delete(curie_point)
+            await self.session.commit()
+
+    async def delete_curie_points_many(self, curie_point_ids: Iterable[int]):
+        """
+        Deletes several CuriePoint records with one query and commits them in one transaction.
+        """
+        try:
+            await self.session.execute(
+                delete(CuriePoint).where(CuriePoint.curie_point_id.in_(list(curie_point_ids)))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
@@ -0,0 +1,19 @@
+from typing import Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.measurement_blob import MeasurementBlob
+
+
+class AsyncMeasurementBlobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_blob(self, measurement_id: int):
+        return await self.session.scalar(select(MeasurementBlob).where(MeasurementBlob.measurement_id == measurement_id))
+
+    async def get_blobs_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> List[MeasurementBlob]:
+        result = await self.session.scalars(
+            select(MeasurementBlob).where(MeasurementBlob.specimen_item_id.in_(list(specimen_item_ids))))
+        return list(result)
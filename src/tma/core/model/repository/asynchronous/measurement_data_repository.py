@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_data import MeasuredData
+
+
+class AsyncMeasuredDataRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_measured_data(self, **filters) -> List[MeasuredData]:
+        """
+        Retrieves measured data records based on variable filtering criteria.
+
+        Args:
+            **filters: Arbitrary keyword arguments for filtering data.
+        """
+        query = select(MeasuredData)
+        for attr, value in filters.items():
+            query = query.where(getattr(MeasuredData, attr) == value)
+        return list(await self.session.scalars(query))
+
+    async def get_measured_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> List[MeasuredData]:
+        result = await self.session.scalars(
+            select(MeasuredData).where(MeasuredData.specimen_item_id.in_(list(specimen_item_ids))))
+        return list(result)
+
+    async def create_measured_data(self, measurement_id: int, specimen_item_id: int, column_name: str, data,
+                                   data_blob=None):
+        new_data = MeasuredData(
+            measurement_id=measurement_id,
+            specimen_item_id=specimen_item_id,
+            column_name=column_name,
+            data=data,
+            data_blob=data_blob
+        )
+        self.session.add(new_data)
+        await self.session.commit()
+        return new_data
+
+    async def update_measured_data(self, measurement_data_id: int, **kwargs):
+        data_record = await self.session.scalar(
+            select(MeasuredData).where(MeasuredData.measurement_data_id == measurement_data_id))
+        if data_record:
+            for key, value in kwargs.items():
+                setattr(data_record, key, value)
+            await self.session.commit()
+            return data_record
+        return None
+
+    async def update_columns(self, measurement_id: int, columns: Dict[str, Dict]) -> List[str]:
+        """
+        Updates the given columns of a measurement without reading the records,
+        see MeasuredDataRepository.update_columns.
+        """
+        missing_columns = []
+        try:
+            for column_name, fields in columns.items():
+                result = await self.session.execute(
+                    update(MeasuredData)
+                    .where(MeasuredData.measurement_id == measurement_id, MeasuredData.column_name == column_name)
+                    .values(**fields)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    missing_columns.append(column_name)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return missing_columns
+
+    async def update_columns_many(self, columns_by_measurement: Dict[int, Dict[str, Dict]]) -> Dict[int, List[str]]:
+        """
+        Updates the given columns of several measurements in one transaction,
+        see MeasuredDataRepository.update_columns_many.
+        """
+        missing_columns = {}
+        try:
+            for measurement_id, columns in columns_by_measurement.items():
+                for column_name, fields in columns.items():
+                    result = await self.session.execute(
+                        update(MeasuredData)
+                        .where(MeasuredData.measurement_id == measurement_id, MeasuredData.column_name == column_name)
+                        .values(**fields)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
+                        missing_columns.setdefault(measurement_id, []).append(column_name)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return missing_columns
+
+    async def save_measured_data_many(self, updated_data: Dict[int, Dict], new_data: List[Dict],
+                                      measurement_updates: Dict[int, Dict]):
+        """
+        Applies the changes of several specimens and commits them in one transaction,
+        see MeasuredDataRepository.save_measured_data_many.
+        """
+        try:
+            if updated_data:
+                data_records = await self.session.scalars(
+                    select(MeasuredData).where(MeasuredData.measurement_data_id.in_(list(updated_data))))
+                for data_record in data_records:
+                    for key, value in updated_data[data_record.measurement_data_id].items():
+                        setattr(data_record, key, value)
+
+            self.session.add_all([MeasuredData(**fields) for fields in new_data])
+
+            if measurement_updates:
+                measurements = await self.session.scalars(
+                    select(Measurement).where(Measurement.measurement_id.in_(list(measurement_updates))))
+                for measurement in measurements:
+                    for key, value in measurement_updates[measurement.measurement_id].items():
+                        setattr(measurement, key, value)
+
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def delete_measured_data_by_measurement_id(self, measurement_id: int):
+        await self.session.execute(delete(MeasuredData).where(MeasuredData.measurement_id == measurement_id))
+        await self.session.commit()
+        return True
@@ -0,0 +1,23 @@
+from typing import Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.measurement import Measurement
+
+
+class AsyncMeasurementRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_measurement_by_id(self, measurement_id: int):
+        return await self.session.scalar(select(Measurement).where(Measurement.measurement_id == measurement_id))
+
+    async def get_measurement_by_specimen_item_id(self, specimen_item_id: int):
+        return await self.session.scalar(
+            select(Measurement).where(Measurement.specimen_item_id == specimen_item_id).limit(1))
+
+    async def get_measurements_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> List[Measurement]:
+        result = await self.session.scalars(
+            select(Measurement).where(Measurement.specimen_item_id.in_(list(specimen_item_ids))))
+        return list(result)
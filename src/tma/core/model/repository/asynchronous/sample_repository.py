@@ -0,0 +1,83 @@
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.curie_point import CuriePoint
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_blob import MeasurementBlob
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.models.sample import Sample
+from tma.core.model.models.specimen_item import SpecimenItem
+from tma.core.model.repository.asynchronous.measurement_content_repository import AsyncMeasurementContentRepository
+
+
+class AsyncSampleRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_sample_by_id(self, sample_id: int):
+        return await self.session.scalar(select(Sample).where(Sample.sample_id == sample_id))
+
+    async def get_sample_by_user_id(self, user_id: int):
+        return await self.session.scalar(select(Sample).where(Sample.user_id == user_id).limit(1))
+
+    async def create_sample(self, user_id: int, x_column: int, y_column: int, selected_file_index: int, name: str):
+        new_sample = Sample(
+            user_id=user_id,
+            x_column=x_column,
+            y_column=y_column,
+            selected_file_index=selected_file_index,
+            name=name
+        )
+        self.session.add(new_sample)
+        await self.session.commit()
+        return new_sample
+
+    async def update_sample(self, sample_id: int, **kwargs):
+        sample = await self.get_sample_by_id(sample_id)
+        if sample:
+            for key, value in kwargs.items():
+                setattr(sample, key, value)
+            await self.session.commit()
+            return sample
+        return None
+
+    async def delete_sample(self, sample_id: int):
+        sample = await self.get_sample_by_id(sample_id)
+        if sample:
+            await self.session.delete(sample)
+            await self.session.commit()
+            return True
+        return False
+
+    async def delete_sample_tree(self, sample_id: int) -> List[int]:
+        """
+        Deletes a sample with its specimen items, measurements, measured data and Curie points in one transaction,
+        with one DELETE per table, see SampleRepository.delete_sample_tree.
+
+        Args:
+            sample_id: The id of the sample.
+
+        Returns:
+            The ids of the deleted specimen items.
+        """
+        try:
+            specimen_item_ids = (await self.session.scalars(
+                select(SpecimenItem.specimen_item_id).where(SpecimenItem.sample_id == sample_id))).all()
+            if specimen_item_ids:
+                content_repository = AsyncMeasurementContentRepository(self.session)
+                await content_repository.release_references(specimen_item_ids)
+                for model in (CuriePoint, MeasuredData, MeasurementBlob, Measurement, SpecimenItem):
+                    await self.session.execute(
+                        delete(model).where(model.specimen_item_id.in_(specimen_item_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                await content_repository.collect_garbage()
+            await self.session.execute(
+                delete(Sample).where(Sample.sample_id == sample_id).execution_options(synchronize_session=False))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return list(specimen_item_ids)
@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.specimen_item import SpecimenItem
+from tma.core.model.repository.asynchronous.measurement_content_repository import AsyncMeasurementContentRepository
+
+
+class AsyncSpecimenItemRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, specimen_item_id: int):
+        return await self.session.scalar(select(SpecimenItem).where(SpecimenItem.specimen_item_id == specimen_item_id))
+
+    async def get_items_by_sample_id(self, sample_id: int) -> List[SpecimenItem]:
+        result = await self.session.scalars(select(SpecimenItem).where(SpecimenItem.sample_id == sample_id))
+        return list(result)
+
+    async def get_first_by_sample_id(self, sample_id: int):
+        return await self.session.scalar(select(SpecimenItem).where(SpecimenItem.sample_id == sample_id).limit(1))
+
+    async def get_by_sample_id_and_filename(self, sample_id: int, filename: str):
+        return await self.session.scalar(select(SpecimenItem).where(
+            SpecimenItem.sample_id == sample_id,
+            SpecimenItem.filename == filename
+        ))
+
+    async def create_specimen_item(self, sample_id: int, filename: str, file_extension: str, is_empty_source: bool):
+        try:
+            new_item = SpecimenItem(
+                sample_id=sample_id,
+                filename=filename,
+                file_extension=file_extension,
+                is_empty_source=is_empty_source
+            )
+            self.session.add(new_item)
+            await self.session.commit()
+            return new_item
+        except IntegrityError:
+            await self.session.rollback()
+            return None
+
+    async def create_specimen_items_many(self, records: List[Tuple[Dict, Dict, List[Dict]]], data_model,
+                                         contents: Optional[Dict[str, Tuple[bytes, int]]] = None):
+        """
+        Creates specimen items with their measurements and measured data in one transaction,
+        see SpecimenItemRepository.create_specimen_items_many.
+        """
+        try:
+            specimen_items = [SpecimenItem(**specimen_item_fields) for specimen_item_fields, _, _ in records]
+            self.session.add_all(specimen_items)
+            await self.session.flush()
+            await AsyncMeasurementContentRepository(self.session).add_references(contents or {})
+
+            measurements = [
+                Measurement(specimen_item_id=specimen_item.specimen_item_id, **measurement_fields)
+                for specimen_item, (_, measurement_fields, _) in zip(specimen_items, records)
+            ]
+            self.session.add_all(measurements)
+            await self.session.flush()
+
+            self.session.add_all([
+                data_model(measurement_id=measurement.measurement_id, specimen_item_id=specimen_item.specimen_item_id,
+                           **data_fields)
+                for specimen_item, measurement, (_, _, data_records) in zip(specimen_items, measurements, records)
+                for data_fields in data_records
+            ])
+            await self.session.commit()
+            return list(zip(specimen_items, measurements))
+        except IntegrityError:
+            await self.session.rollback()
+            return None
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def update_specimen_item(self, specimen_item_id: int, **kwargs):
+        item = await self.get_by_id(specimen_item_id)
+        if item:
+            for key, value in kwargs.items():
+                setattr(item, key, value)
+            await self.session.commit()
+            return item
+        return None
+
+    async def delete_specimen_item_by_sample_id(self, sample_id: int):
+        await self.session.execute(delete(SpecimenItem).where(SpecimenItem.sample_id == sample_id))
+        await self.session.commit()
+        return True
@@ -1,3 +1,6 @@
+from typing import Iterable
+
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
 from tma.core.model.models.curie_point import CuriePoint
@@ -44,6 +47,12 @@ class CuriePointRepository:
             query = query.filter(getattr(CuriePoint, attr) == value)
         return query
 
+    def get_curie_points_by_specimen_item_ids(self, specimen_item_ids):
+        """
+        Retrieves the CuriePoint records of several specimen items with one query.
+        """
+        return self.session.query(CuriePoint).filter(CuriePoint.specimen_item_id.in_(list(specimen_item_ids)))
+
     def get_all_curie_points(self):
         """
         Retrieves all CuriePoint records from the database.
@@ -65,3 +74,17 @@ class CuriePointRepository:
         if curie_point:
             self.session.delete(curie_point)
             self.session.commit()
+
+    def delete_curie_points_many(self, curie_point_ids: Iterable[int]):
+        """
+        Deletes several CuriePoint records with one query and commits them in one transaction.
+        """
+        try:
+            self.session.execute(
+                delete(CuriePoint).where(CuriePoint.curie_point_id.in_(list(curie_point_ids)))
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_blob import MeasurementBlob
+
+
+class MeasurementBlobRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_blob(self, measurement_id: int):
+        return self.session.query(MeasurementBlob).filter(MeasurementBlob.measurement_id == measurement_id).first()
+
+    def get_blobs_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]):
+        return self.session.query(MeasurementBlob).filter(
+            MeasurementBlob.specimen_item_id.in_(list(specimen_item_ids)))
+
+    def get_measurement_ids_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]):
+        return self.session.query(MeasurementBlob.specimen_item_id, MeasurementBlob.measurement_id).filter(
+            MeasurementBlob.specimen_item_id.in_(list(specimen_item_ids)))
+
+    def create_blob(self, measurement_id: int, specimen_item_id: int, data: bytes):
+        new_blob = MeasurementBlob(measurement_id=measurement_id, specimen_item_id=specimen_item_id, data=data)
+        self.session.add(new_blob)
+        self.session.commit()
+        return new_blob
+
+    def save_blobs(self, blobs: Dict[int, Tuple[int, bytes]], measurement_updates: Dict[int, Dict]):
+        """
+        Writes the blobs of several measurements and commits them in one transaction.
+
+        Args:
+            blobs: (specimen_item_id, data) keyed by measurement_id. Missing blobs are created.
+            measurement_updates: New field values of the measurements keyed by measurement_id.
+        """
+        try:
+            existing = self.session.query(MeasurementBlob).filter(MeasurementBlob.measurement_id.in_(list(blobs)))
+            existing = {blob.measurement_id: blob for blob in existing}
+            for measurement_id, (specimen_item_id, data) in blobs.items():
+                if measurement_id in existing:
+                    existing[measurement_id].data = data
+                else:
+                    self.session.add(MeasurementBlob(measurement_id=measurement_id,
+                                                     specimen_item_id=specimen_item_id, data=data))
+
+            if measurement_updates:
+                measurements = self.session.query(Measurement).filter(
+                    Measurement.measurement_id.in_(list(measurement_updates)))
+                for measurement in measurements:
+                    for key, value in measurement_updates[measurement.measurement_id].items():
+                        setattr(measurement, key, value)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def update_blob(self, measurement_id: int, data: bytes, columns) -> bool:
+        """
+        Overwrites the blob and the column list of a measurement without reading them.
+
+        Returns:
+            False if the measurement has no blob.
+        """
+        try:
+            result = self.session.execute(
+                update(MeasurementBlob).where(MeasurementBlob.measurement_id == measurement_id).values(data=data)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                self.session.rollback()
+                return False
+            self.session.execute(
+                update(Measurement).where(Measurement.measurement_id == measurement_id).values(columns=columns)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            return True
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def delete_blob(self, measurement_id: int):
+        blob = self.get_blob(measurement_id)
+        if blob:
+            self.session.delete(blob)
+            self.session.commit()
+            return True
+        return False
@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import bindparam, delete, exists, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_content import MeasurementContent
+
+
+class MeasurementContentRepository:
+    """
+    The uploaded files stored once for all their uploads. The methods that change references run in the
+    transaction of the caller, which commits it.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_contents(self, content_hashes: Iterable[str]):
+        return self.session.query(MeasurementContent).filter(
+            MeasurementContent.content_hash.in_(list(content_hashes)))
+
+    def add_references(self, contents: Dict[str, Tuple[bytes, int]]):
+        """
+        Stores the contents that are not stored yet and counts their new references.
+
+        Args:
+            contents: (data, number of new references) keyed by content_hash.
+        """
+        if not contents:
+            return
+        insert = postgresql.insert if self.session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+        self.session.execute(
+            insert(MeasurementContent)
+            .values([dict(content_hash=content_hash, data=data, ref_count=0)
+                     for content_hash, (data, _) in contents.items()])
+            .on_conflict_do_nothing(index_elements=['content_hash'])
+        )
+        table = MeasurementContent.__table__
+        self.session.execute(
+            update(table).where(table.c.content_hash == bindparam('hash'))
+            .values(ref_count=table.c.ref_count + bindparam('references')),
+            [dict(hash=content_hash, references=references) for content_hash, (_, references) in contents.items()])
+
+    def release_references(self, specimen_item_ids: Iterable[int]):
+        """
+        Uncounts the references of the measurements of the specimen items, before they are deleted.
+        """
+        specimen_item_ids = list(specimen_item_ids)
+        references = (
+            select(func.count())
+            .where(Measurement.content_hash == MeasurementContent.content_hash,
+                   Measurement.specimen_item_id.in_(specimen_item_ids))
+            .scalar_subquery()
+        )
+        self.session.execute(
+            update(MeasurementContent)
+            .where(MeasurementContent.content_hash.in_(
+                select(Measurement.content_hash).where(Measurement.specimen_item_id.in_(specimen_item_ids))))
+            .values(ref_count=MeasurementContent.ref_count - references)
+            .execution_options(synchronize_session=False)
+        )
+
+    def collect_garbage(self) -> int:
+        """
+        Deletes the contents without references. A content still referenced by a measurement is kept whatever
+        its count, since measurements deleted by the cascades of the database are not uncounted.
+
+        Returns:
+            The number of deleted contents.
+        """
+        result = self.session.execute(
+            delete(MeasurementContent)
+            .where(MeasurementContent.ref_count <= 0,
+                   ~exists().where(Measurement.content_hash == MeasurementContent.content_hash))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,5 +1,9 @@
+from typing import Dict, List, Iterable, Optional
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from tma.core.model.models.measurement import Measurement
 from tma.core.model.models.measurement_data import MeasuredData
 
 
@@ -23,12 +27,24 @@ class MeasuredDataRepository:
             query = query.filter(getattr(MeasuredData, attr) == value)
         return query
 
-    def create_measured_data(self, measurement_id: int, specimen_item_id: int, column_name: str, data):
+    def get_measured_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int],
+                                               columns: Optional[Iterable[str]] = None):
+        """
+        Retrieves the measured data records of several specimen items, of the given columns or of all of them.
+        """
+        query = self.session.query(MeasuredData).filter(MeasuredData.specimen_item_id.in_(list(specimen_item_ids)))
+        if columns is not None:
+            query = query.filter(MeasuredData.column_name.in_(list(columns)))
+        return query
+
+    def create_measured_data(self, measurement_id: int, specimen_item_id: int, column_name: str, data,
+                             data_blob=None):
         new_data = MeasuredData(
             measurement_id=measurement_id,
             specimen_item_id=specimen_item_id,
             column_name=column_name,
-            data=data
+            data=data,
+            data_blob=data_blob
         )
         self.session.add(new_data)
         self.session.commit()
@@ -44,6 +60,81 @@ class MeasuredDataRepository:
             return data_record
         return None
 
+    def update_columns(self, measurement_id: int, columns: Dict[str, Dict]) -> List[str]:
+        """
+        Updates the given columns of a measurement with one UPDATE per column, without reading the records,
+        and commits them in one transaction.
+
+        Args:
+            measurement_id: The id of the measurement.
+            columns: New field values keyed by column_name.
+
+        Returns:
+            The columns that have no record to update.
+        """
+        return self.update_columns_many({measurement_id: columns}).get(measurement_id, [])
+
+    def update_columns_many(self, columns_by_measurement: Dict[int, Dict[str, Dict]]) -> Dict[int, List[str]]:
+        """
+        Updates the given columns of several measurements with one UPDATE per column, without reading the records,
+        and commits them in one transaction.
+
+        Args:
+            columns_by_measurement: New field values keyed by measurement_id and column_name.
+
+        Returns:
+            The columns that have no record to update, keyed by measurement_id.
+        """
+        missing_columns = {}
+        try:
+            for measurement_id, columns in columns_by_measurement.items():
+                for column_name, fields in columns.items():
+                    result = self.session.execute(
+                        update(MeasuredData)
+                        .where(MeasuredData.measurement_id == measurement_id, MeasuredData.column_name == column_name)
+                        .values(**fields)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
+                        missing_columns.setdefault(measurement_id, []).append(column_name)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return missing_columns
+
+    def save_measured_data_many(self, updated_data: Dict[int, Dict], new_data: List[Dict],
+                                measurement_updates: Dict[int, Dict]):
+        """
+        Applies the changes of several specimens and commits them in one transaction.
+
+        Args:
+            updated_data: New field values keyed by measurement_data_id.
+            new_data: Field values of the measured data records to create.
+            measurement_updates: New field values of the measurements keyed by measurement_id.
+        """
+        try:
+            if updated_data:
+                data_records = self.session.query(MeasuredData).filter(
+                    MeasuredData.measurement_data_id.in_(list(updated_data)))
+                for data_record in data_records:
+                    for key, value in updated_data[data_record.measurement_data_id].items():
+                        setattr(data_record, key, value)
+
+            self.session.add_all([MeasuredData(**fields) for fields in new_data])
+
+            if measurement_updates:
+                measurements = self.session.query(Measurement).filter(
+                    Measurement.measurement_id.in_(list(measurement_updates)))
+                for measurement in measurements:
+                    for key, value in measurement_updates[measurement.measurement_id].items():
+                        setattr(measurement, key, value)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
     def delete_measured_data_by_measurement_id(self, measurement_id: int):
         data_records = self.session.query(MeasuredData).filter(MeasuredData.measurement_id == measurement_id)
         for data_record in data_records:
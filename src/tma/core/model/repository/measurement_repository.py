@@ -12,6 +12,9 @@ class MeasurementRepository:
     def get_measurement_by_specimen_item_id(self, specimen_item_id: int):
         return self.session.query(Measurement).filter(Measurement.specimen_item_id == specimen_item_id).first()
 
+    def get_measurements_by_specimen_item_ids(self, specimen_item_ids):
+        return self.session.query(Measurement).filter(Measurement.specimen_item_id.in_(list(specimen_item_ids)))
+
     def create_measurement(self, specimen_item_id: int, measurement_type: int, columns):
         new_measurement = Measurement(
             specimen_item_id=specimen_item_id,
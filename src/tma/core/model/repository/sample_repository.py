@@ -1,6 +1,15 @@
+from typing import List
+
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from tma.core.model.models.curie_point import CuriePoint
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_blob import MeasurementBlob
+from tma.core.model.models.measurement_data import MeasuredData
 from tma.core.model.models.sample import Sample
+from tma.core.model.models.specimen_item import SpecimenItem
+from tma.core.model.repository.measurement_content_repository import MeasurementContentRepository
 
 
 class SampleRepository:
@@ -41,3 +50,36 @@ class SampleRepository:
             self.session.commit()
             return True
         return False
+
+    def delete_sample_tree(self, sample_id: int) -> List[int]:
+        """
+        Deletes a sample with its specimen items, measurements, measured data and Curie points in one transaction,
+        with one DELETE per table from the leaves up. The rows are not loaded, and the deletes do not depend on the
+        foreign keys cascading, which SQLite only does when enabled. The uploaded files the measurements
+        referenced are deleted with their last reference.
+
+        Args:
+            sample_id: The id of the sample.
+
+        Returns:
+            The ids of the deleted specimen items.
+        """
+        try:
+            specimen_item_ids = self.session.scalars(
+                select(SpecimenItem.specimen_item_id).where(SpecimenItem.sample_id == sample_id)).all()
+            if specimen_item_ids:
+                content_repository = MeasurementContentRepository(self.session)
+                content_repository.release_references(specimen_item_ids)
+                for model in (CuriePoint, MeasuredData, MeasurementBlob, Measurement, SpecimenItem):
+                    self.session.execute(
+                        delete(model).where(model.specimen_item_id.in_(specimen_item_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                content_repository.collect_garbage()
+            self.session.execute(
+                delete(Sample).where(Sample.sample_id == sample_id).execution_options(synchronize_session=False))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return list(specimen_item_ids)
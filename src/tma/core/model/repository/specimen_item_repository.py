@@ -1,7 +1,11 @@
+from typing import Dict, List, Optional, Tuple
+
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from tma.core.model.models.measurement import Measurement
 from tma.core.model.models.specimen_item import SpecimenItem
+from tma.core.model.repository.measurement_content_repository import MeasurementContentRepository
 
 
 class SpecimenItemRepository:
@@ -38,6 +42,49 @@ class SpecimenItemRepository:
             self.session.rollback()
             return None
 
+    def create_specimen_items_many(self, records: List[Tuple[Dict, Dict, List[Dict]]], data_model,
+                                   contents: Optional[Dict[str, Tuple[bytes, int]]] = None):
+        """
+        Creates specimen items with their measurements and measured data in one transaction. Each table is
+        written with one batched INSERT ... RETURNING, and nothing is stored if any record fails.
+
+        Args:
+            records: (specimen item fields, measurement fields, measured data fields) of every specimen item.
+            data_model: The model of the measured data records, MeasuredData or MeasurementBlob.
+            contents: The uploaded files the measurements reference by content_hash, as (data, number of
+                references) keyed by content_hash. Only the files not stored yet are written.
+
+        Returns:
+            The created (specimen item, measurement) pairs, or None if a specimen item already exists.
+        """
+        try:
+            specimen_items = [SpecimenItem(**specimen_item_fields) for specimen_item_fields, _, _ in records]
+            self.session.add_all(specimen_items)
+            self.session.flush()
+            MeasurementContentRepository(self.session).add_references(contents or {})
+
+            measurements = [
+                Measurement(specimen_item_id=specimen_item.specimen_item_id, **measurement_fields)
+                for specimen_item, (_, measurement_fields, _) in zip(specimen_items, records)
+            ]
+            self.session.add_all(measurements)
+            self.session.flush()
+
+            self.session.add_all([
+                data_model(measurement_id=measurement.measurement_id, specimen_item_id=specimen_item.specimen_item_id,
+                           **data_fields)
+                for specimen_item, measurement, (_, _, data_records) in zip(specimen_items, measurements, records)
+                for data_fields in data_records
+            ])
+            self.session.commit()
+            return list(zip(specimen_items, measurements))
+        except IntegrityError:
+            self.session.rollback()
+            return None
+        except Exception:
+            self.session.rollback()
+            raise
+
     def update_specimen_item(self, specimen_item_id: int, **kwargs):
         item = self.session.query(SpecimenItem).filter(SpecimenItem.specimen_item_id == specimen_item_id).first()
         if item:
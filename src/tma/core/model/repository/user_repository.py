@@ -14,19 +14,9 @@ class UserRepository:
         except:
             self.session.rollback()
             raise
-        finally:
-            self.session.close()
 
     def get_user_by_id(self, user_id):
-        try:
-            user = self.session.query(User).filter(User.user_id == user_id).first()
-            return user
-        finally:
-            self.session.close()
+        return self.session.query(User).filter(User.user_id == user_id).first()
 
     def get_user_by_session_id(self, session_id):
-        try:
-            user = self.session.query(User).filter(User.session_id == session_id).first()
-            return user
-        finally:
-            self.session.close()
+        return self.session.query(User).filter(User.session_id == session_id).first()
@@ -0,0 +1,42 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def scale_blocks(blocks: Sequence, ratios, decimals: int, out: Optional[np.ndarray] = None,
+                 divisor: Optional[float] = None) -> List[np.ndarray]:
+    """
+    Multiplies every block by its own ratio and rounds the result, in one broadcasted operation.
+
+    The blocks are laid out end to end in a single array and each ratio is repeated over its block, so curves of
+    different lengths are scaled together without a Python level loop.
+
+    Parameters:
+    - blocks (sequence): The data blocks (lists or arrays) to scale.
+    - ratios (float or iterable): One ratio per block, or a single ratio for all of them.
+    - decimals (int): The number of decimals the result is rounded to.
+    - out (np.ndarray): Optional preallocated float array with room for all the points.
+    - divisor (float): Optional number the scaled values are divided by before rounding.
+
+    Returns:
+    - A list with the scaled blocks. When `out` is given the blocks are views into it.
+    """
+    if len(blocks) == 0:
+        return []
+
+    lengths = np.array([len(block) for block in blocks], dtype=int)
+    ratios = np.broadcast_to(np.asarray(ratios, dtype=float), lengths.shape)
+    total_length = int(lengths.sum())
+
+    if out is None:
+        out = np.empty(total_length, dtype=float)
+    elif out.shape != (total_length,):
+        raise ValueError("Output array must have room for all the points of the blocks.")
+
+    if total_length > 0:
+        np.concatenate([np.asarray(block, dtype=float) for block in blocks], out=out)
+    np.multiply(out, np.repeat(ratios, lengths), out=out)
+    if divisor is not None:
+        np.divide(out, divisor, out=out)
+    np.round(out, decimals, out=out)
+    return np.split(out, np.cumsum(lengths)[:-1])
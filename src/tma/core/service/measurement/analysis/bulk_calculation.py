@@ -14,6 +14,7 @@ class BulkCalculationStrategy(ABC):
     """
 
     nominal_volume = 9.99363
+    decimals = 3
 
     @abstractmethod
     def calculate(self, data):
@@ -82,7 +83,29 @@ class VolumeCalculation(BulkCalculationStrategy):
             raise ValueError("Actual volume cannot be zero.")
         data_array = np.array(data)
         ratio = self.nominal_volume / self.actual_volume
-        return np.round(data_array * ratio, 3)
+        return np.round(data_array * ratio, self.decimals)
+
+    @classmethod
+    def batch_ratios(cls, actual_volumes, nominal_volume=None):
+        """
+        Calculates the scaling ratios for several specimens at once.
+
+        Parameters:
+        - actual_volumes (float or iterable): The actual volume of every specimen.
+        - nominal_volume (float): The nominal volume used as a reference in calculations.
+
+        Returns:
+        - An array with one ratio per specimen.
+
+        Raises:
+        - ParameterError: If a volume is not provided or equals zero.
+        """
+        if nominal_volume is None:
+            nominal_volume = cls.nominal_volume
+        actual_volumes = _as_parameter_vector(actual_volumes)
+        if actual_volumes is None or np.any(actual_volumes == 0):
+            raise ParameterError("Volume is not provided or equals zero.")
+        return nominal_volume / actual_volumes
 
 
 class MassSusceptibilityCalculation(BulkCalculationStrategy):
@@ -95,6 +118,8 @@ class MassSusceptibilityCalculation(BulkCalculationStrategy):
     - nominal_volume (float): The nominal (reference) volume for the calculation. Defaults to 10.
     """
 
+    decimals = 1
+
     def __init__(self, mass, density, nominal_volume=None):
         """
         Initializes a MassSusceptibilityCalculation instance with mass, density, and nominal volume.
@@ -115,4 +140,42 @@ class MassSusceptibilityCalculation(BulkCalculationStrategy):
             raise ValueError("Mass cannot be zero.")
         data_array = np.array(data)
         ratio = (self.nominal_volume * self.density) / self.mass
-        return np.round(data_array * ratio, 1)
+        return np.round(data_array * ratio, self.decimals)
+
+    @classmethod
+    def batch_ratios(cls, masses, densities, nominal_volume=None):
+        """
+        Calculates the scaling ratios for several specimens at once.
+
+        Parameters:
+        - masses (float or iterable): The mass of every specimen.
+        - densities (float or iterable): The density of every specimen.
+        - nominal_volume (float): The nominal volume used as a reference in calculations.
+
+        Returns:
+        - An array with one ratio per specimen.
+
+        Raises:
+        - ParameterError: If a mass or density is not provided or a mass equals zero.
+        """
+        if nominal_volume is None:
+            nominal_volume = cls.nominal_volume
+        masses = _as_parameter_vector(masses)
+        densities = _as_parameter_vector(densities)
+        if masses is None or np.any(masses == 0):
+            raise ParameterError("Mass is not provided or equals zero.")
+        if densities is None:
+            raise ParameterError("Density is not provided.")
+        return (nominal_volume * densities) / masses
+
+
+def _as_parameter_vector(values):
+    """
+    Converts a scalar or an iterable of parameters to a float array, or None when any value is missing.
+    """
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=float)
+    if np.any(np.isnan(values)):
+        return None
+    return values
@@ -0,0 +1,206 @@
+import copy
+import hashlib
+import pickle
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Union
+
+import numpy as np
+
+from tma.core.cache_backend import CacheBackend, analysis_key, get_cache_backend
+
+
+class CalculationCache:
+    """
+    A bounded LRU cache for the results of DataCalculation strategies.
+
+    Results are keyed by the specimen item, the (uid, version) of the curves used as input, the strategy class and
+    its parameters, so a changed curve or parameter never hits a stale entry. Cached values are copied on the way
+    in and out, because callers extend the returned lists.
+
+    With a shared cache backend, a miss is looked up in the backend under a key built from the content of the
+    curves, so a result computed by one worker is reused by the others.
+
+    Attributes:
+    - max_entries (int): The maximum number of cached results.
+    - max_bytes (int): The approximate memory budget of the cached results.
+    - backend (CacheBackend): The shared cache backend, or None to cache in this process only.
+    - hits, misses, evictions (int): Usage statistics since the last reset.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024,
+                 backend: Optional[CacheBackend] = None):
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("Cache limits must be positive numbers.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(specimen_item_id, curves: Iterable, strategy, *parameters) -> Hashable:
+        """
+        Builds the cache key of a calculation.
+
+        Parameters:
+        - specimen_item_id (int): The id of the specimen item the curves belong to.
+        - curves (iterable): The input curves, identified by their uid and version.
+        - strategy: The strategy class, or an instance whose attributes are its parameters.
+        - parameters: Any other arguments the result depends on.
+        """
+        curve_versions = tuple((curve.uid, curve.version) for curve in curves)
+        if isinstance(strategy, type):
+            strategy_key = strategy
+        else:
+            strategy_key = (type(strategy), freeze_parameters(vars(strategy)))
+        return specimen_item_id, curve_versions, strategy_key, freeze_parameters(parameters)
+
+    @staticmethod
+    def make_shared_key(curves: Iterable, strategy, *parameters) -> str:
+        """
+        Builds the key of a calculation in the shared cache backend. Unlike make_key, it is built from the values
+        of the curves, which are the same in every worker.
+        """
+        digest = hashlib.sha256()
+        for curve in curves:
+            digest.update(np.asarray(curve.temperature, dtype=np.float64).tobytes())
+            digest.update(np.asarray(curve.values, dtype=np.float64).tobytes())
+        if isinstance(strategy, type):
+            strategy_key = strategy.__qualname__
+        else:
+            strategy_key = (type(strategy).__qualname__, freeze_parameters(vars(strategy)))
+        digest.update(repr((strategy_key, freeze_parameters(parameters))).encode('utf-8'))
+        return analysis_key(digest.hexdigest())
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       shared_key: Union[str, Callable[[], str], None] = None) -> Any:
+        """
+        Returns the cached result for the key, computing and storing it on a miss.
+
+        Parameters:
+        - key: The key built by make_key.
+        - compute (callable): Computes the result.
+        - shared_key (str or callable): The key built by make_shared_key, to look the result up in the shared
+          backend, or a callable building it. A callable is only called on a local miss, so a hit does not hash
+          the curves.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[key])
+
+        self.misses += 1
+        shared = self.backend is not None and shared_key is not None
+        if shared:
+            if callable(shared_key):
+                shared_key = shared_key()
+            cached = self.backend.get(shared_key)
+            if cached is not None:
+                result = pickle.loads(cached)
+                self._store(key, copy.deepcopy(result))
+                return result
+
+        result = compute()
+        self._store(key, copy.deepcopy(result))
+        if shared:
+            self.backend.set(shared_key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    def invalidate(self, specimen_item_id) -> int:
+        """
+        Drops every result of the specimen item. Returns the number of dropped entries.
+        """
+        keys = [key for key in self._entries if key[0] == specimen_item_id]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.size_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _store(self, key: Hashable, value: Any):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self.size_bytes -= self._sizes.pop(key)
+
+
+def freeze_parameters(value) -> Hashable:
+    """
+    Converts strategy parameters to a hashable value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze_parameters(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_parameters(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return value.dtype.str, value.shape, value.tobytes()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return type(value), freeze_parameters(vars(value))
+    return value
+
+
+def _estimate_size(value) -> int:
+    """
+    Approximates the memory used by a cached result, counting 8 bytes per number.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(_estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return 64 + sum(_estimate_size(item) for item in value.values())
+    return 8
+
+
+def _get_shared_backend() -> Optional[CacheBackend]:
+    backend = get_cache_backend()
+    # The results are already kept in this process, a backend private to the worker would only duplicate them
+    return backend if backend.shared else None
+
+
+calculation_cache = CalculationCache(backend=_get_shared_backend())
@@ -2,15 +2,19 @@ from typing import Optional, Dict
 
 import numpy as np
 
+from tma.core.service.measurement.analysis.batch_scaling import scale_blocks
 from tma.core.service.measurement.analysis.bulk_calculation import BulkCalculationStrategy, VolumeCalculation, \
     MassSusceptibilityCalculation
 from tma.core.service.measurement.analysis.curie_calculation import CuriePointCalculationStrategy
 from tma.core.service.measurement.analysis.interpolation import InterpolationStrategy, LinearInterpolation, \
     SplineInterpolation, LagrangeInterpolation, PiecewiseLinearInterpolation, LeastSquaresInterpolation
-from tma.core.service.measurement.analysis.mass_calculation import MassCalculationStrategy
-from tma.core.service.measurement.analysis.outlier_detection import OutlierDetectionStrategy
+from tma.core.service.measurement.analysis.mass_calculation import MassCalculationStrategy, MassCalculation
+from tma.core.service.measurement.analysis.outlier_detection import OutlierDetectionStrategy, \
+    ComparisonOutlierDetection, MeanOutlierDetection, StandardDeviationOutlierDetection, \
+    MovingAverageOutlierDetection, RollingStandardDeviationOutlierDetection, HampelOutlierDetection
 from tma.core.service.measurement.analysis.second_derivative import DerivativeCalculationStrategy
-from tma.core.service.measurement.analysis.smoothing import SmoothingStrategy
+from tma.core.service.measurement.analysis.smoothing import SmoothingStrategy, MovingAverageSmoothing, \
+    SavitzkyGolaySmoothing, GaussianSmoothing, RunningMedianSmoothing
 
 
 class DataCalculation:
@@ -36,6 +40,22 @@ class DataCalculation:
         "mass": MassSusceptibilityCalculation,
     }
 
+    _smoothing_strategies: Dict[str, type] = {
+        "Moving Average": MovingAverageSmoothing,
+        "Savitzky-Golay": SavitzkyGolaySmoothing,
+        "Gaussian": GaussianSmoothing,
+        "Running Median": RunningMedianSmoothing,
+    }
+
+    _outlier_detection_strategies: Dict[str, type] = {
+        "Comparison": ComparisonOutlierDetection,
+        "Mean": MeanOutlierDetection,
+        "Standard Deviation": StandardDeviationOutlierDetection,
+        "Moving Average": MovingAverageOutlierDetection,
+        "Rolling Standard Deviation": RollingStandardDeviationOutlierDetection,
+        "Hampel": HampelOutlierDetection,
+    }
+
     @classmethod
     def get_available_interpolation_methods(cls):
         return list(cls._interpolation_strategies.keys())
@@ -44,12 +64,24 @@ class DataCalculation:
     def get_available_bulk_methods(cls):
         return list(cls._bulk_strategies.keys())
 
+    @classmethod
+    def get_available_smoothing_methods(cls):
+        return list(cls._smoothing_strategies.keys())
+
+    @classmethod
+    def get_available_outlier_detection_methods(cls):
+        return list(cls._outlier_detection_strategies.keys())
+
     def set_interpolation_strategy(self, strategy_name: str):
         if strategy_name not in self._interpolation_strategies:
             strategy_name = "Linear Interpolation"
         self.interpolation_strategy = self._interpolation_strategies[strategy_name]
 
     def set_smoothing_strategy(self, strategy, **config):
+        if isinstance(strategy, str):
+            if strategy not in self._smoothing_strategies:
+                raise NotImplementedError('No such method')
+            strategy = self._smoothing_strategies[strategy]
         self.smoothing_strategy = strategy(**config)
 
     def set_bulk_calculation_strategy(self, strategy, volume=None, mass=None, density=None):
@@ -74,6 +106,10 @@ class DataCalculation:
         self.second_derivative_strategy = strategy(**config)
 
     def set_outline_detection_strategy(self, strategy, **config):
+        if isinstance(strategy, str):
+            if strategy not in self._outlier_detection_strategies:
+                raise NotImplementedError('No such method')
+            strategy = self._outlier_detection_strategies[strategy]
         self.outline_detection_strategy = strategy(**config)
 
     def smooth(self, data) -> np.ndarray[float]:
@@ -96,6 +132,13 @@ class DataCalculation:
             raise ValueError("Smoothing strategy not set")
         return self.smoothing_strategy.smooth(data)
 
+    def smooth_block(self, block, out=None) -> np.ndarray[float]:
+        if not self.smoothing_strategy:
+            raise ValueError("Smoothing strategy not set")
+        if not self.smoothing_strategy.preserves_length:
+            raise ValueError("Smoothing strategy does not preserve the curve length")
+        return self.smoothing_strategy.smooth_block(block, out)
+
     def calculate_bulk(self, data):
         if not self.bulk_calculation_strategy:
             raise ValueError("Bulk Calculation strategy not set")
@@ -106,6 +149,43 @@ class DataCalculation:
             raise ValueError("Mass Calculation strategy not set")
         return self.mass_calculation_strategy.calculate(data)
 
+    def calculate_bulk_batch(self, strategy, data_blocks, volumes=None, masses=None, densities=None, out=None):
+        """
+        Calculates the bulk susceptibility of many data blocks in one broadcasted operation.
+
+        Parameters:
+        - strategy (str): The calculation strategy ('volume' or 'mass').
+        - data_blocks (sequence): The CSUSC values of every curve.
+        - volumes, masses, densities (float or iterable): One value per block, or a single value for all of them.
+        - out (np.ndarray): Optional preallocated float array with room for all the points.
+
+        Returns:
+        - A list with the calculated blocks.
+        """
+        if strategy not in self._bulk_strategies:
+            raise NotImplementedError('No such method')
+
+        if strategy == 'volume':
+            ratios = VolumeCalculation.batch_ratios(volumes)
+        else:
+            ratios = MassSusceptibilityCalculation.batch_ratios(masses, densities)
+        return scale_blocks(data_blocks, ratios, self._bulk_strategies[strategy].decimals, out)
+
+    def calculate_mass_batch(self, data_blocks, masses, out=None):
+        """
+        Calculates the mass susceptibility of many data blocks in one broadcasted operation.
+
+        Parameters:
+        - data_blocks (sequence): The CSUSC values of every curve.
+        - masses (float or iterable): One mass per block, or a single mass for all of them.
+        - out (np.ndarray): Optional preallocated float array with room for all the points.
+
+        Returns:
+        - A list with the calculated blocks.
+        """
+        ratios = MassCalculation.batch_ratios(masses)
+        return scale_blocks(data_blocks, ratios, MassCalculation.decimals, out, divisor=MassCalculation.divisor)
+
     def calculate_curie(self, temperatures, magnetization):
         if not self.curie_calculation_strategy:
             raise ValueError("Curie Calculation strategy not set")
@@ -0,0 +1,96 @@
+from typing import Optional
+
+import numpy as np
+
+DOWNSAMPLING_MODES = ('lttb', 'minmax', 'none')
+
+
+def lttb_indices(x, y, max_points: int) -> np.ndarray:
+    """
+    Selects the points of a curve that keep its shape with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and the last points are kept. The other points are split into max_points - 2 buckets, and every
+    bucket keeps the point forming the largest triangle with the point kept in the previous bucket and the
+    average of the next bucket.
+
+    Parameters:
+    - x, y (array-like): The coordinates of the points, x in drawing order.
+    - max_points (int): The number of points to keep.
+
+    Returns:
+    - The sorted indices of the kept points in the curve.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    length = len(x)
+    if max_points >= length or max_points < 3:
+        return np.arange(length)
+
+    # Bucket i holds the points edges[i]:edges[i + 1], the last point is a bucket on its own
+    edges = np.linspace(1, length - 1, max_points - 1).astype(int)
+    edges = np.append(edges, length)
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, length - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+        average_x = x[next_start:next_stop].mean()
+        average_y = y[next_start:next_stop].mean()
+
+        areas = np.abs((x[previous] - average_x) * (y[start:stop] - y[previous])
+                       - (x[previous] - x[start:stop]) * (average_y - y[previous]))
+        previous = start + int(np.nanargmax(areas)) if not np.isnan(areas).all() else start
+        indices[bucket + 1] = previous
+    return indices
+
+
+def min_max_indices(y, max_points: int) -> np.ndarray:
+    """
+    Selects the lowest and the highest point of every one of max_points / 2 equal buckets, so the envelope of
+    a noisy curve is kept. The first and the last points are kept.
+
+    Parameters:
+    - y (array-like): The values of the points in drawing order.
+    - max_points (int): The approximate number of points to keep.
+
+    Returns:
+    - The sorted indices of the kept points in the curve.
+    """
+    y = np.asarray(y, dtype=float)
+    length = len(y)
+    buckets = max_points // 2
+    if max_points >= length or buckets < 1:
+        return np.arange(length)
+
+    edges = np.linspace(0, length, buckets + 1).astype(int)
+    indices = [0, length - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = y[start:stop]
+        if np.isnan(bucket).all():
+            continue
+        indices.append(start + int(np.nanargmin(bucket)))
+        indices.append(start + int(np.nanargmax(bucket)))
+    return np.unique(indices)
+
+
+def downsample_indices(x, y, max_points: int, mode: str = 'lttb') -> Optional[np.ndarray]:
+    """
+    Selects the points of a curve to draw within a budget of points.
+
+    Parameters:
+    - x, y (array-like): The coordinates of the points.
+    - max_points (int): The budget of points, about two per horizontal pixel of the plot.
+    - mode (str): 'lttb' keeps the shape, 'minmax' keeps the envelope, 'none' keeps every point.
+
+    Returns:
+    - The sorted indices of the kept points in the curve, or None if every point is kept.
+    """
+    if mode not in DOWNSAMPLING_MODES:
+        raise ValueError(f"Unknown downsampling mode {mode}. Allowed modes: {', '.join(DOWNSAMPLING_MODES)}.")
+    if mode == 'none' or len(y) <= max_points:
+        return None
+    if mode == 'minmax':
+        return min_max_indices(y, max_points)
+    return lttb_indices(x, y, max_points)
@@ -0,0 +1,227 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from tma.core.service.measurement.analysis.outlier_detection import OutlierDetectionStrategy, \
+    RollingWindowOutlierDetection, RollingStandardDeviationOutlierDetection, HampelOutlierDetection
+
+
+class IncrementalOutlierDetection(OutlierDetectionStrategy, ABC):
+    """
+    An abstract base class for outlier detection on data that arrives in blocks.
+
+    The detector keeps running state between calls, so each update costs O(block) instead of rescanning the
+    whole curve. Every point is reported at most once.
+
+    Methods:
+    - update(x_block, y_block): Adds new points and returns the newly detected outliers.
+    - flush(): Decides the points still waiting for more data, at the end of the curve.
+    - reset(): Forgets all the points seen so far.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        pass
+
+    @abstractmethod
+    def update(self, x_block, y_block):
+        """
+        Adds a block of points to the detector.
+
+        Parameters:
+        - x_block (iterable): The new x-axis data points.
+        - y_block (iterable): The new y-axis data points corresponding to the x_block.
+
+        Returns:
+        - A tuple of x_values and y_values of the newly detected outliers.
+        """
+        pass
+
+    def flush(self):
+        """
+        Decides the points that are still pending, treating the last received point as the end of the curve.
+
+        Returns:
+        - A tuple of x_values and y_values of the newly detected outliers.
+        """
+        return np.array([]), np.array([])
+
+    def detect(self, x_values, y_values):
+        """
+        Runs the detector over a whole curve, as a regular outlier detection strategy.
+
+        Returns:
+        - A tuple of x_values and y_values that are considered outliers.
+        """
+        self.reset()
+        outlier_x, outlier_y = self.update(x_values, y_values)
+        flushed_x, flushed_y = self.flush()
+        return np.concatenate((outlier_x, flushed_x)), np.concatenate((outlier_y, flushed_y))
+
+    @staticmethod
+    def _to_arrays(x_block, y_block):
+        if len(x_block) != len(y_block):
+            raise ValueError("x_block and y_block must have the same number of elements")
+        return np.asarray(x_block), np.asarray(y_block, dtype=float)
+
+
+class IncrementalComparisonOutlierDetection(IncrementalOutlierDetection):
+    def __init__(self, threshold):
+        """
+        Initializes the incremental outlier detection with a numerical threshold.
+
+        Parameters:
+        - threshold (float): The jump from the previous y-value above which a y-value is considered an outlier.
+        """
+        self.threshold = threshold
+        super().__init__()
+
+    def reset(self):
+        self.last_y = None
+
+    def update(self, x_block, y_block):
+        x_block, y_block = self._to_arrays(x_block, y_block)
+        if len(y_block) == 0:
+            return x_block, y_block
+
+        previous = y_block[:-1] if self.last_y is None else np.concatenate(([self.last_y], y_block[:-1]))
+        current = y_block[1:] if self.last_y is None else y_block
+        outliers = np.where(np.abs(current - previous) >= self.threshold)[0] + (1 if self.last_y is None else 0)
+
+        self.last_y = y_block[-1]
+        return x_block[outliers], y_block[outliers]
+
+
+class IncrementalMeanOutlierDetection(IncrementalOutlierDetection):
+    def __init__(self, threshold):
+        """
+        Initializes the incremental outlier detection with a numerical threshold.
+
+        New points are compared with the running mean of all the points seen so far, including the new block.
+        Points already reported are not re-evaluated when the mean moves.
+
+        Parameters:
+        - threshold (float): The deviation from the mean above which a y-value is considered an outlier.
+        """
+        self.threshold = threshold
+        super().__init__()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, x_block, y_block):
+        x_block, y_block = self._to_arrays(x_block, y_block)
+        if len(y_block) == 0:
+            return x_block, y_block
+
+        self.count += len(y_block)
+        self.total += float(np.sum(y_block))
+        mean_y = self.total / self.count
+
+        outliers = np.where(np.abs(y_block - mean_y) >= self.threshold)[0]
+        return x_block[outliers], y_block[outliers]
+
+
+class IncrementalStandardDeviationOutlierDetection(IncrementalOutlierDetection):
+    def __init__(self, threshold):
+        """
+        Initializes the incremental outlier detection based on standard deviation.
+
+        The running mean and variance are merged block by block (Chan's parallel update), so they stay
+        numerically stable on long curves.
+
+        Parameters:
+        - threshold (float): The number of standard deviations away from the running mean
+                               a y-value needs to be considered an outlier.
+        """
+        self.threshold = threshold
+        super().__init__()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.squared_deviations = 0.0
+
+    def update(self, x_block, y_block):
+        x_block, y_block = self._to_arrays(x_block, y_block)
+        if len(y_block) == 0:
+            return x_block, y_block
+
+        block_count = len(y_block)
+        block_mean = float(np.mean(y_block))
+        block_squared_deviations = float(np.sum((y_block - block_mean) ** 2))
+
+        total_count = self.count + block_count
+        delta = block_mean - self.mean
+        self.mean += delta * block_count / total_count
+        self.squared_deviations += block_squared_deviations + delta ** 2 * self.count * block_count / total_count
+        self.count = total_count
+
+        std_dev = np.sqrt(self.squared_deviations / self.count)
+        outliers = np.where(np.abs(y_block - self.mean) > self.threshold * std_dev)[0]
+        return x_block[outliers], y_block[outliers]
+
+
+class IncrementalRollingWindowOutlierDetection(IncrementalOutlierDetection):
+    """
+    Runs a centered rolling-window detector on streamed data.
+
+    A point is decided as soon as the half window to its right has arrived. Only the pending points and the
+    half window before them are kept, so an update costs O(block + window) and gives the same result as
+    running the detector over the whole curve at once.
+
+    Attributes:
+    - detector (RollingWindowOutlierDetection): The detector applied to the buffered points.
+    """
+
+    def __init__(self, detector: RollingWindowOutlierDetection):
+        self.detector = detector
+        self.half_window = detector.window_size // 2
+        super().__init__()
+
+    def reset(self):
+        self.buffer_x = np.array([])
+        self.buffer_y = np.array([])
+        self.pending_count = 0
+
+    def update(self, x_block, y_block):
+        x_block, y_block = self._to_arrays(x_block, y_block)
+        buffer_x = np.concatenate((self.buffer_x, x_block))
+        buffer_y = np.concatenate((self.buffer_y, y_block))
+        self.pending_count += len(y_block)
+
+        first_pending = len(buffer_y) - self.pending_count
+        last_decided = len(buffer_y) - self.half_window
+        outlier_x, outlier_y = self._decide(buffer_x, buffer_y, first_pending, last_decided)
+
+        self.pending_count = min(self.pending_count, self.half_window)
+        keep = self.pending_count + self.half_window
+        self.buffer_x, self.buffer_y = buffer_x[-keep:], buffer_y[-keep:]
+        return outlier_x, outlier_y
+
+    def flush(self):
+        first_pending = len(self.buffer_y) - self.pending_count
+        outlier_x, outlier_y = self._decide(self.buffer_x, self.buffer_y, first_pending, len(self.buffer_y))
+        self.pending_count = 0
+        return outlier_x, outlier_y
+
+    def _decide(self, buffer_x, buffer_y, start, end):
+        if end <= start:
+            return np.array([]), np.array([])
+        mask = self.detector.detect_mask(buffer_y)
+        outliers = np.where(mask[start:end])[0] + start
+        return buffer_x[outliers], buffer_y[outliers]
+
+
+class IncrementalRollingStandardDeviationOutlierDetection(IncrementalRollingWindowOutlierDetection):
+    def __init__(self, window_size=7, threshold=3):
+        super().__init__(RollingStandardDeviationOutlierDetection(window_size, threshold))
+
+
+class IncrementalHampelOutlierDetection(IncrementalRollingWindowOutlierDetection):
+    def __init__(self, window_size=7, threshold=3):
+        super().__init__(HampelOutlierDetection(window_size, threshold))
@@ -36,6 +36,9 @@ class MassCalculation(MassCalculationStrategy):
     - nominal_volume (float): The nominal (reference) volume for the calculation. Defaults to 10.
     """
 
+    decimals = 1
+    divisor = 10  # we need E-8
+
     def __init__(self, mass, nominal_volume=10):
         """
         Initializes a MassCalculation instance with mass and nominal volume.
@@ -52,4 +55,24 @@ class MassCalculation(MassCalculationStrategy):
             raise ValueError("Mass cannot be zero.")
         data_array = np.array(data)
         ratio = self.nominal_volume / self.mass
-        return np.round(data_array * ratio / 10, 1)  # we need E-8
+        return np.round(data_array * ratio / self.divisor, self.decimals)
+
+    @staticmethod
+    def batch_ratios(masses, nominal_volume=10):
+        """
+        Calculates the scaling ratios for several specimens at once.
+
+        Parameters:
+        - masses (float or iterable): The mass of every specimen.
+        - nominal_volume (float): The nominal volume used as a reference in calculations. Defaults to 10.
+
+        Returns:
+        - An array with one ratio per specimen, the scaled values are then divided by MassCalculation.divisor.
+
+        Raises:
+        - ParameterError: If a mass is not provided or equals zero.
+        """
+        masses = None if masses is None else np.asarray(masses, dtype=float)
+        if masses is None or np.any(np.isnan(masses)) or np.any(masses == 0):
+            raise ParameterError("Mass is not provided or equals zero.")
+        return nominal_volume / masses
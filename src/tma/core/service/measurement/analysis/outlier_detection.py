@@ -2,6 +2,8 @@ from abc import abstractmethod, ABC
 
 import numpy as np
 
+from tma.core.service.measurement.analysis.rolling_statistics import rolling_mean_std, rolling_median_mad
+
 
 class OutlierDetectionStrategy(ABC):
     @abstractmethod
@@ -125,7 +127,7 @@ class StandardDeviationOutlierDetection(OutlierDetectionStrategy):
 
 
 class MovingAverageOutlierDetection(OutlierDetectionStrategy):
-    def __init__(self, window_size, threshold):
+    def __init__(self, window_size=7, threshold=3):
         """
         Initializes the outlier detection with a moving average window size and a threshold.
 
@@ -163,3 +165,84 @@ class MovingAverageOutlierDetection(OutlierDetectionStrategy):
         outlier_y = y_values[self.window_size - 1:][outliers]
 
         return outlier_x, outlier_y
+
+
+class RollingWindowOutlierDetection(OutlierDetectionStrategy, ABC):
+    def __init__(self, window_size, threshold):
+        """
+        Initializes the outlier detection with a centered window size and a threshold.
+
+        Parameters:
+        - window_size (int): The size of the centered window, even sizes are widened to the next odd one.
+        - threshold (float): The number of local deviations a y-value needs to be considered an outlier.
+        """
+        if window_size < 3:
+            raise ValueError("Window size must be at least 3.")
+        self.window_size = window_size
+        self.threshold = threshold
+
+    @abstractmethod
+    def detect_mask(self, y_values):
+        """
+        Marks the outliers of every column along the first axis.
+
+        Parameters:
+        - y_values (np.ndarray): Array of shape (n_points,) or (n_points, n_columns).
+
+        Returns:
+        - A boolean array of the same shape, True for outliers.
+        """
+        pass
+
+    def detect(self, x_values, y_values):
+        """
+        Detects outliers by comparing y-values to the statistics of their centered window.
+        The windows are cut at the edges, so no points are dropped.
+
+        Returns:
+        - A tuple of x_values and y_values that are considered outliers.
+        """
+        if len(x_values) != len(y_values):
+            raise ValueError("x_values and y_values must have the same number of elements")
+
+        x_values = np.array(x_values)
+        y_values = np.array(y_values, dtype=float)
+
+        outliers = np.where(self.detect_mask(y_values))[0]
+
+        return x_values[outliers], y_values[outliers]
+
+
+class RollingStandardDeviationOutlierDetection(RollingWindowOutlierDetection):
+    """
+    Flags y-values that are more than `threshold` rolling standard deviations away from the rolling mean.
+    The statistics are computed with cumulative sums in O(n), leaving the tested point out of its own window.
+    The windows shrink at the edges to stay centered, so a trend is not flagged there; the first and the last
+    points have no neighbours on both sides and are never flagged.
+    """
+
+    def __init__(self, window_size=7, threshold=3):
+        super().__init__(window_size, threshold)
+
+    def detect_mask(self, y_values):
+        y_values = np.asarray(y_values, dtype=float)
+        mean, std = rolling_mean_std(y_values, self.window_size, exclude_center=True, shrink_edges=True)
+        with np.errstate(invalid='ignore'):
+            return np.abs(y_values - mean) > self.threshold * std
+
+
+class HampelOutlierDetection(RollingWindowOutlierDetection):
+    """
+    Hampel filter: flags y-values that are more than `threshold` scaled MADs away from the rolling median.
+    The median and MAD of every window are computed in one vectorized pass over all columns, O(n * w).
+    """
+
+    mad_scale = 1.4826
+
+    def __init__(self, window_size=7, threshold=3):
+        super().__init__(window_size, threshold)
+
+    def detect_mask(self, y_values):
+        y_values = np.asarray(y_values, dtype=float)
+        median, mad = rolling_median_mad(y_values, self.window_size)
+        return np.abs(y_values - median) > self.threshold * self.mad_scale * mad
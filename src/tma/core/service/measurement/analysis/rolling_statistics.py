@@ -0,0 +1,136 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _centered_window_bounds(length, window_size, shrink_edges=False):
+    """
+    Returns the start (inclusive) and end (exclusive) indices of a centered window for every point.
+    Windows are cut at the edges of the curve instead of dropping the edge points, or shrunk to stay centered.
+    """
+    half_window = window_size // 2
+    indices = np.arange(length)
+    if shrink_edges:
+        half_window = np.minimum(half_window, np.minimum(indices, length - 1 - indices))
+    starts = np.maximum(indices - half_window, 0)
+    ends = np.minimum(indices + half_window + 1, length)
+    return starts, ends
+
+
+def _block_sums(values, block_size):
+    """
+    Splits the points into blocks of block_size and returns the block means with the cumulative sums and sums of
+    squares of the values centered on them, restarted at every block and starting with 0.
+    Centered sums stay of the order of the spread within a block, however large the values or the curve length.
+    """
+    length = values.shape[0]
+    block_starts = np.arange(0, length, block_size)
+    block_lengths = np.diff(np.append(block_starts, length)).reshape((-1,) + (1,) * (values.ndim - 1))
+    block_means = np.add.reduceat(values, block_starts, axis=0) / block_lengths
+
+    centered = values - np.repeat(block_means, block_lengths.ravel(), axis=0)
+    padding = np.zeros((len(block_starts) * block_size - length,) + values.shape[1:])
+    blocks = np.concatenate((centered, padding)).reshape((len(block_starts), block_size) + values.shape[1:])
+    zeros = np.zeros((len(block_starts), 1) + values.shape[1:])
+    cumulative_sum = np.concatenate((zeros, np.cumsum(blocks, axis=1)), axis=1)
+    cumulative_squares = np.concatenate((zeros, np.cumsum(blocks ** 2, axis=1)), axis=1)
+    return block_means, cumulative_sum, cumulative_squares
+
+
+def rolling_mean_std(values, window_size, exclude_center=False, shrink_edges=False):
+    """
+    Calculates the centered rolling mean and standard deviation along the first axis in O(n).
+
+    The points are split into blocks as long as the window, so a window covers the end of one block and the
+    start of the next. The statistics of both parts come from cumulative sums centered on their block mean and
+    are merged with Chan's update, which keeps the precision of a two-pass variance for large values.
+
+    Parameters:
+    - values (np.ndarray): Array of shape (n_points, ...) with one curve per column.
+    - window_size (int): The size of the window, even sizes are widened to the next odd one.
+    - exclude_center (bool): Whether each point is left out of its own window statistics.
+    - shrink_edges (bool): Whether the windows at the edges shrink to stay centered on their point instead of
+      being cut, so a point is never compared with the neighbours of one side only.
+
+    Returns:
+    - A tuple of arrays (mean, std) with the same shape as values.
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[0]
+    if length == 0:
+        return np.empty_like(values), np.empty_like(values)
+    starts, ends = _centered_window_bounds(length, window_size, shrink_edges)
+    block_size = 2 * (window_size // 2) + 1
+    block_means, cumulative_sum, cumulative_squares = _block_sums(values, block_size)
+
+    def part_statistics(block, start, end):
+        # Count, mean and sum of squared deviations of the points from start to end (exclusive) of a block
+        counts = (end - start).reshape((length,) + (1,) * (values.ndim - 1)).astype(float)
+        sums = cumulative_sum[block, end] - cumulative_sum[block, start]
+        squares = cumulative_squares[block, end] - cumulative_squares[block, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centered_mean = np.where(counts > 0, sums / counts, 0)
+        return counts, block_means[block] + centered_mean, np.maximum(squares - centered_mean * sums, 0)
+
+    first_block = starts // block_size
+    second_block = np.minimum(first_block + 1, len(block_means) - 1)
+    second_start = (first_block + 1) * block_size
+    first_counts, first_mean, first_deviations = part_statistics(
+        first_block, starts - first_block * block_size, np.minimum(ends, second_start) - first_block * block_size)
+    second_counts, second_mean, second_deviations = part_statistics(
+        second_block, np.zeros(length, dtype=int), np.maximum(ends - second_start, 0))
+
+    counts = first_counts + second_counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = np.where(second_counts > 0, second_mean - first_mean, 0)
+        mean = first_mean + delta * second_counts / counts
+        deviations = first_deviations + second_deviations + delta ** 2 * first_counts * second_counts / counts
+
+        if exclude_center:
+            counts = counts - 1
+            excluded_mean = mean + (mean - values) / counts
+            deviations = deviations - (values - mean) * (values - excluded_mean)
+            mean = excluded_mean
+
+        variance = np.maximum(deviations / counts, 0)
+    # An empty window has no statistics, the rounding of the sums must not make them infinite
+    mean = np.where(counts > 0, mean, np.nan)
+    return mean, np.sqrt(np.where(counts > 0, variance, np.nan))
+
+
+def rolling_median_mad(values, window_size):
+    """
+    Calculates the centered rolling median and median absolute deviation along the first axis in O(n * w).
+
+    This is not a sorted-window or two-heap rolling median: every full window is taken as a strided view of the
+    data and partitioned again, so the cost grows with the window size. For the windows of a few points used on
+    these curves one vectorized partition of all windows and columns is faster than updating a sorted window point
+    by point in Python. Only the cut windows at the edges, at most window_size of them, are handled one by one.
+
+    Parameters:
+    - values (np.ndarray): Array of shape (n_points, ...) with one curve per column.
+    - window_size (int): The size of the window, even sizes are widened to the next odd one.
+
+    Returns:
+    - A tuple of arrays (median, mad) with the same shape as values.
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[0]
+    half_window = window_size // 2
+    median = np.empty_like(values)
+    mad = np.empty_like(values)
+
+    if length > 2 * half_window:
+        windows = sliding_window_view(values, 2 * half_window + 1, axis=0)
+        windows_median = np.median(windows, axis=-1)
+        median[half_window:length - half_window] = windows_median
+        mad[half_window:length - half_window] = np.median(np.abs(windows - windows_median[..., None]), axis=-1)
+
+    starts, ends = _centered_window_bounds(length, window_size)
+    for index in range(length):
+        if half_window <= index < length - half_window:
+            continue
+        window = values[starts[index]:ends[index]]
+        median[index] = np.median(window, axis=0)
+        mad[index] = np.median(np.abs(window - median[index]), axis=0)
+
+    return median, mad
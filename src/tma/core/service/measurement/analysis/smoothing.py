@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
 import numpy as np
+from scipy.ndimage import gaussian_filter1d, median_filter
+from scipy.signal import savgol_filter
 
 
 class SmoothingStrategy(ABC):
@@ -9,11 +11,16 @@ class SmoothingStrategy(ABC):
 
     This class provides the framework for smoothing strategies by defining an abstract method for smoothing.
 
+    Attributes:
+    - preserves_length (bool): Whether the smoothed curve has the same number of points as the input.
+
     Methods:
     - smooth(data): Abstract method to perform smoothing.
 
     """
 
+    preserves_length = False
+
     @abstractmethod
     def smooth(self, data):
         pass
@@ -40,3 +47,114 @@ class MovingAverageSmoothing(SmoothingStrategy):
         weights = np.ones(self.window_size) / self.window_size
         smoothed_data = np.convolve(data, weights, mode='valid')
         return np.round(smoothed_data, 3)
+
+
+class KernelSmoothing(SmoothingStrategy, ABC):
+    """
+    An abstract base class for smoothing strategies that keep the length of the curve.
+
+    The kernel is applied along the first axis, so a single call can smooth a 1-D curve, a 2-D block of
+    columns (points x columns) or a stack of equally long curves taken from several specimens.
+
+    Attributes:
+    - window_size (int): The size of the smoothing window.
+    - mode (str): How the edges are extended ('nearest', 'mirror', 'reflect', 'wrap' or 'constant').
+    """
+
+    preserves_length = True
+    allowed_modes = ('nearest', 'mirror', 'reflect', 'wrap', 'constant')
+
+    def __init__(self, window_size=5, mode='nearest'):
+        if window_size <= 0:
+            raise ValueError("Window size must be a positive number.")
+        if mode not in self.allowed_modes:
+            raise ValueError(f"Mode {mode} is not allowed. Allowed modes: {', '.join(self.allowed_modes)}.")
+        self.window_size = window_size
+        self.mode = mode
+
+    def smooth(self, data):
+        return self.smooth_block(np.asarray(data, dtype=float))
+
+    def smooth_block(self, block, out=None):
+        """
+        Smooths every column of the block along the first axis.
+
+        Parameters:
+        - block (np.ndarray): Array of shape (n_points, ...) with the curves to smooth.
+        - out (np.ndarray): Optional preallocated float array of the same shape. May be the block itself.
+
+        Returns:
+        - The smoothed values rounded to 3 decimals, written into `out` when it is given.
+        """
+        block = np.asarray(block, dtype=float)
+        if out is None:
+            out = np.empty_like(block)
+        elif out.shape != block.shape:
+            raise ValueError("Output array must have the same shape as the input block.")
+
+        if block.shape[0] > 0:
+            self._apply(block, out)
+        return np.round(out, 3, out=out)
+
+    @abstractmethod
+    def _apply(self, block, out):
+        pass
+
+
+class SavitzkyGolaySmoothing(KernelSmoothing):
+    """
+    A class implementing Savitzky-Golay smoothing strategy.
+
+    Attributes:
+    - window_size (int): The odd length of the filter window. Defaults to 5.
+    - polyorder (int): The order of the fitted polynomial. Defaults to 2.
+    - mode (str): Edge handling, 'interp' fits the polynomial to the edge windows. Defaults to 'interp'.
+    """
+
+    allowed_modes = ('interp',) + KernelSmoothing.allowed_modes
+
+    def __init__(self, window_size=5, polyorder=2, mode='interp'):
+        super().__init__(window_size, mode)
+        if window_size % 2 == 0:
+            raise ValueError("Window size must be an odd number.")
+        if polyorder >= window_size:
+            raise ValueError("Polynomial order must be less than the window size.")
+        self.polyorder = polyorder
+
+    def _apply(self, block, out):
+        if self.mode == 'interp' and block.shape[0] < self.window_size:
+            raise ValueError("Curve is shorter than the smoothing window.")
+        out[...] = savgol_filter(block, self.window_size, self.polyorder, axis=0, mode=self.mode)
+
+
+class GaussianSmoothing(KernelSmoothing):
+    """
+    A class implementing Gaussian kernel smoothing strategy.
+
+    Attributes:
+    - window_size (int): The width of the kernel support. Defaults to 5.
+    - sigma (float): The standard deviation of the kernel. Defaults to a quarter of the window size.
+    - mode (str): Edge handling. Defaults to 'nearest'.
+    """
+
+    def __init__(self, window_size=5, sigma=None, mode='nearest'):
+        super().__init__(window_size, mode)
+        self.sigma = sigma if sigma is not None else window_size / 4
+
+    def _apply(self, block, out):
+        radius = max(self.window_size // 2, 1)
+        gaussian_filter1d(block, self.sigma, axis=0, output=out, mode=self.mode, truncate=radius / self.sigma)
+
+
+class RunningMedianSmoothing(KernelSmoothing):
+    """
+    A class implementing running median smoothing strategy.
+
+    Attributes:
+    - window_size (int): The size of the median window. Defaults to 5.
+    - mode (str): Edge handling. Defaults to 'nearest'.
+    """
+
+    def _apply(self, block, out):
+        size = (self.window_size,) + (1,) * (block.ndim - 1)
+        median_filter(block, size=size, output=out, mode=self.mode)
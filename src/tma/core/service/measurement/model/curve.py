@@ -1,4 +1,6 @@
-from typing import List, Optional
+import copy
+import itertools
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 
@@ -6,9 +8,75 @@ from tma.core.service.measurement.analysis.data_calculation import DataCalculati
 
 
 class Curve:
+    """
+    A curve of values measured over temperature.
+
+    Attributes:
+    - uid (int): Identifier unique to this curve object.
+    - version (int): Increased on every change of the temperature or the values, so cached results can be keyed
+      by (uid, version).
+    - changed_ranges (list): The [start, stop) index ranges of the values changed since the last clear_changes,
+      or None when the whole curve changed.
+    """
+
+    _uids = itertools.count()
+
     def __init__(self, temperature: List[float], values: List[float]):
+        self.uid = next(self._uids)
+        self.version = 0
         self.temperature = temperature
         self.values = values
+        self.changed_ranges: Optional[List[Tuple[int, int]]] = None
+
+    @property
+    def temperature(self):
+        return self._temperature
+
+    @temperature.setter
+    def temperature(self, temperature):
+        self._temperature = temperature
+        self.mark_changed()
+
+    @property
+    def values(self):
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+        self.mark_changed()
+
+    def mark_changed(self, start: Optional[int] = None, stop: Optional[int] = None):
+        """
+        Must be called after the temperature or the values were changed in place.
+
+        Parameters:
+        - start, stop (int): The range of the changed values. The whole curve is considered changed if omitted.
+        """
+        self.version += 1
+        if start is None or getattr(self, 'changed_ranges', None) is None:
+            self.changed_ranges = None
+            return
+        self.changed_ranges = _merge_range(self.changed_ranges, start, stop)
+
+    def clear_changes(self):
+        """
+        Marks the curve as persisted.
+        """
+        self.changed_ranges = []
+
+    def has_changes(self) -> bool:
+        return self.changed_ranges != []
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        False while the temperature and the values of a LazyCurve are not read yet.
+        """
+        return True
+
+    def __deepcopy__(self, memo):
+        return Curve(copy.deepcopy(self.temperature, memo), copy.deepcopy(self.values, memo))
 
     def get_closest_index(self, target_temp: float) -> int:
         return min(range(len(self.temperature)), key=lambda i: abs(self.temperature[i] - target_temp))
@@ -25,6 +93,7 @@ class Curve:
 
     def update_point(self, index: int, new_value: float):
         self.values[index] = new_value
+        self.mark_changed(index, index + 1)
 
     def is_valid_index(self, index: int) -> bool:
         return 0 <= index < self.get_length()
@@ -45,9 +114,74 @@ class Curve:
         return [data_calc.extrapolate(array_x, array_y, point) for point in target_array_x]
 
     def smooth(self, smoother) -> List[float]:
-        return smoother(self.values) if self.values else []
+        return smoother(self.values) if len(self.values) > 0 else []
 
     def adjust_length(self):
         min_length = min(len(self.temperature), len(self.values))
         self.temperature = self.temperature[:min_length]
         self.values = self.values[:min_length]
+
+
+class LazyCurve(Curve):
+    """
+    A curve whose temperature and values are read from storage on first access, then kept like a Curve's.
+    """
+
+    def __init__(self, load: Callable[[], Tuple[List[float], List[float]]]):
+        """
+        Parameters:
+        - load (callable): Returns the temperature and the values of the curve. Called once, on first access.
+        """
+        self.uid = next(self._uids)
+        self.version = 0
+        self._load = load
+        self._temperature = None
+        self._values = None
+        self.changed_ranges: Optional[List[Tuple[int, int]]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._load is None
+
+    def load(self):
+        """
+        Reads the temperature and the values if they were not read yet.
+        """
+        load = self._load
+        if load is not None:
+            self._temperature, self._values = load()
+            self._load = None
+
+    @property
+    def temperature(self):
+        self.load()
+        return self._temperature
+
+    @temperature.setter
+    def temperature(self, temperature):
+        self.load()
+        Curve.temperature.fset(self, temperature)
+
+    @property
+    def values(self):
+        self.load()
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self.load()
+        Curve.values.fset(self, values)
+
+
+def _merge_range(ranges: List[Tuple[int, int]], start: int, stop: int) -> List[Tuple[int, int]]:
+    """
+    Adds the [start, stop) range to sorted, disjoint ranges, merging the ranges it overlaps or touches.
+    """
+    merged = []
+    for range_start, range_stop in ranges:
+        if range_stop < start or stop < range_start:
+            merged.append((range_start, range_stop))
+        else:
+            start, stop = min(start, range_start), max(stop, range_stop)
+    merged.append((start, stop))
+    return sorted(merged)
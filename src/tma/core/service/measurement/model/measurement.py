@@ -1,4 +1,4 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable
 
 import numpy as np
 
@@ -14,11 +14,14 @@ class Measurement:
         self.cooling_curve: Dict[str, Curve] = {col: Curve([], []) for col in columns}
         self.has_heating_curve = {col: False for col in columns}
         self.has_cooling_curve = {col: False for col in columns}
+        # The hash of the uploaded file the measurement was parsed from, stored once for all its uploads
+        self.content_hash: Optional[str] = None
 
     def add_heating_data(self, column: str, temperature: List[float], value: List[float]):
         if column in self.heating_curve:
             self.heating_curve[column].temperature.extend(temperature)
             self.heating_curve[column].values.extend(value)
+            self.heating_curve[column].mark_changed()
         else:
             self.heating_curve[column] = Curve(temperature, value)
         self.has_heating_curve[column] = True
@@ -27,6 +30,7 @@ class Measurement:
         if column in self.cooling_curve:
             self.cooling_curve[column].temperature.extend(temperature)
             self.cooling_curve[column].values.extend(value)
+            self.cooling_curve[column].mark_changed()
         else:
             self.cooling_curve[column] = Curve(temperature, value)
 
@@ -38,6 +42,7 @@ class Measurement:
             self.heating_curve[column] = Curve([], [])
             self.cooling_curve[column] = Curve([], [])
         self.has_heating_curve[column] = True
+        self.has_cooling_curve.setdefault(column, False)
 
     def get_heating_curve_values(self, column: str):
         return self.heating_curve[column].values if self.has_heating_curve[column] else []
@@ -62,10 +67,36 @@ class Measurement:
 
         return combined_values
 
-    def get_measured_data(self):
+    def get_changes(self) -> Dict[str, Dict[str, Optional[List[Tuple[int, int]]]]]:
+        """
+        Returns the changes since the last clear_changes, keyed by column and phase.
+        Each change is a list of [start, stop) index ranges, or None when the whole curve changed.
+        """
+        changes = {}
+        for phase, curves in (('increasing', self.heating_curve), ('decreasing', self.cooling_curve)):
+            for column, curve in curves.items():
+                if curve.has_changes():
+                    changes.setdefault(column, {})[phase] = curve.changed_ranges
+        return changes
+
+    def get_changed_columns(self) -> List[str]:
+        return list(self.get_changes())
+
+    def clear_changes(self):
+        for curve in list(self.heating_curve.values()) + list(self.cooling_curve.values()):
+            curve.clear_changes()
+
+    def get_measured_data(self, columns: Optional[Iterable[str]] = None):
+        """
+        Returns the curves keyed by column and phase, of the given columns or of all of them.
+        """
+        if columns is not None:
+            columns = set(columns)
         result = {}
 
         for key, curve in self.heating_curve.items():
+            if columns is not None and key not in columns:
+                continue
             added_values = result.get(key)
             if not added_values:
                 added_values = {}
@@ -73,6 +104,8 @@ class Measurement:
             result.update({key: added_values})
 
         for key, curve in self.cooling_curve.items():
+            if columns is not None and key not in columns:
+                continue
             added_values = result.get(key)
             if not added_values:
                 added_values = {}
@@ -1,9 +1,13 @@
+import hashlib
+import threading
 from io import BytesIO
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Tuple, Callable, Optional
 
+from tma.core.cache_backend import get_cache_backend, parsed_file_key
 from tma.core.data.data_analyzer import DataAnalyzer
 from tma.core.data.parser.model.parameter import Parameter
-from tma.core.service.measurement.model.curve import Curve
+from tma.core.model.column_codec import encode_measurement, decode_measurement
+from tma.core.service.measurement.model.curve import Curve, LazyCurve
 from tma.core.service.measurement.model.measurement import Measurement
 from tma.core.service.measurement.model.measurement_manager import MeasurementManager
 
@@ -23,6 +27,38 @@ class MeasurementFactory:
         measurement = Measurement(measurement_id, measurement_type, columns)
 
         measurement = cls._add_heating_and_cooling_data(measurement, measured_data)
+        # The data comes from the database, nothing to persist
+        measurement.clear_changes()
+        return MeasurementManager(measurement)
+
+    @classmethod
+    def create_lazy_measurement(cls, measurement_id: int, file_extension: str, columns: List[str],
+                                measured_data: Dict[str, Any],
+                                load_column: Callable[[str], Dict[str, Any]]) -> 'MeasurementManager':
+        """
+        Creates a measurement from the curves of some of its columns, the other columns are read on first access.
+
+        Parameters:
+        - measured_data (dict): The curves of the loaded columns keyed by column and phase, with the temperature.
+        - load_column (callable): Returns the curves of a column keyed by phase.
+        """
+        measurement_type = cls._get_measurement_type(file_extension)
+        measurement = Measurement(measurement_id, measurement_type, columns)
+
+        temperature = measured_data.get(Parameter.TEMP.value, {})
+        phases = [phase for phase in ('increasing', 'decreasing') if phase in temperature]
+        for column in columns:
+            lazy_column = None if column in measured_data else _LazyColumn(column, temperature, phases, load_column)
+            for phase in phases:
+                curves, has_curve = ((measurement.heating_curve, measurement.has_heating_curve) if phase == 'increasing'
+                                     else (measurement.cooling_curve, measurement.has_cooling_curve))
+                if lazy_column is None:
+                    curves[column] = Curve(list(temperature[phase]), list(measured_data[column].get(phase, [])))
+                else:
+                    curves[column] = LazyCurve(lambda lazy_column=lazy_column, phase=phase: lazy_column.load(phase))
+                has_curve[column] = True
+        # The data comes from the database, nothing to persist
+        measurement.clear_changes()
         return MeasurementManager(measurement)
 
     @staticmethod
@@ -68,12 +104,75 @@ class MeasurementFactory:
     @staticmethod
     def extract_values(measurement_id: int, file_extension: str,
                        file_uploaded: Dict[str, Union[bytes, str]]) -> 'MeasurementManager':
-        data_analyzer = DataAnalyzer(BytesIO(file_uploaded['data']))
-        values = data_analyzer.extract_values()
-        columns = values.get('columns')
-        measured_data = values.get(data_analyzer.measured_data)
+        content_hash = MeasurementFactory.get_content_hash(file_uploaded['data'])
+        columns, measured_data = MeasurementFactory.parse_file(file_uploaded['data'], content_hash)
 
         if measured_data and columns:
-            return MeasurementFactory.create_measurement(measurement_id, file_extension, columns, measured_data)
+            measurement_manager = MeasurementFactory.create_measurement(measurement_id, file_extension, columns,
+                                                                        measured_data)
+            measurement_manager.measurement.content_hash = content_hash
+            return measurement_manager
         else:
             raise Exception("There is no data")
+
+    @staticmethod
+    def get_content_hash(data: bytes) -> str:
+        """
+        Returns the SHA-256 of an uploaded file, the key of its parsed content.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def parse_file(data: bytes, content_hash: Optional[str] = None) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Parses an uploaded file, or returns the result cached for a file with the same content.
+
+        Parameters:
+        - data (bytes): The content of the file.
+        - content_hash (str): The hash of the content, computed if None.
+
+        Returns:
+        - The columns of the file and the curves keyed by column and phase.
+        """
+        backend = get_cache_backend()
+        key = parsed_file_key(content_hash or MeasurementFactory.get_content_hash(data))
+        cached = backend.get(key)
+        if cached is not None:
+            measured_data = decode_measurement(cached, writable=True)
+            return list(measured_data), measured_data
+
+        data_analyzer = DataAnalyzer(BytesIO(data))
+        values = data_analyzer.extract_values()
+        columns = values.get('columns')
+        measured_data = values.get(data_analyzer.measured_data)
+        if measured_data and columns:
+            backend.set(key, encode_measurement({column: measured_data[column] for column in columns}))
+        return columns, measured_data
+
+
+class _LazyColumn:
+    """
+    Reads a column of a measurement once for its heating and cooling curves.
+    """
+
+    def __init__(self, column: str, temperature: Dict[str, Any], phases: List[str],
+                 load_column: Callable[[str], Dict[str, Any]]):
+        self.column = column
+        self.temperature = temperature
+        self.load_column = load_column
+        self._pending_phases = set(phases)
+        self._data = None
+        self._lock = threading.Lock()
+
+    def load(self, phase: str) -> Tuple[list, list]:
+        """
+        Returns the temperature and the values of the column in the phase.
+        """
+        with self._lock:
+            data = self._data
+            if data is None:
+                data = self.load_column(self.column)
+            self._pending_phases.discard(phase)
+            # Kept only until the curve of the other phase is read
+            self._data = data if self._pending_phases else None
+        return list(self.temperature[phase]), list(data.get(phase, []))
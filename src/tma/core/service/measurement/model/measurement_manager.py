@@ -1,4 +1,4 @@
-from typing import List, Union, Optional, Dict, Tuple
+from typing import List, Union, Optional, Dict, Tuple, Iterable
 
 import numpy as np
 import pandas as pd
@@ -6,7 +6,10 @@ import plotly.graph_objects as go
 
 from tma.core.data.parser.model.parameter import Parameter
 from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.analysis.downsampling import downsample_indices
+from tma.core.service.measurement.model.curve import Curve
 from tma.core.service.measurement.model.measurement import Measurement
+from tma.core.settings import settings
 from tma.multipages.components.graphic_elements.plot_appearance_settings import PlotAppearanceSettings
 
 
@@ -65,12 +68,20 @@ class MeasurementManager:
 
     @staticmethod
     def create_plot(measurement: Measurement, x_column, y_column, title_suffix,
-                    appearance_settings: PlotAppearanceSettings = None):
+                    appearance_settings: PlotAppearanceSettings = None, max_points: Optional[int] = None,
+                    downsampling: Optional[str] = None):
         """
         Helper method to create plots based on the direction of data change.
+
+        A curve of more than max_points points is downsampled to max_points points. The drawn points are points
+        of the curve, and the customdata of a trace holds their indices in the curve.
         """
         if appearance_settings is None:
             appearance_settings = PlotAppearanceSettings(title_suffix)
+        if max_points is None:
+            max_points = settings.plot_max_points
+        if downsampling is None:
+            downsampling = settings.plot_downsampling
 
         plots = []
 
@@ -84,11 +95,16 @@ class MeasurementManager:
             if measurement.measurement_id == 10001:
                 print('df')
                 print(df)
+            indices = downsample_indices(df[str(x_column)], df[str(y_column)], max_points, downsampling)
+            if indices is not None:
+                df = df.iloc[indices]
             plot_dict = curve_settings.to_dict(
                 x=df[str(x_column)],
                 y=df[str(y_column)],
                 name=name
             )
+            if indices is not None:
+                plot_dict['customdata'] = indices
             return go.Scatter(**plot_dict)
 
         if measurement.has_heating_curve[y_column]:
@@ -281,6 +297,10 @@ class MeasurementManager:
                 self.measurement.cooling_curve[Parameter.TSUSC.value].apply_constant_correction(constant))
 
     def smooth(self, data_calc):
+        if data_calc.smoothing_strategy.preserves_length:
+            self.smooth_curves(self._get_smoothable_curves(), data_calc)
+            return
+
         def smooth_and_adjust(curve):
             curve.values = curve.smooth(data_calc.smooth)
             curve.adjust_length()
@@ -295,24 +315,104 @@ class MeasurementManager:
             if self.measurement.has_cooling_curve[column_name]:
                 smooth_and_adjust(self.measurement.cooling_curve[column_name])
 
-    def calculate_data(self, parameter, calculation_method):
-        if self.measurement.has_heating_curve[Parameter.CSUSC.value]:
-            raw_data = self.measurement.heating_curve[Parameter.CSUSC.value].values
-            if parameter not in self.measurement.heating_curve.keys():
-                self.measurement.add_heating_data(parameter,
-                                                  self.measurement.heating_curve[Parameter.CSUSC.value].temperature,
-                                                  calculation_method(raw_data))
-            else:
-                self.measurement.heating_curve[parameter].values = calculation_method(raw_data)
+    def _get_smoothable_curves(self) -> List[Curve]:
+        curves = []
+        for column_name in self.measurement.columns:
+            if column_name == Parameter.TEMP.value:
+                continue
+            if self.measurement.has_heating_curve[column_name]:
+                curves.append(self.measurement.heating_curve[column_name])
+            if self.measurement.has_cooling_curve[column_name]:
+                curves.append(self.measurement.cooling_curve[column_name])
+        return curves
 
+    @staticmethod
+    def smooth_curves(curves: List[Curve], data_calc: DataCalculation):
+        """
+        Smooths the curves in place with a length preserving strategy.
+        Curves of equal length are stacked into one block and smoothed in a single call.
+        """
+        curves_by_length: Dict[int, List[Curve]] = {}
+        for curve in curves:
+            if len(curve.values) > 0:
+                curves_by_length.setdefault(curve.get_length(), []).append(curve)
+
+        for same_length_curves in curves_by_length.values():
+            block = np.column_stack([curve.values for curve in same_length_curves]).astype(float)
+            data_calc.smooth_block(block, out=block)
+            for curve, values in zip(same_length_curves, block.T):
+                curve.values = values.tolist()
+
+    def _get_susceptibility_curves(self) -> List[Tuple[bool, Curve]]:
+        curves = []
+        if self.measurement.has_heating_curve[Parameter.CSUSC.value]:
+            curves.append((True, self.measurement.heating_curve[Parameter.CSUSC.value]))
         if self.measurement.has_cooling_curve[Parameter.CSUSC.value]:
-            raw_data = self.measurement.cooling_curve[Parameter.CSUSC.value].values
-            if parameter not in self.measurement.cooling_curve.keys():
-                self.measurement.add_cooling_data(parameter,
-                                                  self.measurement.cooling_curve[Parameter.CSUSC.value].temperature,
-                                                  calculation_method(raw_data))
+            curves.append((False, self.measurement.cooling_curve[Parameter.CSUSC.value]))
+        return curves
+
+    def _set_calculated_curve(self, parameter, heating: bool, source_curve: Curve, values):
+        curves = self.measurement.heating_curve if heating else self.measurement.cooling_curve
+        if parameter not in curves.keys():
+            if heating:
+                self.measurement.add_heating_data(parameter, source_curve.temperature, values)
             else:
-                self.measurement.cooling_curve[parameter].values = calculation_method(raw_data)
+                self.measurement.add_cooling_data(parameter, source_curve.temperature, values)
+        else:
+            curves[parameter].values = values
+            if heating:
+                self.measurement.has_heating_curve[parameter] = True
+            else:
+                self.measurement.has_cooling_curve[parameter] = True
+
+    def calculate_data(self, parameter, calculation_method):
+        for heating, source_curve in self._get_susceptibility_curves():
+            self._set_calculated_curve(parameter, heating, source_curve, calculation_method(source_curve.values))
+
+    @staticmethod
+    def calculate_data_many(managers: List['MeasurementManager'], parameter, batch_calculation_method,
+                            **specimen_parameters):
+        """
+        Calculates a parameter from the CSUSC curves of several specimens in one batch call.
+
+        Parameters:
+        - managers (list): The measurements of the specimens.
+        - parameter (str): The column to fill with the result.
+        - batch_calculation_method (callable): Takes the CSUSC blocks and per-block parameters, returns the results.
+        - specimen_parameters: One value per specimen (or a single value for all of them) for every parameter.
+        """
+        sources = []
+        curves_per_manager = []
+        for manager in managers:
+            manager_curves = manager._get_susceptibility_curves()
+            sources.extend((manager, heating, curve) for heating, curve in manager_curves)
+            curves_per_manager.append(len(manager_curves))
+
+        block_parameters = {}
+        for name, value in specimen_parameters.items():
+            if value is not None:
+                value = np.repeat(np.broadcast_to(np.asarray(value, dtype=float), (len(managers),)),
+                                  curves_per_manager)
+            block_parameters[name] = value
+
+        results = batch_calculation_method([curve.values for _, _, curve in sources], **block_parameters)
+        for manager in managers:
+            manager.measurement.add_column_if_not_exist(parameter)
+        for (manager, heating, source_curve), values in zip(sources, results):
+            manager._set_calculated_curve(parameter, heating, source_curve, values)
+
+    @staticmethod
+    def calculate_bulk_many(managers: List['MeasurementManager'], data_calc: DataCalculation, strategy,
+                            volumes=None, masses=None, densities=None):
+        MeasurementManager.calculate_data_many(
+            managers, Parameter.BSUSC.value,
+            lambda blocks, **parameters: data_calc.calculate_bulk_batch(strategy, blocks, **parameters),
+            volumes=volumes, masses=masses, densities=densities)
+
+    @staticmethod
+    def calculate_mass_many(managers: List['MeasurementManager'], data_calc: DataCalculation, masses):
+        MeasurementManager.calculate_data_many(managers, Parameter.MSUSC.value, data_calc.calculate_mass_batch,
+                                               masses=masses)
 
     def calculate_bulk(self, data_calc: DataCalculation):
         self.measurement.add_column_if_not_exist(Parameter.BSUSC.value)
@@ -360,11 +460,18 @@ class MeasurementManager:
     def detect_outline_points(self, data_calc, y_column: str) -> Union[Tuple[List[float], List[float]], None]:
         return self.process_second_derivative_calculation(data_calc, y_column, 'detect_outline_points')
 
-    def get_measured_data(self):
+    def get_measured_data(self, columns: Optional[Iterable[str]] = None):
+        """
+        Returns the curves to store keyed by column and phase, of the given columns or of all of them.
+        """
         result = {}
+        if columns is not None:
+            columns = set(columns)
 
         if self.measurement.has_heating_curve[Parameter.TEMP.value]:
             for key, curve in self.measurement.heating_curve.items():
+                if columns is not None and key not in columns:
+                    continue
                 added_values = result.get(key)
                 if not added_values:
                     added_values = {}
@@ -373,6 +480,8 @@ class MeasurementManager:
 
         if self.measurement.has_cooling_curve[Parameter.TEMP.value]:
             for key, curve in self.measurement.cooling_curve.items():
+                if columns is not None and key not in columns:
+                    continue
                 added_values = result.get(key)
                 if not added_values:
                     added_values = {}
@@ -380,3 +489,13 @@ class MeasurementManager:
                 result.update({key: added_values})
 
         return result
+
+    def get_changed_measured_data(self):
+        """
+        Returns the curves of the columns changed since the last clear_changes, keyed by column and phase.
+        """
+        changed_columns = self.measurement.get_changed_columns()
+        return self.get_measured_data(changed_columns) if changed_columns else {}
+
+    def clear_changes(self):
+        self.measurement.clear_changes()
@@ -0,0 +1,200 @@
+import copy
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from tma.core.service.exceptions.pipeline_error import PipelineError
+from tma.core.service.measurement.model.measurement import Measurement
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+from tma.core.service.measurement.pipeline.stages import PipelineStage
+
+
+def measurement_fingerprint(measurement: Measurement) -> Hashable:
+    """
+    Returns the columns of the measurement with the (uid, version) of their curves, which changes on every edit.
+    """
+    return tuple((heating, column, curve.uid, curve.version)
+                 for heating, curves in ((True, measurement.heating_curve), (False, measurement.cooling_curve))
+                 for column, curve in curves.items())
+
+
+class PipelineState:
+    """
+    The results of the previous runs of a pipeline on one specimen.
+
+    Attributes:
+    - input (Measurement): A copy of the measurement the pipeline started from.
+    - input_fingerprint: The fingerprint of that measurement, part of the fingerprint of every stage.
+    - measurement_fingerprint: The fingerprint of the processed measurement after the last execution. When the
+      measurement differs at the next execution, it was edited and the pipeline starts over from it.
+    - fingerprints (dict): The fingerprint of every stage at its last run.
+    - snapshots (dict): The measurement after every transform stage.
+    - results (dict): The result of every analysis stage.
+    - executed (list): The names of the stages run by the last execution.
+    - output_fingerprint: The fingerprint of the measurement written back by the last execution.
+    - output_changed (bool): Whether the last execution wrote a new measurement back.
+    """
+
+    def __init__(self, measurement: Measurement):
+        self.input: Measurement = copy.deepcopy(measurement)
+        self.input_fingerprint: Hashable = measurement_fingerprint(self.input)
+        self.measurement_fingerprint: Hashable = measurement_fingerprint(measurement)
+        self.fingerprints: Dict[str, Hashable] = {}
+        self.snapshots: Dict[str, Measurement] = {}
+        self.results: Dict[str, object] = {}
+        self.executed: List[str] = []
+        self.output_fingerprint: Hashable = None
+        self.output_changed = False
+
+    def reset_input(self, measurement: Measurement):
+        """
+        Starts over from a new measurement, e.g. after the raw data was edited. Every stage will run again.
+        """
+        self.__init__(measurement)
+
+
+class ProcessingPipeline:
+    """
+    A declarative pipeline of processing stages over one specimen.
+
+    The stages form a DAG through their `depends_on` names and run in topological order. A stage reads the
+    measurement left by the transform stages it depends on, and the transform stages form a single chain whose
+    last stage gives the output. Every stage is fingerprinted by its parameters, the input measurement and the
+    fingerprints of its dependencies, so a new execution only re-runs the stages whose fingerprint changed.
+    Transform stages start again from the snapshot taken before them, which drops the stale columns written by
+    the previous run.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage]):
+        self.stages: List[PipelineStage] = self._sort_stages(stages)
+        self._sources, self._output_stage = self._find_sources(self.stages)
+
+    def get_stage(self, name: str) -> PipelineStage:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise PipelineError(f'No stage named {name}.')
+
+    def replace_stage(self, stage: PipelineStage) -> 'ProcessingPipeline':
+        """
+        Returns a pipeline with the stage of the same name replaced, e.g. to re-tune its parameters.
+        """
+        self.get_stage(stage.name)
+        return ProcessingPipeline([stage if current.name == stage.name else current for current in self.stages])
+
+    def execute(self, manager: MeasurementManager, state: Optional[PipelineState] = None) -> PipelineState:
+        """
+        Runs the pipeline on the measurement, re-running only the stages affected by a change.
+
+        Parameters:
+        - manager (MeasurementManager): The measurement to process. It receives the output of the last transform.
+        - state (PipelineState): The state returned by the previous execution. A new one is created when omitted.
+
+        Returns:
+        - The updated pipeline state, with the analysis results in `results`.
+        """
+        if state is None:
+            state = PipelineState(manager.measurement)
+        elif measurement_fingerprint(manager.measurement) != state.measurement_fingerprint:
+            # The measurement was edited since the last execution, so it is the new input
+            state.reset_input(manager.measurement)
+
+        state.executed = []
+        state.output_changed = False
+        # The measurement left by every transform stage, None holds the input
+        measurements: Dict[Optional[str], Measurement] = {None: state.input}
+        transformed = False
+        fingerprints = {}
+
+        for stage in self.stages:
+            fingerprint = (stage.fingerprint(), state.input_fingerprint,
+                           tuple(fingerprints[dependency] for dependency in stage.depends_on))
+            fingerprints[stage.name] = fingerprint
+            is_stale = state.fingerprints.get(stage.name) != fingerprint
+            current = measurements[self._sources[stage.name]]
+
+            if stage.transforms_data:
+                if is_stale:
+                    current = copy.deepcopy(current)
+                    stage.run(MeasurementManager(current))
+                    state.snapshots[stage.name] = current
+                    state.executed.append(stage.name)
+                    transformed = True
+                else:
+                    current = state.snapshots[stage.name]
+                measurements[stage.name] = current
+            elif is_stale:
+                state.results[stage.name] = stage.run(MeasurementManager(current))
+                state.executed.append(stage.name)
+
+            state.fingerprints[stage.name] = fingerprint
+
+        for name in set(state.fingerprints) - set(fingerprints):
+            state.fingerprints.pop(name)
+            state.snapshots.pop(name, None)
+            state.results.pop(name, None)
+
+        output_fingerprint = fingerprints.get(self._output_stage)
+        state.output_changed = transformed or output_fingerprint != state.output_fingerprint
+        if state.output_changed:
+            manager.measurement = copy.deepcopy(measurements[self._output_stage])
+            state.output_fingerprint = output_fingerprint
+        state.measurement_fingerprint = measurement_fingerprint(manager.measurement)
+        return state
+
+    @staticmethod
+    def _find_sources(stages: List[PipelineStage]) -> Tuple[Dict[str, Optional[str]], Optional[str]]:
+        """
+        Finds the transform stage whose measurement every stage reads, None for the input, and the transform
+        stage giving the output.
+        """
+        sources: Dict[str, Optional[str]] = {}
+        # The measurement left by every stage, and the transform stages applied to it
+        measurements: Dict[str, Optional[str]] = {}
+        lineages: Dict[Optional[str], frozenset] = {None: frozenset()}
+
+        for stage in stages:
+            candidates = {measurements[dependency] for dependency in stage.depends_on} or {None}
+            source = max(candidates, key=lambda candidate: len(lineages[candidate]))
+            if any(not lineages[candidate] <= lineages[source] for candidate in candidates):
+                raise PipelineError(f'Stage {stage.name} depends on the data of unrelated transform stages.')
+            sources[stage.name] = source
+            if stage.transforms_data:
+                lineages[stage.name] = lineages[source] | {stage.name}
+            measurements[stage.name] = stage.name if stage.transforms_data else source
+
+        transforms = [stage.name for stage in stages if stage.transforms_data]
+        if not transforms:
+            return sources, None
+        if lineages[transforms[-1]] != set(transforms):
+            raise PipelineError('The transform stages must form a single chain through their dependencies.')
+        return sources, transforms[-1]
+
+    @staticmethod
+    def _sort_stages(stages: Sequence[PipelineStage]) -> List[PipelineStage]:
+        stages_by_name = {}
+        for stage in stages:
+            if stage.name in stages_by_name:
+                raise PipelineError(f'Duplicate stage name {stage.name}.')
+            stages_by_name[stage.name] = stage
+
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in stages_by_name:
+                    raise PipelineError(f'Stage {stage.name} depends on unknown stage {dependency}.')
+
+        sorted_stages, visiting, visited = [], set(), set()
+
+        def visit(stage: PipelineStage):
+            if stage.name in visited:
+                return
+            if stage.name in visiting:
+                raise PipelineError(f'Stage {stage.name} is part of a dependency cycle.')
+            visiting.add(stage.name)
+            for dependency in stage.depends_on:
+                visit(stages_by_name[dependency])
+            visiting.remove(stage.name)
+            visited.add(stage.name)
+            sorted_stages.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return sorted_stages
@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+from typing import Hashable, Sequence, Type
+
+from tma.core.service.exceptions.invalid_filename_error import InvalidFilenameError
+from tma.core.service.measurement.analysis.calculation_cache import freeze_parameters
+from tma.core.service.measurement.analysis.curie_calculation import CuriePointCalculationStrategy, \
+    InflectionPointCalculation
+from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.analysis.mass_calculation import MassCalculation
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+
+
+class PipelineStage(ABC):
+    """
+    An abstract base class for a stage of the processing pipeline.
+
+    Attributes:
+    - name (str): The unique name of the stage in the pipeline.
+    - depends_on (tuple): The names of the stages that must run before this one.
+    - transforms_data (bool): Whether the stage changes the measurement. Analysis stages only read it.
+    """
+
+    transforms_data = True
+
+    def __init__(self, name: str, depends_on: Sequence[str] = ()):
+        self.name = name
+        self.depends_on = tuple(depends_on)
+
+    def fingerprint(self) -> Hashable:
+        """
+        Returns a value that changes whenever the parameters or the external inputs of the stage change.
+        """
+        parameters = {key: value for key, value in vars(self).items() if key not in ('name', 'depends_on')}
+        return type(self), freeze_parameters(parameters)
+
+    @abstractmethod
+    def run(self, manager: MeasurementManager):
+        """
+        Applies the stage to the measurement.
+
+        Returns:
+        - The result of an analysis stage, or None for a transform stage.
+        """
+        pass
+
+
+class FurnaceConstantCorrectionStage(PipelineStage):
+    def __init__(self, constant: float, name='furnace_correction', depends_on: Sequence[str] = ()):
+        super().__init__(name, depends_on)
+        self.constant = constant
+
+    def run(self, manager: MeasurementManager):
+        manager.correct_by_constant(self.constant)
+
+
+class FurnaceFileCorrectionStage(PipelineStage):
+    """
+    Subtracts an empty furnace or cryostat measurement. Edits of that measurement re-run the stage.
+    """
+
+    def __init__(self, furnace: MeasurementManager, interpolation_method='Linear Interpolation',
+                 name='furnace_correction', depends_on: Sequence[str] = ()):
+        super().__init__(name, depends_on)
+        self.furnace = furnace
+        self.interpolation_method = interpolation_method
+
+    def fingerprint(self) -> Hashable:
+        furnace = self.furnace.measurement
+        curves = list(furnace.heating_curve.values()) + list(furnace.cooling_curve.values())
+        return (type(self), self.interpolation_method, furnace.measurement_type,
+                tuple((curve.uid, curve.version) for curve in curves))
+
+    def run(self, manager: MeasurementManager):
+        if self.furnace.get_measurement_type() != manager.get_measurement_type():
+            raise InvalidFilenameError('Mismatched data types for subtraction.')
+        data_calc = DataCalculation()
+        data_calc.set_interpolation_strategy(self.interpolation_method)
+        manager.correct_by_file(self.furnace.measurement, data_calc)
+
+
+class BulkCalculationStage(PipelineStage):
+    def __init__(self, method, volume=None, mass=None, density=None, name='bulk',
+                 depends_on: Sequence[str] = ()):
+        super().__init__(name, depends_on)
+        self.method = method
+        self.volume = volume
+        self.mass = mass
+        self.density = density
+
+    def run(self, manager: MeasurementManager):
+        data_calc = DataCalculation()
+        data_calc.set_bulk_calculation_strategy(self.method, volume=self.volume, mass=self.mass,
+                                                density=self.density)
+        manager.calculate_bulk(data_calc)
+
+
+class MassCalculationStage(PipelineStage):
+    def __init__(self, mass, name='mass', depends_on: Sequence[str] = ()):
+        super().__init__(name, depends_on)
+        self.mass = mass
+
+    def run(self, manager: MeasurementManager):
+        data_calc = DataCalculation()
+        data_calc.set_mass_calculation_strategy(MassCalculation, mass=self.mass)
+        manager.calculate_mass(data_calc)
+
+
+class SmoothingStage(PipelineStage):
+    def __init__(self, method='Moving Average', name='smoothing', depends_on: Sequence[str] = (), **config):
+        super().__init__(name, depends_on)
+        self.method = method
+        self.config = config
+
+    def run(self, manager: MeasurementManager):
+        data_calc = DataCalculation()
+        data_calc.set_smoothing_strategy(self.method, **self.config)
+        manager.smooth(data_calc)
+
+
+class CurieDetectionStage(PipelineStage):
+    transforms_data = False
+
+    def __init__(self, y_column: str, strategy: Type[CuriePointCalculationStrategy] = InflectionPointCalculation,
+                 name='curie', depends_on: Sequence[str] = (), **config):
+        super().__init__(name, depends_on)
+        self.y_column = y_column
+        self.strategy = strategy
+        self.config = config
+
+    def run(self, manager: MeasurementManager):
+        data_calc = DataCalculation()
+        data_calc.set_curie_calculation_strategy(self.strategy, **self.config)
+        return manager.calculate_curie(data_calc, self.y_column)
+
+
+class OutlierDetectionStage(PipelineStage):
+    transforms_data = False
+
+    def __init__(self, y_column: str, method='Mean', name='outliers', depends_on: Sequence[str] = (), **config):
+        super().__init__(name, depends_on)
+        self.y_column = y_column
+        self.method = method
+        self.config = config
+
+    def run(self, manager: MeasurementManager):
+        data_calc = DataCalculation()
+        data_calc.set_outline_detection_strategy(self.method, **self.config)
+        return manager.detect_outline_points(data_calc, self.y_column)
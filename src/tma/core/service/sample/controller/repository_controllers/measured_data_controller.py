@@ -1,54 +1,137 @@
-import json
+from typing import Dict
 
 from tma.core.model.models.sample import Sample
-from tma.core.model.repository import measured_data_repo, measurement_repo
+from tma.core.model.repository import measured_data_repo, measurement_blob_repo, measurement_repo
+from tma.core.service.sample.sample_cache import sample_cache
+from tma.core.service.sample.write_behind import write_behind_queue
+from tma.core.service.services.measured_data_cache import MeasuredDataCache
 from tma.core.service.services.measured_data_service import MeasuredDataService
+from tma.core.service.services.measurement_blob_service import MeasurementBlobService
 from tma.core.service.services.measurement_service import MeasurementService
+from tma.core.settings import settings
 
 
 class MeasuredDataRepositoryController:
-    def update_existing_data(self, measured_data, existing_columns, measured_data_model, measured_data_service):
-        for data_item in measured_data_model:
-            if data_item.column_name in measured_data:
-                measured_data_service.update_measured_data_details(
-                    measurement_data_id=data_item.measurement_data_id,
-                    data=measured_data[data_item.column_name]
-                )
-                measured_data.pop(data_item.column_name)
-
     def update_measured_data(self, sample: Sample, filename, measured_data: dict):
+        self.update_measured_data_many(sample, {filename: measured_data})
+
+    def save_changes(self, sample: Sample, specimen_item):
+        """
+        Stores only the columns of the specimen item changed since it was loaded or last saved, with one UPDATE
+        per changed column and without reading the stored data. Falls back to update_measured_data when a
+        changed column is not stored yet.
+
+        Parameters:
+        - sample (Sample): The sample the specimen item belongs to.
+        - specimen_item (SpecimenItem): The edited specimen item.
+        """
+        measurement_manager = specimen_item.measurement.value
+        changed_data = measurement_manager.get_changed_measured_data()
+        if not changed_data:
+            return
+        # The queued edits are older than this write, so they must not overwrite it
+        write_behind_queue.flush(sample.sample_id)
+
+        measurement_id = measurement_manager.get_measurement_id()
+        if settings.measured_data_layout == 'measurement':
+            measurement_blob_service = MeasurementBlobService(measurement_blob_repository=measurement_blob_repo)
+            all_stored = measurement_blob_service.update_measured_data(measurement_id,
+                                                                       measurement_manager.get_measured_data())
+        else:
+            measured_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
+            all_stored = not measured_data_service.update_columns(measurement_id, changed_data)
+
+        if not all_stored:
+            self.update_measured_data(sample, specimen_item.filename.value, measurement_manager.get_measured_data())
+        measurement_manager.clear_changes()
+        MeasuredDataCache().invalidate([specimen_item.specimen_item_id])
+        sample_cache.invalidate(sample.sample_id, keep=sample)
+
+    def update_measured_data_many(self, sample: Sample, measured_data_by_filename: Dict[str, dict]):
+        """
+        Stores the measured data of several specimen items with one query and one transaction.
+
+        Parameters:
+        - sample (Sample): The sample the specimen items belong to.
+        - measured_data_by_filename (dict): The measured data of every specimen item keyed by filename.
+        """
+        write_behind_queue.flush(sample.sample_id)
+        if settings.measured_data_layout == 'measurement':
+            self._update_measurement_blobs(sample, measured_data_by_filename)
+        else:
+            self._update_measured_data_rows(sample, measured_data_by_filename)
+        MeasuredDataCache().invalidate(sample.get_specimen_item_by_filename(filename).specimen_item_id
+                                       for filename in measured_data_by_filename)
+        sample_cache.invalidate(sample.sample_id, keep=sample)
+
+    @staticmethod
+    def _update_measured_data_rows(sample: Sample, measured_data_by_filename: Dict[str, dict]):
         measured_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
-        measurement_service = MeasurementService(measurement_repository=measurement_repo)
-
-        specimen_item = sample.get_specimen_item_by_filename(filename)
-        measured_data_model = measured_data_service.get_measured_data_by_specimen_item_id(
-            specimen_item.specimen_item_id)
-
-        existing_columns = {data_item.column_name for data_item in measured_data_model}
-
-        if len(existing_columns) != len(measured_data.keys()):
-            measurement_service.update_measurement_details(
-                measured_data_model.first().measurement_id, columns=json.dumps(list(measured_data.keys())))
-
-        all_measured_data = measured_data.copy()
-        self.update_existing_data(all_measured_data, existing_columns, measured_data_model, measured_data_service)
-        self.add_new_columns_with_measured_data(
-            measurement_id=measured_data_model.first().measurement_id,
-            measured_data=all_measured_data,
-            existing_columns=existing_columns,
-            specimen_item=specimen_item,
-            measured_data_service=measured_data_service
-        )
-
-    def add_new_columns_with_measured_data(
-        self, measurement_id: int, measured_data, existing_columns, specimen_item, measured_data_service):
-
-        for column_name, data in measured_data.items():
-            if column_name not in existing_columns:
-                prepared_data = json.dumps({key: value.tolist() for key, value in data.items()})
-                measured_data_service.add_measured_data(
-                    measurement_id=measurement_id,
-                    specimen_item_id=specimen_item.specimen_item_id,
-                    column_name=column_name,
-                    data=prepared_data
-                )
+
+        specimen_items = {filename: sample.get_specimen_item_by_filename(filename)
+                          for filename in measured_data_by_filename}
+        measured_data_models = {}
+        for data_item in measured_data_service.get_measured_data_by_specimen_item_ids(
+                {specimen_item.specimen_item_id for specimen_item in specimen_items.values()}):
+            measured_data_models.setdefault(data_item.specimen_item_id, []).append(data_item)
+        measurement_ids = _get_missing_measurement_ids(specimen_items.values(), measured_data_models)
+
+        updated_data, new_data, measurement_columns = {}, [], {}
+        for filename, measured_data in measured_data_by_filename.items():
+            specimen_item = specimen_items[filename]
+            measured_data_model = measured_data_models.get(specimen_item.specimen_item_id, [])
+            if measured_data_model:
+                measurement_id = measured_data_model[0].measurement_id
+            elif specimen_item.specimen_item_id in measurement_ids:
+                measurement_id = measurement_ids[specimen_item.specimen_item_id]
+            else:
+                continue
+
+            existing_columns = {data_item.column_name for data_item in measured_data_model}
+            if len(existing_columns) != len(measured_data.keys()):
+                measurement_columns[measurement_id] = list(measured_data.keys())
+
+            for data_item in measured_data_model:
+                if data_item.column_name in measured_data:
+                    updated_data[data_item.measurement_data_id] = measured_data[data_item.column_name]
+
+            for column_name, data in measured_data.items():
+                if column_name not in existing_columns:
+                    new_data.append((measurement_id, specimen_item.specimen_item_id, column_name, data))
+
+        measured_data_service.save_measured_data_many(updated_data, new_data, measurement_columns)
+
+    @staticmethod
+    def _update_measurement_blobs(sample: Sample, measured_data_by_filename: Dict[str, dict]):
+        measurement_blob_service = MeasurementBlobService(measurement_blob_repository=measurement_blob_repo)
+
+        specimen_items = {filename: sample.get_specimen_item_by_filename(filename)
+                          for filename in measured_data_by_filename}
+        measurement_ids = measurement_blob_service.get_measurement_ids_by_specimen_item_ids(
+            {specimen_item.specimen_item_id for specimen_item in specimen_items.values()})
+        measurement_ids.update(_get_missing_measurement_ids(specimen_items.values(), measurement_ids))
+
+        measured_data, measurement_columns = [], {}
+        for filename, data in measured_data_by_filename.items():
+            specimen_item_id = specimen_items[filename].specimen_item_id
+            if specimen_item_id not in measurement_ids:
+                continue
+            measurement_id = measurement_ids[specimen_item_id]
+            measured_data.append((measurement_id, specimen_item_id, data))
+            measurement_columns[measurement_id] = list(data.keys())
+
+        measurement_blob_service.save_measured_data_many(measured_data, measurement_columns)
+
+
+def _get_missing_measurement_ids(specimen_items, stored) -> Dict[int, int]:
+    """
+    Returns the measurement ids of the specimen items without stored measured data, keyed by specimen_item_id.
+    Their measurements reference an uploaded file stored once, or nothing when the specimen items are not stored.
+    """
+    missing_ids = {specimen_item.specimen_item_id for specimen_item in specimen_items} - set(stored)
+    if not missing_ids:
+        return {}
+    measurement_service = MeasurementService(measurement_repository=measurement_repo)
+    return {specimen_item_id: measurement.measurement_id
+            for specimen_item_id, measurement in measurement_service.get_measurements_by_specimen_item_ids(
+                missing_ids).items()}
@@ -1,20 +1,35 @@
-from tma.core.model.repository import user_repo, sample_repo, specimen_item_repo, measurement_repo, measured_data_repo
+from sqlalchemy import inspect
+from sqlalchemy.orm import object_session
+
+from tma.core.database import get_session_scope
+from tma.core.model.repository import user_repo, sample_repo, specimen_item_repo
 from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
     SpecialItemRepositoryController
 from tma.core.service.sample.model.sample import Sample
-from tma.core.service.services.measured_data_service import MeasuredDataService
-from tma.core.service.services.measurement_service import MeasurementService
+from tma.core.service.sample.sample_cache import sample_cache
+from tma.core.service.sample.write_behind import write_behind_queue
+from tma.core.service.services.measured_data_cache import MeasuredDataCache
 from tma.core.service.services.sample_service import SampleService
-from tma.core.service.services.specimen_item_service import SpecimenItemService
 from tma.core.model.models.sample import Sample as Sample_model
 
 
 class SampleRepositoryController:
     """
     Controller class for managing samples and specimen items.
+
+    The sample of the session is kept in sample_cache, so a page render reads the database only on the first
+    render of a kernel, after the TTL of the cache or after a write invalidated the sample. The edits of the pages
+    are written behind by write_behind_queue.
     """
 
     def __init__(self, session_id):
+        context_id, _ = get_session_scope()
+        self.cache_key = (session_id, context_id)
+        cached = sample_cache.get(self.cache_key)
+        if cached is not None:
+            self.sample_model: Sample_model = cached.sample_model
+            return
+
         user = user_repo.get_user_by_session_id(session_id)
 
         sample_model = sample_repo.get_sample_by_user_id(user.user_id)
@@ -27,7 +42,8 @@ class SampleRepositoryController:
                 name=sample.name.value,
                 selected_file_index=sample.selected_file_index
             )
-        self.sample_model: Sample_model = sample_model
+        self.sample_model: Sample_model = _detach(sample_model)
+        sample_cache.put_sample_model(self.cache_key, self.sample_model)
 
     def is_sample_created(self):
         specimen_item = specimen_item_repo.get_first_by_sample_id(sample_id=self.sample_model.sample_id)
@@ -35,28 +51,54 @@ class SampleRepositoryController:
         return specimen_item is not None
 
     def get_sample(self):
+        cached = sample_cache.get(self.cache_key)
+        if cached is not None and cached.sample is not None:
+            return cached.sample
+
+        # The queued edits of the sample, made in another kernel, are written before it is read
+        write_behind_queue.flush(self.sample_model.sample_id)
         sample_service = SampleService(sample_repository=sample_repo)
         sample = sample_service.get_sample_by_model(self.sample_model)
         specimen_repository_controller = SpecialItemRepositoryController(self.sample_model)
-        sample.add_specimen_items(specimen_repository_controller.get_specimen_items_list())
+        # The columns plotted by the pages are read with the sample, the others on first access
+        sample.add_specimen_items(specimen_repository_controller.get_specimen_items_list(
+            columns=[self.sample_model.x_column, self.sample_model.y_column]))
+        sample_cache.put_sample(self.cache_key, self.sample_model, sample)
         return sample
 
-    def delete_sample(self, sample: Sample):
-        sample_service = SampleService(sample_repository=sample_repo)
-        specimen_item_service = SpecimenItemService(specimen_item_repository=specimen_item_repo)
-        measurement_service = MeasurementService(measurement_repository=measurement_repo)
-        measurement_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
-
-        for item in sample.specimen_items:
-            measurement_id = item.measurement.value.get_measurement_id()
+    def invalidate_cache(self, keep: Sample = None):
+        """
+        Drops the cached copies of the sample after a write, except the Sample the write was made through.
+        """
+        sample_cache.invalidate(self.sample_model.sample_id, keep=keep)
 
-            measurement_data_service.remove_measured_data_by_measurement_id(measurement_id)
-            measurement_service.remove_measurement(measurement_id)
-
-        specimen_item_service.remove_specimen_items_by_sample_id(self.sample_model.sample_id)
-        sample_service.remove_sample(self.sample_model.sample_id)
+    def delete_sample(self):
+        """
+        Deletes the sample of the session with everything it contains, without loading it.
+        """
+        write_behind_queue.discard(self.sample_model.sample_id)
+        sample_service = SampleService(sample_repository=sample_repo)
+        specimen_item_ids = sample_service.remove_sample_tree(self.sample_model.sample_id)
+        MeasuredDataCache().invalidate(specimen_item_ids)
+        self.invalidate_cache()
 
     def update_sample(self, **kwargs):
         sample_service = SampleService(sample_repository=sample_repo)
         sample_service.update_sample_info(self.sample_model.sample_id, **kwargs)
-        self.sample_model = sample_service.get_sample_details(self.sample_model.sample_id)
+        self.sample_model = _detach(sample_service.get_sample_details(self.sample_model.sample_id))
+        cached = sample_cache.get(self.cache_key)
+        sample_cache.invalidate(self.sample_model.sample_id, keep=cached.sample if cached is not None else None)
+        sample_cache.put_sample_model(self.cache_key, self.sample_model)
+
+
+def _detach(sample_model: Sample_model) -> Sample_model:
+    """
+    Loads the expired attributes of the record and detaches it from its session, so the cached record is readable
+    from any thread without querying the database.
+    """
+    session = object_session(sample_model)
+    if session is not None:
+        if inspect(sample_model).expired_attributes:
+            session.refresh(sample_model)
+        session.expunge(sample_model)
+    return sample_model
@@ -1,13 +1,29 @@
-from typing import List
+import asyncio
+from typing import Iterable, List, Optional
 
-from tma.core.model.repository import specimen_item_repo, measurement_repo, measured_data_repo, curie_point_repo
+from tma.core.database import async_session
+from tma.core.model.repository import specimen_item_repo, measurement_repo, measured_data_repo, curie_point_repo, \
+    measurement_blob_repo, measurement_content_repo
+from tma.core.model.repository.asynchronous.curie_point_repository import AsyncCuriePointRepository
+from tma.core.model.repository.asynchronous.measurement_blob_repository import AsyncMeasurementBlobRepository
+from tma.core.model.repository.asynchronous.measurement_content_repository import AsyncMeasurementContentRepository
+from tma.core.model.repository.asynchronous.measurement_data_repository import AsyncMeasuredDataRepository
+from tma.core.model.repository.asynchronous.measurement_repository import AsyncMeasurementRepository
+from tma.core.model.repository.asynchronous.specimen_item_repository import AsyncSpecimenItemRepository
 from tma.core.service.entrypoit.file import File
 from tma.core.service.measurement.model.measurement_factory import MeasurementFactory
 from tma.core.service.sample.model.specimen_item import SpecimenItem
+from tma.core.service.sample.sample_cache import sample_cache
+from tma.core.service.sample.write_behind import write_behind_queue
 from tma.core.service.services.curie_point_service import CuriePointService
+from tma.core.service.services.measured_data_cache import MeasuredDataCache
+from tma.core.service.services.measured_data_loader import MeasuredDataColumnLoader
 from tma.core.service.services.measured_data_service import MeasuredDataService
+from tma.core.service.services.measurement_blob_service import MeasurementBlobService
+from tma.core.service.services.measurement_content_service import MeasurementContentService
 from tma.core.service.services.measurement_service import MeasurementService
 from tma.core.service.services.specimen_item_service import SpecimenItemService
+from tma.core.settings import settings
 
 
 class SpecialItemRepositoryController:
@@ -19,21 +35,23 @@ class SpecialItemRepositoryController:
         self.sample_model = sample_model
 
     def create_specimen_items(self, specimen_items: List[SpecimenItem]):
+        """
+        Stores the specimen items, their measurements and measured data in one transaction.
+        Nothing is stored if one of the specimen items already exists.
+        """
         specimen_item_service = SpecimenItemService(specimen_item_repository=specimen_item_repo)
-        measurement_service = MeasurementService(measurement_repository=measurement_repo)
-        measured_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
-
-        for item in specimen_items:
-            specimen_item_model = specimen_item_service.add_specimen_item_by_model(self.sample_model.sample_id, item)
-            if specimen_item_model is None:
-                return
-            measurement_model = measurement_service.add_measurement_by_model(specimen_item_model.specimen_item_id,
-                                                                             item.measurement.value.measurement)
-            measured_data_service.add_measured_data_by_model(
-                measurement_model.measurement_id,
-                specimen_item_model.specimen_item_id,
-                item.measurement.value.get_measured_data()
-            )
+        created = specimen_item_service.add_specimen_items_by_model_many(
+            self.sample_model.sample_id, specimen_items, self.get_measured_data_service())
+        sample_cache.invalidate(self.sample_model.sample_id)
+        if created is None:
+            return None
+        MeasuredDataCache().invalidate(specimen_item_model.specimen_item_id for specimen_item_model, _ in created)
+
+        for item, (specimen_item_model, measurement_model) in zip(specimen_items, created):
+            item.specimen_item_id = specimen_item_model.specimen_item_id
+            item.measurement.value.measurement.measurement_id = measurement_model.measurement_id
+            item.measurement.value.clear_changes()
+        return created
 
     def get_specimen_item(self, filename):
         specimen_item_service = SpecimenItemService(specimen_item_repository=specimen_item_repo)
@@ -44,35 +62,142 @@ class SpecialItemRepositoryController:
         )
         return specimen_item
 
-    def get_specimen_items_list(self):
+    def get_specimen_items_list(self, columns: Optional[Iterable[str]] = None):
+        """
+        Loads the specimen items of the sample with their measurements, measured data and Curie points.
+        Every table is read with one query for the whole sample, whatever the number of specimen items.
+        The measured data is read only for the specimen items missing in the cache.
+
+        Parameters:
+        - columns (iterable): The columns shown by the page. Only they and the temperature are read with the
+          specimen items, the other columns are read on first access. All the columns are read if None.
+        """
         specimen_item_service = SpecimenItemService(specimen_item_repository=specimen_item_repo)
         measurement_service = MeasurementService(measurement_repository=measurement_repo)
-        measurement_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
         curie_point_service = CuriePointService(curie_point_repository=curie_point_repo)
 
         specimen_items_model = specimen_item_service.get_specimen_items_by_sample_id(
-            sample_id=self.sample_model.sample_id)
-        result = []
+            sample_id=self.sample_model.sample_id).all()
+        specimen_item_ids = [item_model.specimen_item_id for item_model in specimen_items_model]
+        if not specimen_item_ids:
+            return []
+
+        measurement_models = measurement_service.get_measurements_by_specimen_item_ids(specimen_item_ids)
+        curie_points = curie_point_service.get_curie_points_models_by_specimen_item_ids(specimen_item_ids)
+        if columns is None or not settings.measured_data_lazy_columns:
+            measured_data = MeasuredDataCache().get_data_by_specimen_item_ids(
+                specimen_item_ids, lambda missing_ids: self._load_measured_data(measurement_models, missing_ids))
+            return self._create_specimen_items(specimen_items_model, measurement_models, measured_data, curie_points)
+
+        # Only complete measured data is cached, the specimen items missing in the cache are read column by column
+        measured_data, missing_ids = MeasuredDataCache().get_cached(specimen_item_ids)
+
+        def load_columns(ids, loaded_columns):
+            # The queued edits of the sample are written before a column is read
+            write_behind_queue.flush(self.sample_model.sample_id)
+            return self._load_measured_data(measurement_models, ids, loaded_columns)
+
+        column_loader = MeasuredDataColumnLoader(missing_ids, load_columns)
+        return self._create_specimen_items(specimen_items_model, measurement_models, measured_data, curie_points,
+                                           column_loader, column_loader.prefetch(columns))
+
+    def _load_measured_data(self, measurement_models, specimen_item_ids: List[int],
+                            columns: Optional[List[str]] = None):
+        """
+        Reads the measured data of the specimen items, laid over the uploaded files their measurements reference.
+        """
+        measured_data = self.get_measured_data_service().get_data_by_specimen_item_ids(specimen_item_ids, columns)
+        content_hashes = MeasurementContentService.get_content_hashes(measurement_models, specimen_item_ids)
+        if not content_hashes:
+            return measured_data
+        measurement_content_service = MeasurementContentService(
+            measurement_content_repository=measurement_content_repo)
+        contents = measurement_content_service.get_data_by_content_hashes(set(content_hashes.values()), columns)
+        return MeasurementContentService.lay_over_contents(measured_data, content_hashes, contents)
+
+    async def get_specimen_items_list_async(self):
+        """
+        Loads the specimen items of the sample like get_specimen_items_list, with the asyncio repositories.
+        The measurements, measured data and Curie points are read concurrently, each in its own session.
+        """
+        async with async_session() as session:
+            specimen_items_model = await AsyncSpecimenItemRepository(session).get_items_by_sample_id(
+                self.sample_model.sample_id)
+        specimen_item_ids = [item_model.specimen_item_id for item_model in specimen_items_model]
+        if not specimen_item_ids:
+            return []
 
+        async def load(repository_class, method_name, ids=specimen_item_ids):
+            if not ids:
+                return []
+            async with async_session() as task_session:
+                return await getattr(repository_class(task_session), method_name)(ids)
+
+        if settings.measured_data_layout == 'measurement':
+            repository_class, method_name = AsyncMeasurementBlobRepository, 'get_blobs_by_specimen_item_ids'
+            group_measured_data = MeasurementBlobService.group_by_specimen_item_id
+        else:
+            repository_class, method_name = AsyncMeasuredDataRepository, 'get_measured_data_by_specimen_item_ids'
+            group_measured_data = MeasuredDataService.group_by_specimen_item_id
+
+        measured_data_cache = MeasuredDataCache()
+        measured_data, missing_ids = measured_data_cache.get_cached(specimen_item_ids)
+
+        measurement_models, data_models, curie_point_models = await asyncio.gather(
+            load(AsyncMeasurementRepository, 'get_measurements_by_specimen_item_ids'),
+            load(repository_class, method_name, missing_ids),
+            load(AsyncCuriePointRepository, 'get_curie_points_by_specimen_item_ids'),
+        )
+        loaded = group_measured_data(data_models)
+        measurement_models = MeasurementService.group_by_specimen_item_id(measurement_models)
+        content_hashes = MeasurementContentService.get_content_hashes(measurement_models, missing_ids)
+        if content_hashes:
+            contents = MeasurementContentService.group_by_content_hash(
+                await load(AsyncMeasurementContentRepository, 'get_contents', set(content_hashes.values())))
+            loaded = MeasurementContentService.lay_over_contents(loaded, content_hashes, contents)
+        measured_data_cache.store(loaded)
+        measured_data.update(loaded)
+
+        return self._create_specimen_items(
+            specimen_items_model,
+            measurement_models,
+            measured_data,
+            CuriePointService.group_by_specimen_item_id(curie_point_models)
+        )
+
+    @classmethod
+    def _create_specimen_items(cls, specimen_items_model, measurement_models, measured_data, curie_points,
+                               column_loader: Optional[MeasuredDataColumnLoader] = None, prefetched=None):
+        result = []
         for item_model in specimen_items_model:
-            file = File({'name': item_model.filename})
-            measurement_model = measurement_service.get_measurement_by_specimen_item_id(item_model.specimen_item_id)
-            measured_data = measurement_data_service.get_data_by_measurement_id(
-                measurement_model.measurement_id)
-            curie_points = curie_point_service.get_curie_points_models_by_specimen_item_id(item_model.specimen_item_id)
             result.append(SpecimenItem.create_file_item(
                 specimen_item_id=item_model.specimen_item_id,
                 filename=item_model.filename,
                 uploaded=item_model.uploaded,
-                file=file,
-                measurement=MeasurementFactory.create_measurement(
-                    measurement_model.measurement_id,
-                    measurement_model.measurement_type,
-                    eval(measurement_model.columns),
-                    measured_data
-                ),
+                file=File({'name': item_model.filename}),
+                measurement=cls._create_measurement(item_model.specimen_item_id,
+                                                    measurement_models[item_model.specimen_item_id],
+                                                    measured_data, column_loader, prefetched),
                 is_empty_source_file=item_model.is_empty_source,
-                curie_points=curie_points
+                curie_points=curie_points.get(item_model.specimen_item_id, [])
             ))
 
         return result
+
+    @staticmethod
+    def _create_measurement(specimen_item_id: int, measurement_model, measured_data, column_loader, prefetched):
+        columns = MeasurementService.get_columns(measurement_model)
+        if column_loader is None or specimen_item_id in measured_data:
+            return MeasurementFactory.create_measurement(measurement_model.measurement_id,
+                                                         measurement_model.measurement_type, columns,
+                                                         measured_data.get(specimen_item_id, {}))
+        return MeasurementFactory.create_lazy_measurement(
+            measurement_model.measurement_id, measurement_model.measurement_type, columns,
+            prefetched.get(specimen_item_id, {}),
+            lambda column: column_loader.load_column(specimen_item_id, column))
+
+    @staticmethod
+    def get_measured_data_service():
+        if settings.measured_data_layout == 'measurement':
+            return MeasurementBlobService(measurement_blob_repository=measurement_blob_repo)
+        return MeasuredDataService(measured_data_repository=measured_data_repo)
@@ -6,14 +6,13 @@ from tma.core.data.parser.model.parameter import Parameter
 
 from tma.core.service.measurement.model.curie.cuie_point import CuriePoint
 from tma.core.service.sample.controller.repository_controllers.curie_controller import CuriePointsRepositoryController
-from tma.core.service.sample.controller.repository_controllers.measured_data_controller import \
-    MeasuredDataRepositoryController
 from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
     SpecialItemRepositoryController
 from tma.core.service.sample.controller.repository_controllers.sample_controller import SampleRepositoryController
 from tma.core.service.sample.model.sample import Sample
 from tma.core.service.sample.utility.show_mode import ShowMode
 from tma.core.service.sample.model.specimen_item import SpecimenItem
+from tma.core.service.sample.write_behind import write_behind_queue
 from tma.core.service.measurement.analysis.data_calculation import DataCalculation
 
 import solara
@@ -172,11 +171,12 @@ class SampleController:
 
         self.sample.value.clear_fields()
 
-        sample_controller_new.delete_sample(self.sample.value)
+        sample_controller_new.delete_sample()
 
     def delete_point(self, line_df_index, line_raw_index, plot_index):
         file = self.get_selected_specimen_item()
         file.delete_point(line_raw_index, plot_index)
+        write_behind_queue.enqueue_measured_data(self.sample.value, file)
 
     def find_line_by_xy(self, x_column, y_column, x_value, y_value):
         specimen_item = self.get_selected_specimen_item()
@@ -186,22 +186,24 @@ class SampleController:
     def set_interpolate_method(selected_item: SpecimenItem, method: str):
         selected_item.interpolate_method.set(method)
 
-    def smooth_specimen_item(self, window_size):
-        measured_data_repository_controller = MeasuredDataRepositoryController()
-
+    def smooth_specimen_item(self, window_size, method='Moving Average'):
         current_specimen_item = self.get_selected_specimen_item()
         if current_specimen_item.is_empty_furnace_or_cryostat_file():
-            current_specimen_item.smooth(window_size)
-            measured_data_repository_controller.update_measured_data(
-                self.sample.value,
-                current_specimen_item.filename.value,
-                current_specimen_item.measurement.value.get_measured_data()
-            )
+            current_specimen_item.smooth(window_size, method)
+            write_behind_queue.enqueue_measured_data(self.sample.value, current_specimen_item)
 
     @staticmethod
     def get_interpolation_methods():
         return DataCalculation.get_available_interpolation_methods()
 
+    @staticmethod
+    def get_smoothing_methods():
+        return DataCalculation.get_available_smoothing_methods()
+
+    @staticmethod
+    def get_outlier_detection_methods():
+        return DataCalculation.get_available_outlier_detection_methods()
+
     def calculate_curie_points(self, smoothness_degree, inflection_point_threshold=0, second_derivative_threshold=0,
                                first_derivative_threshold=0, show_critical_points=True,
                                specimen_item: SpecimenItem = None):
@@ -283,15 +285,16 @@ class SampleController:
         return None
 
     def update_point(self, values, line_raw_index, plot_index):
-        measured_data_repository_controller = MeasuredDataRepositoryController()
-
         file: SpecimenItem = self.get_selected_specimen_item()
         file.update_point(values, line_raw_index, plot_index)
-        measured_data_repository_controller.update_measured_data(
-            self.sample.value,
-            file.filename.value,
-            file.measurement.value.get_measured_data()
-        )
+        write_behind_queue.enqueue_measured_data(self.sample.value, file)
+
+    def get_persistence_error(self) -> Optional[str]:
+        """
+        Returns the error of the last failed write of the queued edits of the sample, or None.
+        """
+        error = write_behind_queue.pop_error(self.sample.value.sample_id)
+        return None if error is None else error.reason
 
     def create_curie_point(self, column_name: str, id_plot_select: int, temperature_value: float,
                            magnetization_value: float):
@@ -314,6 +317,7 @@ class SampleController:
                 magnetization_value=magnetization_value
             )
             file.add_curie_point(curie_point)
+            sample_controller_new.invalidate_cache(keep=self.sample.value)
             self.set_displayed_element(element_type=PointTypes.StoredCuriePoints,
                                        x_values=[curie_point.temperature_value],
                                        y_values=[curie_point.magnetization_value], update=True)
@@ -326,24 +330,21 @@ class SampleController:
         sample_controller_new = SampleRepositoryController(session_id=solara.get_session_id())
 
         file: SpecimenItem = self.get_selected_specimen_item()
-        specimen_repository_controller = SpecialItemRepositoryController(sample_controller_new.sample_model)
-        curie_point_repository_controller = CuriePointsRepositoryController(
-            specimen_repository_controller.get_specimen_item(file.filename.value))
-
         curie_point = CuriePoint.find_by_values(file.curie_points, temperature_value, magnetization_value)
-        curie_point_repository_controller.delete_curie_point(curie_point)
+        write_behind_queue.enqueue_curie_point_deletion(self.sample.value, curie_point.id_curie_point)
         file.delete_curie_point(curie_point)
+        sample_controller_new.invalidate_cache(keep=self.sample.value)
 
         temperatures = [point.temperature_value for point in file.curie_points]
         magnetization = [point.magnetization_value for point in file.curie_points]
         self.set_displayed_element(PointTypes.StoredCuriePoints, temperatures, magnetization)
         self.set_displayed_element(LineTypes.StoredCurieLine, temperatures, magnetization)
 
-    def detect_outline_points(self, threshold: float):
+    def detect_outline_points(self, threshold: float, method='Mean', **config):
         current_specimen_item = self.get_selected_specimen_item()
         y_column = self.get_y_column()
         temperature_values_outline_points, magnetization_values_outline_points = (
-            current_specimen_item.detect_outline_points(y_column, threshold))
+            current_specimen_item.detect_outline_points(y_column, threshold, method, **config))
         if len(temperature_values_outline_points) == 0 and len(magnetization_values_outline_points) == 0:
             return "No points found with this deviation"
         self.set_displayed_element(element_type=PointTypes.OutlinePoint,
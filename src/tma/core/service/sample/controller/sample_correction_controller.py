@@ -1,7 +1,8 @@
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Tuple
 
 from tma.core.service.exceptions.invalid_filename_error import InvalidFilenameError
 from tma.core.service.exceptions.parameter_error import ParameterError
+from tma.core.service.measurement.pipeline.processing_pipeline import ProcessingPipeline
 from tma.core.service.sample.controller.repository_controllers.measured_data_controller import \
     MeasuredDataRepositoryController
 from tma.core.service.sample.controller.sample_controller import SampleController
@@ -30,11 +31,7 @@ class SampleCorrectionController:
 
         try:
             file.correct_by_constant(constant)
-            measured_data_repository_controller.update_measured_data(
-                self.sample.value,
-                file.filename.value,
-                file.measurement.value.get_measured_data()
-            )
+            measured_data_repository_controller.save_changes(self.sample.value, file)
             return None
         except Exception as e:
             return str(e)
@@ -67,90 +64,103 @@ class SampleCorrectionController:
         measured_data_repository_controller = MeasuredDataRepositoryController()
         try:
             filename_to_correct.correct_by_file(correction_file)
-            measured_data_repository_controller.update_measured_data(
-                self.sample.value,
-                filename_to_correct.filename.value,
-                filename_to_correct.measurement.value.get_measured_data()
-            )
+            measured_data_repository_controller.save_changes(self.sample.value, filename_to_correct)
             return None
         except InvalidFilenameError as e:
             return str(e)
         except Exception as e:
             return str(e)
 
-    def calculate_bulk(self, method, calculate_for_all_files=False, **config) -> Optional[str]:
-        def measurement_type_filter(item):
-            return (item.measurement.value.get_measurement_type() ==
-                    self.sample_controller.get_selected_specimen_item().measurement.value.get_measurement_type())
-
-        files_to_correct = self._get_files_to_correct(calculate_for_all_files, measurement_type_filter)
-        errors = []
-
-        for filename in files_to_correct:
-            current_specimen_item = self.sample.value.get_specimen_item_by_filename(filename)
-            if current_specimen_item is None:
-                errors.append(f'File {filename} not found.')
-                continue
+    def calculate_bulk(self, method, calculate_for_all_files=False, volume=None, mass=None,
+                       density=None) -> Optional[str]:
+        """
+        Calculates the bulk susceptibility of the selected file or of all the files of the same measurement type
+        in one batch, and stores the results in one transaction.
+        """
+        specimen_items, errors = self._get_specimen_items_to_calculate(calculate_for_all_files)
+        try:
+            SpecimenItem.calculate_bulk_many(specimen_items, method, volumes=volume, masses=mass, densities=density)
+        except Exception:
+            # A failing file fails the whole batch, the files are then calculated one by one to report it
+            specimen_items = self._calculate_each(
+                specimen_items, errors,
+                lambda item: item.calculate_bulk(method, volume=volume, mass=mass, density=density))
+
+        if specimen_items:
+            self._save_measured_data(specimen_items)
+        return '\n'.join(errors) if errors else None
 
-            error = self._process_bulk_calculation(current_specimen_item, method, **config)
-            if error:
-                errors.append(f'Error with file {filename}: {error}')
+    def calculate_mass(self, mass, calculate_for_all_files=False) -> Optional[str]:
+        """
+        Calculates the mass susceptibility of the selected file or of all the files of the same measurement type
+        in one batch, and stores the results in one transaction.
+        """
+        specimen_items, errors = self._get_specimen_items_to_calculate(calculate_for_all_files)
+        try:
+            SpecimenItem.calculate_mass_many(specimen_items, mass)
+        except Exception:
+            # A failing file fails the whole batch, the files are then calculated one by one to report it
+            specimen_items = self._calculate_each(specimen_items, errors, lambda item: item.calculate_mass(mass))
 
+        if specimen_items:
+            self._save_measured_data(specimen_items)
         return '\n'.join(errors) if errors else None
 
-    def _process_bulk_calculation(self, file: SpecimenItem, method, **config) -> Optional[str]:
-        measured_data_repository_controller = MeasuredDataRepositoryController()
-
-        if not file.is_empty_furnace_or_cryostat_file():
-            # try:
-            file.calculate_bulk(method, **config)
-            measured_data_repository_controller.update_measured_data(
-                self.sample.value,
-                file.filename.value,
-                file.measurement.value.get_measured_data()
-            )
-            return None
-        # except ParameterError as e:
-        #     return str(e.reason)
-        # except Exception as e:
-        #     return str(e)
+    @staticmethod
+    def _calculate_each(specimen_items: List[SpecimenItem], errors: List[str],
+                        calculate: Callable[[SpecimenItem], None]) -> List[SpecimenItem]:
+        calculated_items = []
+        for item in specimen_items:
+            try:
+                calculate(item)
+            except (ParameterError, InvalidFilenameError) as e:
+                errors.append(f'Error with file {item.filename.value}: {e.reason}')
+            except Exception as e:
+                errors.append(f'Error with file {item.filename.value}: {e}')
+            else:
+                calculated_items.append(item)
+        return calculated_items
+
+    def run_pipeline(self, pipeline: ProcessingPipeline, apply_to_all_files=False) -> Optional[str]:
+        """
+        Runs the processing pipeline on the selected file or on all the files of the same measurement type.
+        Only the stages affected by a change since the previous run are executed, and only the files whose
+        data changed are stored.
+        """
+        specimen_items, errors = self._get_specimen_items_to_calculate(apply_to_all_files)
+        # A stage failing on a file, such as an invalid smoothing window, is reported without stopping the others
+        processed_items = self._calculate_each(specimen_items, errors, lambda item: item.run_pipeline(pipeline))
+        changed_items = [item for item in processed_items if item.pipeline_state.output_changed]
+
+        if changed_items:
+            self._save_measured_data(changed_items)
+        return '\n'.join(errors) if errors else None
 
-    def calculate_mass(self, mass, calculate_for_all_files=False) -> Optional[str]:
+    def _get_specimen_items_to_calculate(self, calculate_for_all_files: bool) -> Tuple[List[SpecimenItem], List[str]]:
         def measurement_type_filter(item):
             return (item.measurement.value.get_measurement_type() ==
                     self.sample_controller.get_selected_specimen_item().measurement.value.get_measurement_type())
 
         files_to_correct = self._get_files_to_correct(calculate_for_all_files, measurement_type_filter)
-        errors = []
+        specimen_items, errors = [], []
 
         for filename in files_to_correct:
             current_specimen_item = self.sample.value.get_specimen_item_by_filename(filename)
             if current_specimen_item is None:
                 errors.append(f'File {filename} not found.')
-                continue
-
-            error = self._process_mass_calculation(current_specimen_item, mass)
-            if error:
-                errors.append(f'Error with file {filename}: {error}')
+            elif not current_specimen_item.is_empty_furnace_or_cryostat_file():
+                specimen_items.append(current_specimen_item)
 
-        return '\n'.join(errors) if errors else None
+        return specimen_items, errors
 
-    def _process_mass_calculation(self, file: SpecimenItem, mass) -> Optional[str]:
+    def _save_measured_data(self, specimen_items: List[SpecimenItem]):
         measured_data_repository_controller = MeasuredDataRepositoryController()
-
-        if not file.is_empty_furnace_or_cryostat_file():
-            try:
-                file.calculate_mass(mass)
-                measured_data_repository_controller.update_measured_data(
-                    self.sample.value,
-                    file.filename.value,
-                    file.measurement.value.get_measured_data()
-                )
-                return None
-            except ParameterError as e:
-                return str(e.reason)
-            except Exception as e:
-                return str(e)
+        measured_data_repository_controller.update_measured_data_many(
+            self.sample.value,
+            {item.filename.value: item.measurement.value.get_measured_data() for item in specimen_items}
+        )
+        for item in specimen_items:
+            item.measurement.value.clear_changes()
 
     def _get_files_to_correct(self, correct_all_files: bool, additional_filter: Optional[Callable] = None) -> List[str]:
         if correct_all_files:
@@ -4,12 +4,11 @@ import solara
 
 from tma.core.service.measurement.model.curie.cuie_point import CuriePoint
 from tma.core.service.sample.controller.repository_controllers.curie_controller import CuriePointsRepositoryController
-from tma.core.service.sample.controller.repository_controllers.measured_data_controller import \
-    MeasuredDataRepositoryController
 from tma.core.service.sample.controller.repository_controllers.sample_controller import SampleRepositoryController
 from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
     SpecialItemRepositoryController
 from tma.core.service.sample.model.specimen_item import SpecimenItem
+from tma.core.service.sample.write_behind import write_behind_queue
 from tma.multipages.components.graphic_elements.graphic_element_factory import GraphicElementFactory
 from tma.multipages.components.graphic_elements.style import PointTypes, LineTypes, BaseType
 
@@ -64,6 +63,7 @@ class SpecimenItemController:
     def delete_point(self, line_df_index, line_raw_index, plot_index):
         file = self.get_selected_specimen_item()
         file.delete_point(line_raw_index, plot_index)
+        write_behind_queue.enqueue_measured_data(self.sample.value, file)
 
     def find_line_by_xy(self, x_column, y_column, x_value, y_value):
         specimen_item = self.get_selected_specimen_item()
@@ -73,17 +73,11 @@ class SpecimenItemController:
     def set_interpolate_method(selected_item: SpecimenItem, method: str):
         selected_item.interpolate_method.set(method)
 
-    def smooth_specimen_item(self, window_size):
-        measured_data_repository_controller = MeasuredDataRepositoryController()
-
+    def smooth_specimen_item(self, window_size, method='Moving Average'):
         current_specimen_item = self.get_selected_specimen_item()
         if current_specimen_item.is_empty_furnace_or_cryostat_file():
-            current_specimen_item.smooth(window_size)
-            measured_data_repository_controller.update_measured_data(
-                self.sample.value,
-                current_specimen_item.filename.value,
-                current_specimen_item.measurement.value.get_measured_data()
-            )
+            current_specimen_item.smooth(window_size, method)
+            write_behind_queue.enqueue_measured_data(self.sample.value, current_specimen_item)
 
     def calculate_curie_points(self, smoothness_degree, threshold=0):
         current_specimen_item = self.get_selected_specimen_item()
@@ -166,15 +160,9 @@ class SpecimenItemController:
                 return element
 
     def update_point(self, values, line_raw_index, plot_index):
-        measured_data_repository_controller = MeasuredDataRepositoryController()
-
         file: SpecimenItem = self.get_selected_specimen_item()
         file.update_point(values, line_raw_index, plot_index)
-        measured_data_repository_controller.update_measured_data(
-            self.sample.value,
-            file.filename.value,
-            file.measurement.value.get_measured_data()
-        )
+        write_behind_queue.enqueue_measured_data(self.sample.value, file)
 
     def create_curie_point(self, column_name: str, id_plot_select: int, temperature_value: float,
                            magnetization_value: float):
@@ -197,6 +185,7 @@ class SpecimenItemController:
                 magnetization_value=magnetization_value
             )
             file.add_curie_point(curie_point)
+            sample_controller_new.invalidate_cache(keep=self.sample.value)
             self.set_displayed_element(element_type=PointTypes.StoredCuriePoints,
                                        x_values=[curie_point.temperature_value],
                                        y_values=[curie_point.magnetization_value], update=True)
@@ -209,13 +198,10 @@ class SpecimenItemController:
         sample_controller_new = SampleRepositoryController(session_id=solara.get_session_id())
 
         file: SpecimenItem = self.get_selected_specimen_item()
-        specimen_repository_controller = SpecialItemRepositoryController(sample_controller_new.sample_model)
-        curie_point_repository_controller = CuriePointsRepositoryController(
-            specimen_repository_controller.get_specimen_item(file.filename.value))
-
         curie_point = CuriePoint.find_by_values(file.curie_points, temperature_value, magnetization_value)
-        curie_point_repository_controller.delete_curie_point(curie_point)
+        write_behind_queue.enqueue_curie_point_deletion(self.sample.value, curie_point.id_curie_point)
         file.delete_curie_point(curie_point)
+        sample_controller_new.invalidate_cache(keep=self.sample.value)
 
         temperatures = [point.temperature_value for point in file.curie_points]
         magnetization = [point.magnetization_value for point in file.curie_points]
@@ -14,7 +14,7 @@ class Sample:
         y_column=Parameter.TSUSC.value,
         name='',
     ):
-        self.sample_id: int
+        self.sample_id: int = sample_id
         self.specimen_items: List[SpecimenItem] = []
         self.x_column: solara.Reactive[str] = solara.reactive(x_column)
         self.y_column: solara.Reactive[str] = solara.reactive(y_column)
@@ -10,16 +10,16 @@ from tma.core.data.parser.model.parameter import Parameter
 from tma.core.service.entrypoit.file import File
 from tma.core.service.exceptions.invalid_filename_error import InvalidFilenameError
 from tma.core.service.exceptions.parameter_error import ParameterError
+from tma.core.service.measurement.analysis.calculation_cache import CalculationCache, calculation_cache
 from tma.core.service.measurement.analysis.curie_calculation import InflectionPointCalculation, \
     MaxSecondDerivativePointCalculation, MaxFirstDerivativePointCalculation
 from tma.core.service.measurement.analysis.data_calculation import DataCalculation
 from tma.core.service.measurement.analysis.mass_calculation import MassCalculation
-from tma.core.service.measurement.analysis.outlier_detection import MeanOutlierDetection
-from tma.core.service.measurement.analysis.smoothing import MovingAverageSmoothing
 from tma.core.service.measurement.model.curie.cuie_point import CuriePoint
 from tma.core.service.measurement.model.measurement_factory import MeasurementFactory
 from tma.core.service.measurement.model.measurement_manager import MeasurementManager
 from tma.core.service.measurement.models.furnance_source import FurnaceSource
+from tma.core.service.measurement.pipeline.processing_pipeline import ProcessingPipeline, PipelineState
 from tma.core.service.sample.utility.show_mode import ShowMode
 from tma.multipages.components.graphic_elements.graphic_element import GraphicElement
 
@@ -44,6 +44,8 @@ class SpecimenItem:
     # displayed_elements: sol.Reactive[Optional[Dict[str, Dict[str, List[float]]]]] = sol.reactive({})
     displayed_elements: sol.Reactive[List[GraphicElement]] = sol.reactive([])
 
+    pipeline_state: Optional[PipelineState] = None
+
     @staticmethod
     def create_file_item(
         specimen_item_id: int,
@@ -206,11 +208,11 @@ class SpecimenItem:
         self.empty_furnace_source.set(FileFurnaceValue(specimen_item.filename.value))
         self.df.set(self.create_dataframe_for_all_columns())
 
-    def smooth(self, window_size=5):
+    def smooth(self, window_size=5, method='Moving Average'):
         if not self.is_empty_furnace_or_cryostat_file():
             return
         data_calc = DataCalculation()
-        data_calc.set_smoothing_strategy(MovingAverageSmoothing, window_size=window_size)
+        data_calc.set_smoothing_strategy(method, window_size=window_size)
         self.measurement.value.smooth(data_calc)
         self.df.set(self.create_dataframe_for_all_columns())
 
@@ -233,30 +235,87 @@ class SpecimenItem:
         self.measurement.value.calculate_mass(data_calc)
         self.df.set(self.create_dataframe_for_all_columns())
 
+    @staticmethod
+    def calculate_bulk_many(specimen_items: List['SpecimenItem'], method, volumes=None, masses=None,
+                            densities=None):
+        """
+        Calculates the bulk susceptibility of several specimens in one batch.
+        Every parameter holds one value per specimen, or a single value shared by all of them.
+        """
+        data_calc = DataCalculation()
+        if method not in data_calc.get_available_bulk_methods():
+            raise NotImplementedError('No such method')
+        MeasurementManager.calculate_bulk_many([item.measurement.value for item in specimen_items], data_calc,
+                                               method, volumes=volumes, masses=masses, densities=densities)
+        for item in specimen_items:
+            item.df.set(item.create_dataframe_for_all_columns())
+
+    @staticmethod
+    def calculate_mass_many(specimen_items: List['SpecimenItem'], masses):
+        """
+        Calculates the mass susceptibility of several specimens in one batch.
+        Masses hold one value per specimen, or a single value shared by all of them.
+        """
+        MeasurementManager.calculate_mass_many([item.measurement.value for item in specimen_items],
+                                               DataCalculation(), masses)
+        for item in specimen_items:
+            item.df.set(item.create_dataframe_for_all_columns())
+
+    def run_pipeline(self, pipeline: ProcessingPipeline) -> Dict[str, object]:
+        """
+        Runs the processing pipeline on the measurement, re-running only the stages affected by a change
+        since the previous run.
+
+        Returns:
+        - The results of the analysis stages keyed by stage name.
+        """
+        self.pipeline_state = pipeline.execute(self.measurement.value, self.pipeline_state)
+        if self.pipeline_state.output_changed:
+            self.df.set(self.create_dataframe_for_all_columns())
+        return self.pipeline_state.results
+
+    def _calculate_cached(self, data_calc: DataCalculation, strategy, y_column, calculate):
+        """
+        Returns the memoized result of the calculation, recomputing it only when the curves of the y column
+        or the strategy parameters changed.
+        """
+        measurement = self.measurement.value.measurement
+        curves = [curve for curve in (measurement.heating_curve.get(y_column), measurement.cooling_curve.get(y_column))
+                  if curve is not None]
+        parameters = (y_column, measurement.has_heating_curve.get(y_column),
+                      measurement.has_cooling_curve.get(y_column))
+        key = CalculationCache.make_key(self.specimen_item_id, curves, strategy, *parameters)
+        return calculation_cache.get_or_compute(key, lambda: calculate(data_calc, y_column),
+                                                lambda: CalculationCache.make_shared_key(curves, strategy, *parameters))
+
     def calculate_curie_by_inflection_point(self, y_column, smoothness_degree, threshold: float):
         data_calc = DataCalculation()
         data_calc.set_curie_calculation_strategy(
             InflectionPointCalculation,
             smoothness_degree=smoothness_degree,
             threshold=threshold)
-        return self.measurement.value.calculate_curie(data_calc, y_column)
+        return self._calculate_cached(data_calc, data_calc.curie_calculation_strategy, y_column,
+                                      self.measurement.value.calculate_curie)
 
-    def detect_outline_points(self, y_column: str, threshold: float):
+    def detect_outline_points(self, y_column: str, threshold: float, method='Mean', **config):
         data_calc = DataCalculation()
-        data_calc.set_outline_detection_strategy(MeanOutlierDetection, threshold=threshold)
-        return self.measurement.value.detect_outline_points(data_calc, y_column)
+        data_calc.set_outline_detection_strategy(method, threshold=threshold, **config)
+        return self._calculate_cached(data_calc, data_calc.outline_detection_strategy, y_column,
+                                      self.measurement.value.detect_outline_points)
 
     def calculate_curie_by_max_second_derivative_point(self, smoothness_degree, y_column, threshold):
         data_calc = DataCalculation()
         data_calc.set_curie_calculation_strategy(
             MaxSecondDerivativePointCalculation, smoothness_degree=smoothness_degree, threshold=threshold)
-        return self.measurement.value.calculate_curie(data_calc, y_column)
+        return self._calculate_cached(data_calc, data_calc.curie_calculation_strategy, y_column,
+                                      self.measurement.value.calculate_curie)
 
     def calculate_curie_by_max_first_derivative_point(self, smoothness_degree, y_column, threshold):
         data_calc = DataCalculation()
         data_calc.set_curie_calculation_strategy(
             MaxFirstDerivativePointCalculation, smoothness_degree=smoothness_degree, threshold=threshold)
-        return self.measurement.value.calculate_curie(data_calc, y_column)
+        return self._calculate_cached(data_calc, data_calc.curie_calculation_strategy, y_column,
+                                      self.measurement.value.calculate_curie)
 
     def transform_specimen_item_to_dict(self):
         return {
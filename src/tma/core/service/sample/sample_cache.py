@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional
+
+from tma.core.settings import settings
+
+
+@dataclass
+class CachedSample:
+    """
+    The sample of a session as loaded from the database.
+
+    Attributes:
+    - sample_model: The Sample record, detached from its database session.
+    - sample (Sample): The hydrated Sample, or None until get_sample is called.
+    - size_bytes (int): The approximate memory used by the hydrated Sample.
+    - last_access (float): The clock time of the last get or put.
+    """
+    sample_model: object
+    sample: Optional[object] = None
+    size_bytes: int = 0
+    last_access: float = 0.0
+
+
+class SampleCache:
+    """
+    An in-process cache of the samples of the sessions, so rendering a page does not read the sample from the database.
+
+    Entries are keyed by (session id, kernel id): the hydrated Sample holds Solara reactive variables, whose values
+    belong to the kernel (browser tab) that set them. An entry idle for longer than the TTL is dropped, and when the
+    hydrated samples exceed the memory budget the least recently used ones are dropped.
+
+    The cached Sample is the object the page controllers edit, so a change written through it keeps it up to date.
+    Any other write must invalidate the entries of the sample.
+
+    Attributes:
+    - max_bytes (int): The approximate memory budget of the hydrated samples.
+    - ttl (float): The number of seconds an entry is kept without being used.
+    - hits, misses, evictions (int): Usage statistics since the last reset.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: float = 1800,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_bytes <= 0 or ttl <= 0:
+            raise ValueError("Cache limits must be positive numbers.")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedSample]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedSample]:
+        """
+        Returns the entry of the key, or None if it is not cached or has expired.
+        """
+        with self._lock:
+            self.evict_expired()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.last_access = self._clock()
+            self.hits += 1
+            return entry
+
+    def put_sample_model(self, key: Hashable, sample_model):
+        """
+        Caches the Sample record of the key, keeping the hydrated Sample if it belongs to the same record.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.sample_model.sample_id == sample_model.sample_id:
+                entry.sample_model = sample_model
+                entry.last_access = self._clock()
+                self._entries.move_to_end(key)
+                return
+            self._remove(key)
+            self._entries[key] = CachedSample(sample_model, last_access=self._clock())
+
+    def put_sample(self, key: Hashable, sample_model, sample):
+        """
+        Caches the hydrated Sample of the key. A Sample larger than the whole budget is not cached.
+        """
+        with self._lock:
+            self._remove(key)
+            size = estimate_sample_size(sample)
+            if size > self.max_bytes:
+                self._entries[key] = CachedSample(sample_model, last_access=self._clock())
+                return
+            self._entries[key] = CachedSample(sample_model, sample, size, self._clock())
+            self.size_bytes += size
+            self._evict_over_budget()
+
+    def invalidate(self, sample_id: int, keep=None) -> int:
+        """
+        Drops the entries of the sample.
+
+        Parameters:
+        - sample_id (int): The id of the sample written to the database.
+        - keep (Sample): The hydrated Sample the write was made through, which is already up to date and kept.
+
+        Returns:
+        - The number of dropped entries.
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if entry.sample_model.sample_id == sample_id and (keep is None or entry.sample is not keep)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def invalidate_context(self, context_id) -> int:
+        """
+        Drops the entries of a closed Solara kernel. Returns the number of dropped entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[1] == context_id]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def evict_expired(self) -> int:
+        """
+        Drops the entries not used for longer than the TTL. Returns the number of dropped entries.
+        """
+        with self._lock:
+            deadline = self._clock() - self.ttl
+            keys = [key for key, entry in self._entries.items() if entry.last_access < deadline]
+            for key in keys:
+                self._remove(key)
+            self.evictions += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _evict_over_budget(self):
+        for key in list(self._entries):
+            if self.size_bytes <= self.max_bytes:
+                break
+            if self._entries[key].sample is not None:
+                self._remove(key)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry.size_bytes
+
+
+def estimate_sample_size(sample) -> int:
+    """
+    Approximates the memory used by a hydrated Sample, counting 8 bytes per temperature and value of every curve.
+    The curves not read yet are not counted.
+    """
+    size = 0
+    for specimen_item in sample.specimen_items:
+        measurement = specimen_item.measurement.value.measurement
+        for curves in (measurement.heating_curve, measurement.cooling_curve):
+            for curve in curves.values():
+                if not curve.is_loaded:
+                    continue
+                size += 8 * (len(curve.temperature) + len(curve.values))
+    return size
+
+
+sample_cache = SampleCache(max_bytes=settings.sample_cache_max_bytes, ttl=settings.sample_cache_ttl)
@@ -0,0 +1,309 @@
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+from tma.core.database import get_session_scope
+from tma.core.model.repository import curie_point_repo, measured_data_repo, measurement_blob_repo
+from tma.core.service.exceptions.write_behind_error import WriteBehindError
+from tma.core.service.sample.sample_cache import sample_cache
+from tma.core.service.services.curie_point_service import CuriePointService
+from tma.core.service.services.measured_data_cache import MeasuredDataCache
+from tma.core.service.services.measured_data_service import MeasuredDataService
+from tma.core.service.services.measurement_blob_service import MeasurementBlobService
+from tma.core.settings import settings
+
+
+@dataclass
+class PendingMeasuredData:
+    """
+    The edits of a specimen item not written yet.
+
+    Attributes:
+    - sample_id (int): The sample of the specimen item.
+    - context_id: The Solara kernel the edits were made in.
+    - specimen_item_id (int): The edited specimen item.
+    - measurement_id (int): The measurement of the specimen item.
+    - data (dict): The curves of the changed columns keyed by column and phase, the last edit of a column wins.
+      With the 'measurement' layout, the curves of all the columns.
+    - columns (list): The columns of the measurement at the last edit.
+    - edits (int): The number of edits coalesced in the entry.
+    - failures (int): The number of failed writes of the entry.
+    """
+    sample_id: int
+    context_id: Hashable
+    specimen_item_id: int
+    measurement_id: int
+    data: dict
+    columns: list
+    edits: int = 1
+    failures: int = 0
+
+
+@dataclass
+class PendingCuriePointDeletion:
+    sample_id: int
+    context_id: Hashable
+    failures: int = 0
+
+
+class WriteBehindQueue:
+    """
+    Writes the edits of the pages behind the in-memory Sample, so an edit costs the page only its in-memory change.
+
+    An edit snapshots the changed curves of the specimen item and queues them. Edits of the same specimen item and
+    column replace each other until they are written. A background thread writes the queued edits in one
+    transaction every interval seconds, or earlier once max_pending specimen items and Curie points are queued.
+
+    A failed write is queued again, under any newer edits, and reported by pop_error; after max_failures failed
+    writes the edits are dropped. Readers of the database flush the sample first, see flush.
+
+    Attributes:
+    - interval (float): The number of seconds between two writes. 0 writes every edit before enqueue returns.
+    - max_pending (int): The number of queued specimen items and Curie points that triggers a write.
+    - max_failures (int): The number of failed writes after which queued edits are dropped.
+    - edits, writes, failures (int): Usage statistics since the start.
+    """
+
+    def __init__(self, interval: float = 0.5, max_pending: int = 100, max_failures: int = 3):
+        if interval < 0 or max_pending <= 0 or max_failures <= 0:
+            raise ValueError("Write-behind limits must be positive numbers.")
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_failures = max_failures
+        self._measured_data: Dict[int, PendingMeasuredData] = {}
+        self._curie_point_deletions: Dict[int, PendingCuriePointDeletion] = {}
+        self._errors: Dict[int, WriteBehindError] = {}
+        self._condition = threading.Condition()
+        # Serializes the writes, so a flush returns only once the earlier edits of its sample are written
+        self._write_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.edits = 0
+        self.writes = 0
+        self.failures = 0
+
+    def enqueue_measured_data(self, sample, specimen_item):
+        """
+        Queues the columns of the specimen item changed since it was loaded or last queued, and clears its changes.
+
+        Parameters:
+        - sample (Sample): The sample the specimen item belongs to.
+        - specimen_item (SpecimenItem): The edited specimen item.
+        """
+        measurement_manager = specimen_item.measurement.value
+        changed_columns = measurement_manager.measurement.get_changed_columns()
+        if not changed_columns:
+            return
+
+        if settings.measured_data_layout == 'measurement':
+            data = measurement_manager.get_measured_data()
+        else:
+            data = measurement_manager.get_measured_data(changed_columns)
+        columns = list(measurement_manager.get_measurement_columns())
+        measurement_manager.clear_changes()
+
+        with self._condition:
+            was_empty = not len(self)
+            pending = self._measured_data.get(specimen_item.specimen_item_id)
+            if pending is None:
+                self._measured_data[specimen_item.specimen_item_id] = PendingMeasuredData(
+                    sample.sample_id, get_session_scope()[0], specimen_item.specimen_item_id,
+                    measurement_manager.get_measurement_id(), data, columns)
+            else:
+                pending.data.update(data)
+                pending.columns = columns
+                pending.edits += 1
+            self.edits += 1
+            self._notify(was_empty)
+        sample_cache.invalidate(sample.sample_id, keep=sample)
+        self._write_or_start_worker(sample.sample_id)
+
+    def enqueue_curie_point_deletion(self, sample, curie_point_id: int):
+        """
+        Queues the deletion of a stored Curie point.
+        """
+        with self._condition:
+            was_empty = not len(self)
+            self._curie_point_deletions[curie_point_id] = PendingCuriePointDeletion(sample.sample_id,
+                                                                                    get_session_scope()[0])
+            self.edits += 1
+            self._notify(was_empty)
+        self._write_or_start_worker(sample.sample_id)
+
+    def flush(self, sample_id: Optional[int] = None, context_id: Hashable = None, raise_errors: bool = False) -> int:
+        """
+        Writes the queued edits now, in one transaction.
+
+        Parameters:
+        - sample_id (int): Writes only the edits of the sample, all of them if None.
+        - context_id: Writes only the edits made in the Solara kernel, all of them if None.
+        - raise_errors (bool): Raises WriteBehindError if the write fails, instead of only queueing the edits again.
+
+        Returns:
+        - The number of written specimen items and Curie points.
+        """
+        with self._write_lock:
+            with self._condition:
+                measured_data = _take(self._measured_data, sample_id, context_id)
+                curie_point_deletions = _take(self._curie_point_deletions, sample_id, context_id)
+            if not measured_data and not curie_point_deletions:
+                return 0
+
+            try:
+                self._write(measured_data, curie_point_deletions)
+            except Exception as e:
+                error = self._requeue(measured_data, curie_point_deletions, e)
+                if raise_errors:
+                    raise error from e
+                return 0
+
+        MeasuredDataCache().invalidate(measured_data)
+        with self._condition:
+            self.writes += 1
+        return len(measured_data) + len(curie_point_deletions)
+
+    def discard(self, sample_id: int) -> int:
+        """
+        Drops the queued edits of a deleted sample. Returns the number of dropped specimen items and Curie points.
+        """
+        with self._write_lock, self._condition:
+            self._errors.pop(sample_id, None)
+            return (len(_take(self._measured_data, sample_id, None))
+                    + len(_take(self._curie_point_deletions, sample_id, None)))
+
+    def pop_error(self, sample_id: int) -> Optional[WriteBehindError]:
+        """
+        Returns the last failed write of the sample's edits since the previous call, or None.
+        """
+        with self._condition:
+            return self._errors.pop(sample_id, None)
+
+    def close(self):
+        """
+        Stops the background thread and writes the queued edits.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                'pending': len(self._measured_data) + len(self._curie_point_deletions),
+                'edits': self.edits,
+                'writes': self.writes,
+                'failures': self.failures,
+            }
+
+    def __len__(self):
+        return len(self._measured_data) + len(self._curie_point_deletions)
+
+    def _notify(self, was_empty: bool):
+        """
+        Wakes the background thread up to collect the edits of an interval, or to write a full queue at once.
+        """
+        if was_empty or len(self) >= self.max_pending:
+            self._condition.notify_all()
+
+    def _write_or_start_worker(self, sample_id: int):
+        if self.interval == 0 or self._closed:
+            # A failed write is recorded for pop_error, like the writes of the background thread
+            self.flush(sample_id)
+            return
+        with self._condition:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='tma-write-behind', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not len(self) and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Collects the edits of the interval, a full queue is written at once
+                if len(self) < self.max_pending:
+                    self._condition.wait(timeout=self.interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    @staticmethod
+    def _write(measured_data: Dict[int, PendingMeasuredData],
+               curie_point_deletions: Dict[int, PendingCuriePointDeletion]):
+        if measured_data and settings.measured_data_layout == 'measurement':
+            measurement_blob_service = MeasurementBlobService(measurement_blob_repository=measurement_blob_repo)
+            measurement_blob_service.save_measured_data_many(
+                [(pending.measurement_id, pending.specimen_item_id, pending.data)
+                 for pending in measured_data.values()],
+                {pending.measurement_id: list(pending.data) for pending in measured_data.values()})
+        elif measured_data:
+            measured_data_service = MeasuredDataService(measured_data_repository=measured_data_repo)
+            by_measurement = {pending.measurement_id: pending for pending in measured_data.values()}
+            missing_columns = measured_data_service.update_columns_many(
+                {measurement_id: pending.data for measurement_id, pending in by_measurement.items()})
+            if missing_columns:
+                measured_data_service.save_measured_data_many(
+                    {},
+                    [(measurement_id, by_measurement[measurement_id].specimen_item_id, column,
+                      by_measurement[measurement_id].data[column])
+                     for measurement_id, columns in missing_columns.items() for column in columns],
+                    {measurement_id: by_measurement[measurement_id].columns for measurement_id in missing_columns})
+
+        if curie_point_deletions:
+            CuriePointService(curie_point_repository=curie_point_repo).delete_curie_points(curie_point_deletions)
+
+    def _requeue(self, measured_data: Dict[int, PendingMeasuredData],
+                 curie_point_deletions: Dict[int, PendingCuriePointDeletion], cause: Exception) -> WriteBehindError:
+        """
+        Queues the edits of a failed write again, under the edits queued since, and records the error of their
+        samples. Edits that failed max_failures times are dropped.
+        """
+        with self._condition:
+            self.failures += 1
+            dropped = False
+            for specimen_item_id, pending in measured_data.items():
+                pending.failures += 1
+                if pending.failures >= self.max_failures:
+                    dropped = True
+                    continue
+                newer = self._measured_data.get(specimen_item_id)
+                if newer is not None:
+                    pending.data.update(newer.data)
+                    pending.columns = newer.columns
+                    pending.edits += newer.edits
+                self._measured_data[specimen_item_id] = pending
+            for curie_point_id, pending in curie_point_deletions.items():
+                pending.failures += 1
+                if pending.failures >= self.max_failures:
+                    dropped = True
+                    continue
+                self._curie_point_deletions.setdefault(curie_point_id, pending)
+
+            if dropped:
+                error = WriteBehindError(f"The changes could not be saved and were discarded: {cause}")
+            else:
+                error = WriteBehindError(f"The changes could not be saved yet, they will be retried: {cause}")
+            for pending in (*measured_data.values(), *curie_point_deletions.values()):
+                self._errors[pending.sample_id] = error
+            return error
+
+
+def _take(pending: dict, sample_id: Optional[int], context_id: Hashable) -> dict:
+    """
+    Removes the entries of the sample and the kernel from the queue and returns them.
+    """
+    keys = [key for key, entry in pending.items()
+            if (sample_id is None or entry.sample_id == sample_id)
+            and (context_id is None or entry.context_id == context_id)]
+    return {key: pending.pop(key) for key in keys}
+
+
+write_behind_queue = WriteBehindQueue(interval=settings.write_behind_interval,
+                                      max_pending=settings.write_behind_max_pending)
+atexit.register(write_behind_queue.close)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, Iterable, List
 
 from tma.core.model.repository.curie_point_repository import CuriePointRepository
 from tma.core.service.measurement.model.curie.cuie_point import CuriePoint
@@ -13,17 +13,33 @@ class CuriePointService:
 
     def get_curie_points_models_by_specimen_item_id(self, specimen_item_id: int) -> List[CuriePoint]:
         points = self.curie_point_repository.get_curie_point(specimen_item_id=specimen_item_id)
-        result = []
+        return [self._to_model(point) for point in points]
+
+    def get_curie_points_models_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> Dict[
+        int, List[CuriePoint]]:
+        """
+        Returns the Curie points of several specimen items read with one query, keyed by specimen_item_id.
+        """
+        return self.group_by_specimen_item_id(
+            self.curie_point_repository.get_curie_points_by_specimen_item_ids(specimen_item_ids))
+
+    @classmethod
+    def group_by_specimen_item_id(cls, points: Iterable) -> Dict[int, List[CuriePoint]]:
+        result = {}
         for point in points:
-            result.append(CuriePoint(
-                id_curie_point=point.curie_point_id,
-                id_plot_select=point.id_plot_selected,
-                column_name=point.column_name,
-                temperature_value=point.temperature_value,
-                magnetization_value=point.magnetization_value,
-            ))
+            result.setdefault(point.specimen_item_id, []).append(cls._to_model(point))
         return result
 
+    @staticmethod
+    def _to_model(point) -> CuriePoint:
+        return CuriePoint(
+            id_curie_point=point.curie_point_id,
+            id_plot_select=point.id_plot_selected,
+            column_name=point.column_name,
+            temperature_value=point.temperature_value,
+            magnetization_value=point.magnetization_value,
+        )
+
     def add_curie_point(
         self,
         specimen_item_id: int,
@@ -42,3 +58,6 @@ class CuriePointService:
 
     def delete_curie_point(self, curie_point_id: int):
         self.curie_point_repository.delete_curie_point(curie_point_id)
+
+    def delete_curie_points(self, curie_point_ids: Iterable[int]):
+        self.curie_point_repository.delete_curie_points_many(curie_point_ids)
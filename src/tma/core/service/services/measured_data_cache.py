@@ -0,0 +1,67 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from tma.core.cache_backend import get_cache_backend, measured_data_key
+from tma.core.model.column_codec import encode_measurement, decode_measurement
+from tma.core.settings import settings
+
+
+class MeasuredDataCache:
+    """
+    Keeps the measured data of the specimen items in the cache backend, encoded like the measurement blobs,
+    so loading a sample reads from the database only the specimen items missing in the cache.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or get_cache_backend()
+
+    def get_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int],
+                                      load: Callable[[list], Dict[int, dict]]) -> Dict[int, dict]:
+        """
+        Returns the measured data of the specimen items keyed by specimen item id.
+
+        Parameters:
+        - specimen_item_ids (iterable): The ids of the specimen items.
+        - load (callable): Reads the measured data of the given specimen item ids from the database.
+
+        Returns:
+        - The curves of every specimen item keyed by column and phase.
+        """
+        measured_data, missing_ids = self.get_cached(specimen_item_ids)
+        if missing_ids:
+            loaded = load(missing_ids)
+            self.store(loaded)
+            measured_data.update(loaded)
+        return measured_data
+
+    def get_cached(self, specimen_item_ids: Iterable[int]) -> Tuple[Dict[int, dict], List[int]]:
+        """
+        Returns the cached measured data keyed by specimen item id, and the ids of the specimen items missing
+        in the cache.
+        """
+        specimen_item_ids = list(specimen_item_ids)
+        cached = self.backend.get_many(measured_data_key(specimen_item_id) for specimen_item_id in specimen_item_ids)
+
+        measured_data, missing_ids = {}, []
+        for specimen_item_id in specimen_item_ids:
+            blob = cached.get(measured_data_key(specimen_item_id))
+            if blob is None:
+                missing_ids.append(specimen_item_id)
+            else:
+                measured_data[specimen_item_id] = decode_measurement(blob, writable=True)
+        return measured_data, missing_ids
+
+    def store(self, measured_data: Dict[int, dict]):
+        """
+        Caches the measured data read from the database, keyed by specimen item id.
+        """
+        self.backend.set_many({
+            measured_data_key(specimen_item_id):
+                encode_measurement(data, compression=settings.measured_data_compression)
+            for specimen_item_id, data in measured_data.items()
+        })
+
+    def invalidate(self, specimen_item_ids: Iterable[int]):
+        """
+        Drops the cached measured data of the specimen items after their data was written.
+        """
+        self.backend.delete(*[measured_data_key(specimen_item_id) for specimen_item_id in specimen_item_ids])
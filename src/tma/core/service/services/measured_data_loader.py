@@ -0,0 +1,53 @@
+import threading
+from typing import Callable, Dict, Iterable, List
+
+from tma.core.data.parser.model.parameter import Parameter
+
+
+class MeasuredDataColumnLoader:
+    """
+    Reads the measured data of the specimen items of a sample column by column, so a hydrated sample holds only
+    the columns that were used.
+
+    The temperature and the prefetched columns are read for all the specimen items with one query. Another
+    column is read on first access, for all the specimen items at once since the pages plot the same column
+    of every specimen item.
+    """
+
+    def __init__(self, specimen_item_ids: Iterable[int], load: Callable[[List[int], List[str]], Dict[int, dict]]):
+        """
+        Parameters:
+        - specimen_item_ids (iterable): The specimen items of the sample.
+        - load (callable): Reads the given columns of the given specimen item ids, keyed by specimen_item_id.
+        """
+        self.specimen_item_ids = list(specimen_item_ids)
+        self.load = load
+        self._columns: Dict[str, Dict[int, dict]] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, columns: Iterable[str]) -> Dict[int, dict]:
+        """
+        Reads the temperature and the given columns of all the specimen items.
+
+        Returns:
+        - The curves of every specimen item keyed by column and phase.
+        """
+        columns = list(dict.fromkeys([Parameter.TEMP.value, *columns]))
+        if not self.specimen_item_ids:
+            return {}
+        loaded = self.load(self.specimen_item_ids, columns)
+        return {specimen_item_id: loaded.get(specimen_item_id, {}) for specimen_item_id in self.specimen_item_ids}
+
+    def load_column(self, specimen_item_id: int, column: str) -> Dict[str, list]:
+        """
+        Returns the curves of a column of a specimen item keyed by phase. The column of the other specimen items
+        is read with it and kept until they ask for it.
+        """
+        with self._lock:
+            loaded = self._columns.get(column)
+            if loaded is None or specimen_item_id not in loaded:
+                specimen_item_ids = self.specimen_item_ids if loaded is None else [specimen_item_id]
+                data = self.load(specimen_item_ids, [column])
+                loaded = self._columns.setdefault(column, {})
+                loaded.update({item_id: data.get(item_id, {}).get(column, {}) for item_id in specimen_item_ids})
+            return loaded.pop(specimen_item_id)
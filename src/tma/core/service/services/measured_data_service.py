@@ -1,13 +1,44 @@
 import json
+from typing import Dict, List, Tuple, Iterable, Optional
 
 import numpy as np
 
+from tma.core.model.column_codec import encode_columns, decode_columns
+from tma.core.model.models.measurement_data import MeasuredData
 from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.settings import settings
 
 
 class MeasuredDataService:
-    def __init__(self, measured_data_repository: MeasuredDataRepository):
+    record_model = MeasuredData
+
+    def __init__(self, measured_data_repository: MeasuredDataRepository, storage_format: Optional[str] = None):
         self.measured_data_repository = measured_data_repository
+        self.storage_format = storage_format or settings.measured_data_format
+
+    def serialize(self, data: dict) -> dict:
+        """
+        Converts the curve arrays of one column to the fields of a measured data record.
+        """
+        if self.storage_format == 'binary':
+            return {'data': None, 'data_blob': encode_columns(data, settings.measured_data_dtype,
+                                                              settings.measured_data_compression)}
+        return {'data': json.dumps({key: value.tolist() for key, value in data.items()})}
+
+    def to_records(self, measured_data: dict) -> List[dict]:
+        """
+        Converts the measured data of a measurement to the fields of its records, one per column.
+        """
+        return [dict(column_name=column, **self.serialize(data)) for column, data in measured_data.items()]
+
+    @staticmethod
+    def deserialize(data_item_model) -> Dict[str, np.ndarray]:
+        """
+        Reads the curve arrays of a measured data record stored in either format.
+        """
+        if data_item_model.data is None:
+            return decode_columns(data_item_model.data_blob, writable=True)
+        return {key: np.array(value) for key, value in json.loads(data_item_model.data).items()}
 
     def get_measured_data_by_specimen_item_id(self, specimen_item_id: int):
         return self.measured_data_repository.get_measured_data(specimen_item_id=specimen_item_id)
@@ -16,6 +47,9 @@ class MeasuredDataService:
         return self.measured_data_repository.get_measured_data(specimen_item_id=specimen_item_id,
                                                                column_name=column_name).first()
 
+    def get_measured_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]):
+        return self.measured_data_repository.get_measured_data_by_specimen_item_ids(specimen_item_ids)
+
     def get_data_by_measurement_id(self, measurement_id: int):
         return self.get_data_by_filter(measurement_id=measurement_id)
 
@@ -27,9 +61,28 @@ class MeasuredDataService:
 
         result = {}
         for data_item_model in measured_data_items:
-            data_converted = {key: np.array(value) for key, value in json.loads(data_item_model.data).items()}
-            result.update({data_item_model.column_name: data_converted})
+            result.update({data_item_model.column_name: self.deserialize(data_item_model)})
+
+        return result
 
+    def get_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int],
+                                      columns: Optional[Iterable[str]] = None) -> Dict[int, Dict]:
+        """
+        Returns the measured data of several specimen items read with one query, keyed by specimen_item_id.
+        Only the given columns are read, all of them if None.
+        """
+        return self.group_by_specimen_item_id(
+            self.measured_data_repository.get_measured_data_by_specimen_item_ids(specimen_item_ids, columns))
+
+    @classmethod
+    def group_by_specimen_item_id(cls, data_item_models: Iterable) -> Dict[int, Dict]:
+        """
+        Converts measured data records to the measured data of every specimen item, keyed by specimen_item_id.
+        """
+        result = {}
+        for data_item_model in data_item_models:
+            result.setdefault(data_item_model.specimen_item_id, {})[data_item_model.column_name] = \
+                cls.deserialize(data_item_model)
         return result
 
     def add_measured_data(self, measurement_id: int, specimen_item_id: int, column_name: str, data):
@@ -38,16 +91,61 @@ class MeasuredDataService:
     def add_measured_data_by_model(self, measurement_id: int, specimen_item_id: int, measured_data: dict):
         results = []
         for column, value in measured_data.items():
-            data_converted = {key: value.tolist() for key, value in value.items()}
-            results.append(self.add_measured_data(measurement_id, specimen_item_id, column, json.dumps(data_converted)))
+            fields = self.serialize(value)
+            results.append(self.measured_data_repository.create_measured_data(
+                measurement_id, specimen_item_id, column, fields.pop('data'), **fields))
         return results
 
     def update_measured_data_details(self, measurement_data_id: int, data=None, **kwargs):
         if data is not None:
-            data_converted = {key: value.tolist() for key, value in data.items()}
-            kwargs['data'] = json.dumps(data_converted)
+            kwargs.update(self.serialize(data))
 
         return self.measured_data_repository.update_measured_data(measurement_data_id, **kwargs)
 
+    def update_columns(self, measurement_id: int, measured_data: dict) -> List[str]:
+        """
+        Stores the given columns of a measurement, one UPDATE per column.
+
+        Returns:
+        - The columns that are not stored yet.
+        """
+        return self.measured_data_repository.update_columns(
+            measurement_id, {column: self.serialize(data) for column, data in measured_data.items()})
+
+    def update_columns_many(self, measured_data_by_measurement: Dict[int, dict]) -> Dict[int, List[str]]:
+        """
+        Stores the given columns of several measurements in one transaction, one UPDATE per column.
+
+        Returns:
+        - The columns that are not stored yet, keyed by measurement_id.
+        """
+        return self.measured_data_repository.update_columns_many({
+            measurement_id: {column: self.serialize(data) for column, data in measured_data.items()}
+            for measurement_id, measured_data in measured_data_by_measurement.items()
+        })
+
+    def save_measured_data_many(self, updated_data: Dict[int, dict], new_data: List[Tuple[int, int, str, dict]],
+                                measurement_columns: Dict[int, List[str]]):
+        """
+        Persists the measured data of several specimens in one transaction.
+
+        Parameters:
+        - updated_data (dict): Curve arrays keyed by measurement_data_id.
+        - new_data (list): Tuples of measurement_id, specimen_item_id, column_name and curve arrays to create.
+        - measurement_columns (dict): New column lists keyed by measurement_id.
+        """
+        updated_records = {
+            measurement_data_id: self.serialize(data) for measurement_data_id, data in updated_data.items()
+        }
+        new_records = [
+            dict(measurement_id=measurement_id, specimen_item_id=specimen_item_id, column_name=column_name,
+                 **self.serialize(data))
+            for measurement_id, specimen_item_id, column_name, data in new_data
+        ]
+        measurement_updates = {
+            measurement_id: {'columns': json.dumps(columns)} for measurement_id, columns in measurement_columns.items()
+        }
+        return self.measured_data_repository.save_measured_data_many(updated_records, new_records, measurement_updates)
+
     def remove_measured_data_by_measurement_id(self, measurement_id: int):
         return self.measured_data_repository.delete_measured_data_by_measurement_id(measurement_id)
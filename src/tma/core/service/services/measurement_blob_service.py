@@ -0,0 +1,92 @@
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tma.core.model.column_codec import encode_measurement, decode_measurement
+from tma.core.model.models.measurement_blob import MeasurementBlob
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.settings import settings
+
+
+class MeasurementBlobService:
+    """
+    Stores the measured data of a measurement as one blob, read and written with a single query.
+    """
+    record_model = MeasurementBlob
+
+    def __init__(self, measurement_blob_repository: MeasurementBlobRepository):
+        self.measurement_blob_repository = measurement_blob_repository
+
+    @staticmethod
+    def serialize(measured_data: dict) -> bytes:
+        return encode_measurement(measured_data, settings.measured_data_dtype, settings.measured_data_compression)
+
+    def to_records(self, measured_data: dict) -> List[dict]:
+        return [{'data': self.serialize(measured_data)}]
+
+    @staticmethod
+    def deserialize(blob, columns: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        return decode_measurement(blob, columns, writable=True)
+
+    def get_data_by_measurement_id(self, measurement_id: int, columns: Optional[Iterable[str]] = None):
+        """
+        Returns the curves of a measurement, keyed by column and phase.
+
+        Parameters:
+        - measurement_id (int): The id of the measurement.
+        - columns (iterable): The columns to read, all of them if None.
+        """
+        blob_model = self.measurement_blob_repository.get_blob(measurement_id)
+        if blob_model is None:
+            return {}
+        return self.deserialize(blob_model.data, columns)
+
+    def get_data_by_specimen_item_ids(self, specimen_item_ids: Iterable[int],
+                                      columns: Optional[Iterable[str]] = None) -> Dict[int, Dict]:
+        """
+        Returns the curves of several specimen items read with one query, keyed by specimen_item_id.
+        """
+        return self.group_by_specimen_item_id(
+            self.measurement_blob_repository.get_blobs_by_specimen_item_ids(specimen_item_ids), columns)
+
+    @classmethod
+    def group_by_specimen_item_id(cls, blob_models: Iterable, columns: Optional[Iterable[str]] = None) -> Dict[
+        int, Dict]:
+        return {blob_model.specimen_item_id: cls.deserialize(blob_model.data, columns) for blob_model in blob_models}
+
+    def get_measurement_ids_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> Dict[int, int]:
+        return dict(self.measurement_blob_repository.get_measurement_ids_by_specimen_item_ids(specimen_item_ids))
+
+    def add_measured_data_by_model(self, measurement_id: int, specimen_item_id: int, measured_data: dict):
+        return self.measurement_blob_repository.create_blob(measurement_id, specimen_item_id,
+                                                            self.serialize(measured_data))
+
+    def update_measured_data(self, measurement_id: int, measured_data: dict) -> bool:
+        """
+        Overwrites the blob of a measurement and its column list. Returns False if the measurement has no blob.
+        """
+        return self.measurement_blob_repository.update_blob(measurement_id, self.serialize(measured_data),
+                                                            json.dumps(list(measured_data)))
+
+    def save_measured_data_many(self, measured_data: List[Tuple[int, int, dict]],
+                                measurement_columns: Dict[int, List[str]]):
+        """
+        Stores the measured data of several measurements in one transaction.
+
+        Parameters:
+        - measured_data (list): (measurement_id, specimen_item_id, measured data) of every measurement.
+        - measurement_columns (dict): New column lists keyed by measurement_id.
+        """
+        blobs = {
+            measurement_id: (specimen_item_id, self.serialize(data))
+            for measurement_id, specimen_item_id, data in measured_data
+        }
+        measurement_updates = {
+            measurement_id: {'columns': json.dumps(columns)}
+            for measurement_id, columns in measurement_columns.items()
+        }
+        return self.measurement_blob_repository.save_blobs(blobs, measurement_updates)
+
+    def remove_measured_data_by_measurement_id(self, measurement_id: int):
+        return self.measurement_blob_repository.delete_blob(measurement_id)
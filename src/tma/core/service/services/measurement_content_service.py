@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from tma.core.model.column_codec import encode_measurement, decode_measurement
+from tma.core.model.repository.measurement_content_repository import MeasurementContentRepository
+from tma.core.settings import settings
+
+
+class MeasurementContentService:
+    """
+    Stores an uploaded file once, keyed by the hash of its bytes, for all the measurements parsed from it.
+
+    A measurement referencing a content has measured data records only for the columns edited since it was
+    uploaded, and they are laid over the content when the measurement is read.
+    """
+
+    def __init__(self, measurement_content_repository: MeasurementContentRepository):
+        self.measurement_content_repository = measurement_content_repository
+
+    @staticmethod
+    def serialize(measured_data: dict) -> bytes:
+        return encode_measurement(measured_data, settings.measured_data_dtype, settings.measured_data_compression)
+
+    @staticmethod
+    def deserialize(data, columns: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        return decode_measurement(data, columns, writable=True)
+
+    def get_data_by_content_hashes(self, content_hashes: Iterable[str],
+                                   columns: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Returns the curves of several contents read with one query, keyed by content_hash.
+        Only the given columns are decoded, all of them if None.
+        """
+        return self.group_by_content_hash(self.measurement_content_repository.get_contents(content_hashes), columns)
+
+    @classmethod
+    def group_by_content_hash(cls, content_models: Iterable, columns: Optional[Iterable[str]] = None) -> Dict[
+        str, Dict]:
+        return {content_model.content_hash: cls.deserialize(content_model.data, columns)
+                for content_model in content_models}
+
+    @staticmethod
+    def get_content_hashes(measurement_models: Dict[int, object],
+                           specimen_item_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Returns the content_hash of the measurements of the specimen items that reference a content.
+        """
+        return {specimen_item_id: measurement_models[specimen_item_id].content_hash
+                for specimen_item_id in specimen_item_ids
+                if getattr(measurement_models.get(specimen_item_id), 'content_hash', None)}
+
+    @staticmethod
+    def lay_over_contents(measured_data: Dict[int, dict], content_hashes: Dict[int, str],
+                          contents: Dict[str, dict]) -> Dict[int, dict]:
+        """
+        Lays the stored columns of the specimen items over the contents they reference.
+
+        Parameters:
+        - measured_data (dict): The stored curves keyed by specimen_item_id, column and phase.
+        - content_hashes (dict): The content_hash of the specimen items that reference a content.
+        - contents (dict): The curves of the contents keyed by content_hash, column and phase.
+
+        Returns:
+        - The curves keyed by specimen_item_id, column and phase.
+        """
+        for specimen_item_id, content_hash in content_hashes.items():
+            measured_data[specimen_item_id] = {**contents.get(content_hash, {}),
+                                               **measured_data.get(specimen_item_id, {})}
+        return measured_data
@@ -1,4 +1,5 @@
 import json
+from typing import Dict, Iterable, List
 
 from tma.core.model.repository.measurement_repository import MeasurementRepository
 from tma.core.service.measurement.model.measurement import Measurement
@@ -14,6 +15,25 @@ class MeasurementService:
     def get_measurement_by_specimen_item_id(self, specimen_item_id: int):
         return self.measurement_repository.get_measurement_by_specimen_item_id(specimen_item_id)
 
+    def get_measurements_by_specimen_item_ids(self, specimen_item_ids: Iterable[int]) -> Dict[int, object]:
+        """
+        Returns the measurements of several specimen items read with one query, keyed by specimen_item_id.
+        """
+        return self.group_by_specimen_item_id(
+            self.measurement_repository.get_measurements_by_specimen_item_ids(specimen_item_ids))
+
+    @staticmethod
+    def group_by_specimen_item_id(measurements: Iterable) -> Dict[int, object]:
+        return {measurement.specimen_item_id: measurement for measurement in measurements}
+
+    @staticmethod
+    def get_columns(measurement_model) -> List[str]:
+        """
+        Returns the column list of a measurement record. The columns are stored as a JSON encoded string.
+        """
+        columns = measurement_model.columns
+        return json.loads(columns) if isinstance(columns, str) else list(columns)
+
     def add_measurement(self, specimen_item_id: int, measurement_type: int, columns):
         return self.measurement_repository.create_measurement(specimen_item_id, measurement_type, columns)
 
@@ -21,6 +41,10 @@ class MeasurementService:
         return self.measurement_repository.create_measurement(specimen_item_id, measurement.measurement_type,
                                                               json.dumps(measurement.columns))
 
+    @staticmethod
+    def to_record(measurement: Measurement) -> dict:
+        return dict(measurement_type=measurement.measurement_type, columns=json.dumps(measurement.columns))
+
     def update_measurement_details(self, measurement_id: int, **kwargs):
         return self.measurement_repository.update_measurement(measurement_id, **kwargs)
 
@@ -1,3 +1,5 @@
+from typing import List
+
 from tma.core.model.models.sample import Sample as SampleModel
 from tma.core.model.repository.sample_repository import SampleRepository
 from tma.core.service.sample.model.sample import Sample
@@ -21,3 +23,9 @@ class SampleService:
 
     def remove_sample(self, sample_id: int):
         return self.sample_repository.delete_sample(sample_id)
+
+    def remove_sample_tree(self, sample_id: int) -> List[int]:
+        """
+        Removes the sample with everything it contains. Returns the ids of the removed specimen items.
+        """
+        return self.sample_repository.delete_sample_tree(sample_id)
@@ -1,5 +1,10 @@
+from typing import List
+
 from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
 from tma.core.service.sample.model.specimen_item import SpecimenItem
+from tma.core.service.services.measurement_content_service import MeasurementContentService
+from tma.core.service.services.measurement_service import MeasurementService
+from tma.core.settings import settings
 
 
 class SpecimenItemService:
@@ -29,6 +34,43 @@ class SpecimenItemService:
             specimen_item.is_empty_source_file
         )
 
+    def add_specimen_items_by_model_many(self, sample_id: int, specimen_items: List[SpecimenItem],
+                                         measured_data_service):
+        """
+        Stores specimen items with their measurements and measured data in one transaction.
+        An unchanged uploaded file is stored once for all its uploads, the measurement only references it.
+
+        Parameters:
+        - sample_id (int): The id of the sample the specimen items belong to.
+        - specimen_items (list): The specimen items to store.
+        - measured_data_service: MeasuredDataService or MeasurementBlobService, depending on the storage layout.
+
+        Returns:
+        - The created (specimen item, measurement) model pairs, or None if nothing was stored.
+        """
+        records, contents = [], {}
+        for item in specimen_items:
+            measurement = item.measurement.value.measurement
+            measurement_record = MeasurementService.to_record(measurement)
+            if settings.deduplicate_uploaded_files and measurement.content_hash and not measurement.get_changes():
+                measurement_record['content_hash'] = measurement.content_hash
+                data, references = contents.get(measurement.content_hash, (None, 0))
+                if data is None:
+                    data = MeasurementContentService.serialize(item.measurement.value.get_measured_data())
+                contents[measurement.content_hash] = (data, references + 1)
+                data_records = []
+            else:
+                data_records = measured_data_service.to_records(item.measurement.value.get_measured_data())
+            records.append((self.to_record(sample_id, item), measurement_record, data_records))
+        return self.specimen_item_repository.create_specimen_items_many(records, measured_data_service.record_model,
+                                                                        contents)
+
+    @staticmethod
+    def to_record(sample_id: int, specimen_item: SpecimenItem) -> dict:
+        return dict(sample_id=sample_id, filename=specimen_item.filename.value,
+                    file_extension=specimen_item.file.file_extension.value,
+                    is_empty_source=specimen_item.is_empty_source_file)
+
     def add_list_specimen_items(self, specimen_items: list):
         results = []
         for item in specimen_items:
@@ -53,12 +53,19 @@ def EmptyEquipmentEditPanel(sample_controller: SampleController, set_show_outlin
         SampleController.set_interpolate_method(sample_controller.get_selected_specimen_item(), method)
 
     def smooth():
-        sample_controller.smooth_specimen_item(smoothing_window_size)
+        try:
+            sample_controller.smooth_specimen_item(smoothing_window_size, smoothing_method)
+        except ValueError as e:
+            set_info_message(str(e))
+            return
+        error_message = sample_controller.get_persistence_error()
+        if error_message is not None:
+            set_info_message(error_message)
 
     def add_outline_points():
         try:
             set_show_outline_points(False)
-            error_message = sample_controller.detect_outline_points(threshold)
+            error_message = sample_controller.detect_outline_points(threshold, outline_method)
             if error_message is not None:
                 set_info_message(error_message)
                 return
@@ -68,17 +75,23 @@ def EmptyEquipmentEditPanel(sample_controller: SampleController, set_show_outlin
             set_info_message('Unknown error')
 
     smoothing_window_size, set_smoothing_window_size = solara.use_state(5)
+    smoothing_method, set_smoothing_method = solara.use_state('Moving Average')
     threshold, set_threshold = solara.use_state(42.5)
+    outline_method, set_outline_method = solara.use_state('Mean')
     info_message, set_info_message = solara.use_state('')
 
     with solara.Card('Mark outlying measurements'):
         with solara.Column():
             if info_message != '':
                 solara.Info(label=info_message)
+            solara.Select('Select method', values=SampleController.get_outlier_detection_methods(),
+                          value=outline_method, on_value=set_outline_method)
             solara.InputFloat("Enter a float number", value=threshold, on_value=set_threshold)
             solara.Button("Mark", on_click=add_outline_points)
     with solara.Card('Smoothing curve'):
         with solara.Column():
+            solara.Select('Select smoothing', values=SampleController.get_smoothing_methods(),
+                          value=smoothing_method, on_value=set_smoothing_method)
             solara.InputInt("Enter a int number", value=smoothing_window_size, on_value=set_smoothing_window_size)
             solara.Button("Smooth", on_click=smooth)
     with solara.Card('Interpolation curve'):
@@ -41,7 +41,7 @@ def InputField(
             set_info_message(error_message)
             return
         curie_points_current.set(sample_controller.get_selected_specimen_item().get_sorted_curie_points())
-        set_info_message('')
+        set_info_message(sample_controller.get_persistence_error() or '')
 
     if info_message != '':
         solara.Info(label=info_message)
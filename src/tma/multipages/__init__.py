@@ -1,12 +1,14 @@
 import sys
 from pathlib import Path
 
-import redis
-
 import solara
+import solara.lab
+import solara.server.kernel_context
 
-from tma.core.database import create_database, drop_database
+from tma.core.database import create_database, drop_database, close_sessions
 from tma.core.model.repository import user_repo
+from tma.core.service.sample.sample_cache import sample_cache
+from tma.core.service.sample.write_behind import write_behind_queue
 from tma.core.service.services.user_service import UserService
 from tma.core.settings import settings
 
@@ -15,12 +17,22 @@ root_path = str(Path(__file__).resolve().parents[1])
 if root_path not in sys.path:
     sys.path.append(root_path)
 
-# redis_db = redis.from_url(settings.redis_dsn, encoding="utf-8", decode_responses=True)
-
 # todo delete
 create_database()
 
 
+@solara.lab.on_kernel_start
+def close_database_sessions_on_kernel_shutdown():
+    context_id = solara.server.kernel_context.get_current_context().id
+
+    def on_kernel_shutdown():
+        write_behind_queue.flush(context_id=context_id)
+        close_sessions(context_id)
+        sample_cache.invalidate_context(context_id)
+
+    return on_kernel_shutdown
+
+
 @solara.component
 def Page():
     session_id = solara.get_session_id()
@@ -82,12 +82,20 @@ class EditController:
     def handle_update(sample_controller: SampleController, values: Dict[str, float]):
         select_index_raw = EditController.id_line_raw_select.value
         sample_controller.update_point(values, select_index_raw, EditController.id_plot_select.value)
+        EditController.show_persistence_error(sample_controller)
 
     @staticmethod
     def handle_delete(sample_controller: SampleController):
         select_index_df = EditController.id_line_df_select.value
         select_index_raw = EditController.id_line_raw_select.value
         sample_controller.delete_point(select_index_df, select_index_raw, EditController.id_plot_select.value)
+        EditController.show_persistence_error(sample_controller)
+
+    @staticmethod
+    def show_persistence_error(sample_controller: SampleController):
+        error_message = sample_controller.get_persistence_error()
+        if error_message is not None:
+            data_info_message.set(error_message)
 
 
 class DerivativeClickController:
@@ -1,14 +1,40 @@
-from abc import ABC
-from typing import Optional
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Tuple
 
+import plotly.graph_objects as go
+
+from tma.core.settings import settings
 from tma.multipages.components.graphic_elements.graphic_element import GraphicElement
 from tma.multipages.components.graphic_elements.style import LineType
 
+# Hidden axes spanning the plot from 0 to 1 over the data axes, a line across the plot ends at 0 and 1 on them
+LINES_X_AXIS = 'x9'
+LINES_Y_AXIS = 'y9'
+
 
 class Line(GraphicElement, ABC):
     def __init__(self, style: LineType):
         super().__init__(style)
 
+    def draw(self, fig):
+        if settings.plot_marker_lines == 'traces':
+            return draw_lines(fig, [self])
+        return self.draw_shapes(fig)
+
+    @abstractmethod
+    def draw_shapes(self, fig):
+        """
+        Draws the lines as one layout shape per value.
+        """
+        pass
+
+    @abstractmethod
+    def segments(self) -> Tuple[list, list]:
+        """
+        Returns the x and y coordinates of the lines across the plot, with the lines split by None.
+        """
+        pass
+
     @staticmethod
     def create_element(x=None, y=None, style=None):
         if x is not None:
@@ -27,11 +53,18 @@ class HorizontalLine(Line):
         super().__init__(style)
         self.y = y
 
-    def draw(self, fig):
+    def draw_shapes(self, fig):
         for y in self.y:
             fig.add_hline(y=y, line_dash=self.style.dash, line_color=self.style.color, line_width=self.style.width)
         return fig
 
+    def segments(self):
+        x, y = [], []
+        for value in self.y:
+            x.extend((0, 1, None))
+            y.extend((value, value, None))
+        return x, y
+
     def get_values(self):
         return None, self.y
 
@@ -41,10 +74,59 @@ class VerticalLine(Line):
         super().__init__(style)
         self.x = x
 
-    def draw(self, fig):
+    def draw_shapes(self, fig):
         for x in self.x:
             fig.add_vline(x=x, line_dash=self.style.dash, line_color=self.style.color, line_width=self.style.width)
         return fig
 
+    def segments(self):
+        x, y = [], []
+        for value in self.x:
+            x.extend((value, value, None))
+            y.extend((0, 1, None))
+        return x, y
+
     def get_values(self):
         return self.x, None
+
+
+def draw_lines(fig, lines: Iterable[Line]):
+    """
+    Draws the lines as one scatter trace per direction and style, with the lines split by None, instead of one
+    layout shape per line.
+
+    Parameters:
+    - fig (go.Figure): The figure to draw on.
+    - lines (iterable): The horizontal and vertical lines to draw.
+
+    Returns:
+    - The figure.
+    """
+    groups: Dict[tuple, Tuple[Line, List[list]]] = {}
+    for line in lines:
+        key = (type(line), line.style.color, line.style.width, line.style.dash)
+        _, (x, y) = groups.setdefault(key, (line, [[], []]))
+        line_x, line_y = line.segments()
+        x.extend(line_x)
+        y.extend(line_y)
+
+    if not groups:
+        return fig
+    fig.update_layout(
+        xaxis9=dict(overlaying='x', range=[0, 1], visible=False, fixedrange=True),
+        yaxis9=dict(overlaying='y', range=[0, 1], visible=False, fixedrange=True),
+    )
+    for line, (x, y) in groups.values():
+        # A horizontal line spans the hidden x axis and a vertical one the hidden y axis, like a shape does
+        vertical = isinstance(line, VerticalLine)
+        fig.add_trace(go.Scatter(
+            x=x, y=y,
+            xaxis='x' if vertical else LINES_X_AXIS,
+            yaxis=LINES_Y_AXIS if vertical else 'y',
+            mode='lines',
+            line=dict(color=line.style.color, width=line.style.width, dash=line.style.dash),
+            name=line.style.name,
+            showlegend=False,
+            hoverinfo='skip',
+        ))
+    return fig
@@ -2,6 +2,7 @@ from typing import List
 
 from tma.multipages.components.graphic_elements.graphic_element import GraphicElement
 from tma.multipages.components.graphic_elements.style import PointType
+from tma.multipages.components.plot_widget.webgl import uses_webgl
 import plotly.graph_objects as go
 
 
@@ -12,13 +13,9 @@ class Point(GraphicElement):
         self.y = y
 
     def draw(self, fig):
-        showlegend = True
-        for trace in fig.data:
-            if trace.name == self.style.name:
-                showlegend = False
-                break
-
-        fig.add_trace(go.Scatter(
+        # Drawn like the curves, WebGL traces are layered apart from the SVG ones
+        scatter = go.Scattergl if uses_webgl(fig) else go.Scatter
+        fig.add_trace(scatter(
             x=self.x, y=self.y,
             mode='markers',
             marker=dict(
@@ -28,7 +25,6 @@ class Point(GraphicElement):
                 line=dict(width=self.style.marker_line_width, color=self.style.marker_line_color)
             ),
             name=(self.style.custom_name if self.style.custom_name != "" else self.style.name),
-            showlegend=showlegend
         ))
         return fig
 
@@ -50,7 +50,8 @@ class State:
     def __init__(self):
         self.sample_controller = SampleRepositoryController(solara.get_session_id())
         specimen_repository_controller = SpecialItemRepositoryController(self.sample_controller.sample_model)
-        self.initial_files = specimen_repository_controller.get_specimen_items_list()
+        # The upload page shows only the file names, the columns are read on first access
+        self.initial_files = specimen_repository_controller.get_specimen_items_list(columns=[])
         initial_selected_index = -1
         self.files: [specimen_item.SpecimenItem] = sol.reactive(self.initial_files)
         self.selected_file_index = sol.reactive(initial_selected_index)
@@ -76,7 +77,7 @@ class State:
     @staticmethod
     def remove_sample():
         sample_controller = SampleRepositoryController(solara.get_session_id())
-        sample_controller.delete_sample(sample_controller.get_sample())
+        sample_controller.delete_sample()
 
     def create_sample(self):
         selected_files = self.get_uploaded_file_items()
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+def same_value(a, b) -> bool:
+    """
+    Compares two values of a plotly JSON figure, arrays by their items with equal NaNs.
+    """
+    if isinstance(a, dict) or isinstance(b, dict):
+        return (isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys()
+                and all(same_value(a[key], b[key]) for key in a))
+    if isinstance(a, (list, tuple, np.ndarray)) or isinstance(b, (list, tuple, np.ndarray)):
+        if not isinstance(a, (list, tuple, np.ndarray)) or not isinstance(b, (list, tuple, np.ndarray)):
+            return False
+        if len(a) != len(b):
+            return False
+        try:
+            return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+        except (TypeError, ValueError):
+            return all(same_value(x, y) for x, y in zip(a, b))
+    return type(a) is type(b) and a == b
+
+
+def changed_keys(previous: dict, current: dict) -> Dict[str, object]:
+    """
+    Returns the top-level keys of current that differ from previous, the removed keys with None.
+    """
+    changes = {key: value for key, value in current.items()
+               if key not in previous or not same_value(previous[key], value)}
+    changes.update({key: None for key in previous if key not in current})
+    return changes
+
+
+class FigureModel:
+    """
+    Keeps the figure shown by a plot widget and patches the widget with the changes of the next figure, so a
+    render sends the browser only the traces and the layout keys that changed instead of the whole figure.
+    """
+
+    def __init__(self):
+        self.widget: Optional[go.FigureWidget] = None
+        self.traces: List[dict] = []
+        self.layout: dict = {}
+
+    def update(self, widget: go.FigureWidget, fig: go.Figure):
+        """
+        Makes the widget show the figure.
+
+        Parameters:
+        - widget (go.FigureWidget): The widget of the plot, which was last updated by this model or is new.
+        - fig (go.Figure): The figure to show.
+        """
+        traces = [trace.to_plotly_json() for trace in fig.data]
+        layout = fig.layout.to_plotly_json()
+        if widget is not self.widget:
+            self.widget, self.traces, self.layout = widget, [], {}
+            widget.data = []
+
+        with widget.batch_update():
+            self._update_traces(widget, traces)
+            layout_changes = changed_keys(self.layout, layout)
+            if layout_changes:
+                widget.layout.update(layout_changes, overwrite=True)
+
+        self.traces, self.layout = traces, layout
+
+    def _update_traces(self, widget: go.FigureWidget, traces: List[dict]):
+        # Traces are kept while they have the same type, from the first other one the rest is replaced
+        kept = 0
+        for previous, current in zip(self.traces, traces):
+            if previous.get('type') != current.get('type'):
+                break
+            kept += 1
+
+        if kept < len(self.traces):
+            widget.data = widget.data[:kept]
+        for index in range(kept):
+            changes = changed_keys(self.traces[index], traces[index])
+            changes.pop('type', None)
+            if changes:
+                widget.data[index].update(changes, overwrite=True)
+        if kept < len(traces):
+            widget.add_traces(traces[kept:])
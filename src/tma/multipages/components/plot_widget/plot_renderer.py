@@ -1,17 +1,44 @@
 import solara
 import plotly.graph_objects as go
 
+from tma.core.settings import settings
 from tma.multipages.components.graphic_elements.graphic_element import GraphicElement
+from tma.multipages.components.graphic_elements.line import HorizontalLine, Line, VerticalLine, draw_lines
+from tma.multipages.components.graphic_elements.style import LineTypes
+from tma.multipages.components.plot_widget.figure_model import FigureModel
+from tma.multipages.components.plot_widget.webgl import should_use_webgl, to_webgl
 
 
 @solara.component
 def PlotRenderer(data: [[go.Scatter]], graphic_elements: [GraphicElement], layout=None, on_click=None,
                  add_axes_lines=True):
+    fig = build_figure(data, graphic_elements, layout, add_axes_lines)
+
+    figure_model = solara.use_memo(FigureModel, dependencies=[])
+
+    def on_points(data):
+        if data and data['event_type'] == 'plotly_click' and on_click is not None:
+            on_click(data)
+
+    figure_element = go.FigureWidget.element(on__js2py_pointsCallback=on_points)
+
+    def update_figure():
+        figure_model.update(solara.get_widget(figure_element), fig)
+
+    # The widget is patched with the changes only, a full go.Figure is not resent on every render
+    solara.use_effect(update_figure, [fig])
+
+
+def build_figure(data: [[go.Scatter]], graphic_elements: [GraphicElement], layout=None,
+                 add_axes_lines=True) -> go.Figure:
     fig = go.Figure()
 
-    for plot in data:
-        for curve in plot:
-            fig.add_trace(curve)
+    curves = [curve for plot in data for curve in plot]
+    # Large overlays are drawn with WebGL, the graphic elements then follow the curves
+    if should_use_webgl(curves):
+        curves = [to_webgl(curve) for curve in curves]
+    for curve in curves:
+        fig.add_trace(curve)
 
     fig.update_layout(layout)
     fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgb(224, 224, 223)')
@@ -23,14 +50,30 @@ def PlotRenderer(data: [[go.Scatter]], graphic_elements: [GraphicElement], layou
     fig.update_xaxes(showline=True, linewidth=1, linecolor='black')
     fig.update_yaxes(showline=True, linewidth=1, linecolor='black')
 
+    # The lines of a style are drawn together as one trace, after the other elements as shapes would be
+    batch_lines = settings.plot_marker_lines == 'traces'
+    lines = []
     for element in graphic_elements:
-        fig = element.draw(fig)
+        if batch_lines and isinstance(element, Line):
+            lines.append(element)
+        else:
+            fig = element.draw(fig)
+    hide_repeated_legends(fig, start=len(curves))
 
-    if add_axes_lines:
+    if add_axes_lines and batch_lines:
+        lines += [HorizontalLine([0], LineTypes.BaseLine), VerticalLine([0], LineTypes.BaseLine)]
+    elif add_axes_lines:
         fig.add_hline(y=0, line_dash="dash", line_color="rgb(224, 224, 223)", line_width=1)
         fig.add_vline(x=0, line_dash="dash", line_color="rgb(224, 224, 223)", line_width=1)
+    return draw_lines(fig, lines)
+
 
-    solara.FigurePlotly(
-        fig,
-        on_click=on_click,
-    )
+def hide_repeated_legends(fig: go.Figure, start: int = 0):
+    """
+    Shows one legend entry per name for the traces from start, a name of an earlier trace is not repeated.
+    """
+    names = {trace.name for trace in fig.data[:start]}
+    for trace in fig.data[start:]:
+        if trace.name in names:
+            trace.showlegend = False
+        names.add(trace.name)
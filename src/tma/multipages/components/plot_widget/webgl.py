@@ -0,0 +1,46 @@
+from typing import Iterable
+
+import plotly.graph_objects as go
+
+from tma.core.settings import settings
+
+# Scatter properties Scattergl does not have, any other property keeps its strict validation
+SVG_ONLY_PROPERTIES = ('alignmentgroup', 'cliponaxis', 'fillgradient', 'fillpattern', 'groupnorm', 'hoveron',
+                       'offsetgroup', 'orientation', 'stackgaps', 'stackgroup', 'zorder')
+SVG_ONLY_LINE_PROPERTIES = ('backoff', 'simplify', 'smoothing')
+SVG_ONLY_MARKER_PROPERTIES = ('angleref', 'gradient', 'maxdisplayed', 'standoff')
+
+
+def count_points(traces: Iterable) -> int:
+    return sum(len(trace.x) for trace in traces if trace.x is not None)
+
+
+def should_use_webgl(traces: Iterable) -> bool:
+    """
+    Whether a plot of the traces is drawn with WebGL, which stays fast for plots too large for SVG.
+    """
+    return count_points(traces) > settings.plot_webgl_min_points
+
+
+def to_webgl(trace: go.Scatter) -> go.Scattergl:
+    """
+    Converts an SVG scatter trace to a WebGL one with the same points, name, line and marker styles.
+    """
+    properties = trace.to_plotly_json()
+    properties.pop('type', None)
+    for key in SVG_ONLY_PROPERTIES:
+        properties.pop(key, None)
+    line = properties.get('line', {})
+    for key in SVG_ONLY_LINE_PROPERTIES:
+        line.pop(key, None)
+    # WebGL draws the step shapes but not splines, a spline becomes straight segments
+    if line.get('shape') == 'spline':
+        line.pop('shape')
+    marker = properties.get('marker', {})
+    for key in SVG_ONLY_MARKER_PROPERTIES:
+        marker.pop(key, None)
+    return go.Scattergl(properties)
+
+
+def uses_webgl(fig: go.Figure) -> bool:
+    return any(isinstance(trace, go.Scattergl) for trace in fig.data)
@@ -0,0 +1,128 @@
+import copy
+import unittest
+
+from tma.core.cache_backend import MemoryCacheBackend
+from tma.core.service.measurement.analysis.calculation_cache import CalculationCache
+from tma.core.service.measurement.analysis.curie_calculation import InflectionPointCalculation
+from tma.core.service.measurement.analysis.outlier_detection import HampelOutlierDetection
+from tma.core.service.measurement.model.curve import Curve
+
+
+class TestCalculationCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = CalculationCache(max_entries=2)
+        self.curve = Curve([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return [1.0, 2.0], [3.0, 4.0]
+
+    def key(self, strategy=None, curve=None):
+        strategy = strategy or InflectionPointCalculation(smoothness_degree=5, threshold=0)
+        return CalculationCache.make_key(1, [curve or self.curve], strategy, 'CSUSC')
+
+    def test_hit_after_miss(self):
+        self.cache.get_or_compute(self.key(), self.compute)
+        self.cache.get_or_compute(self.key(), self.compute)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_parameters_are_part_of_the_key(self):
+        self.cache.get_or_compute(self.key(), self.compute)
+        self.cache.get_or_compute(self.key(InflectionPointCalculation(smoothness_degree=7, threshold=0)),
+                                  self.compute)
+        self.cache.get_or_compute(self.key(HampelOutlierDetection(7, 3)), self.compute)
+        self.assertEqual(self.calls, 3)
+
+    def test_curve_changes_invalidate_the_key(self):
+        key = self.key()
+        self.curve.update_point(0, 11.0)
+        self.assertNotEqual(key, self.key())
+
+        key = self.key()
+        self.curve.values = [1.0, 2.0]
+        self.assertNotEqual(key, self.key())
+
+        key = self.key()
+        self.curve.delete_point(0)
+        self.assertNotEqual(key, self.key())
+
+    def test_copied_curve_gets_its_own_identity(self):
+        copied = copy.deepcopy(self.curve)
+        self.assertNotEqual(self.key(curve=copied), self.key())
+        self.assertEqual(copied.values, self.curve.values)
+
+    def test_results_are_copied(self):
+        result = self.cache.get_or_compute(self.key(), self.compute)
+        result[0].append(100.0)
+        self.assertEqual(self.cache.get_or_compute(self.key(), self.compute), ([1.0, 2.0], [3.0, 4.0]))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        first, second, third = [CalculationCache.make_key(index, [], InflectionPointCalculation) for index in range(3)]
+        self.cache.get_or_compute(first, self.compute)
+        self.cache.get_or_compute(second, self.compute)
+        self.cache.get_or_compute(first, self.compute)
+        self.cache.get_or_compute(third, self.compute)
+        self.assertIn(first, self.cache)
+        self.assertNotIn(second, self.cache)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_memory_budget(self):
+        cache = CalculationCache(max_entries=10, max_bytes=1000)
+        for index in range(5):
+            cache.get_or_compute(index, lambda: [0.0] * 50)
+        self.assertLessEqual(cache.size_bytes, 1000)
+        self.assertLess(len(cache), 5)
+
+    def test_invalidate_specimen(self):
+        self.cache.get_or_compute(self.key(), self.compute)
+        self.assertEqual(self.cache.invalidate(1), 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size_bytes, 0)
+
+    def test_shared_backend_is_used_across_caches(self):
+        backend = MemoryCacheBackend()
+        strategy = InflectionPointCalculation(smoothness_degree=5, threshold=0)
+        shared_key = CalculationCache.make_shared_key([self.curve], strategy, 'CSUSC')
+        CalculationCache(backend=backend).get_or_compute(self.key(), self.compute, shared_key)
+
+        # Another worker loads the same curve into a new object
+        curve = Curve([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+        other_cache = CalculationCache(backend=backend)
+        result = other_cache.get_or_compute(self.key(curve=curve), self.compute,
+                                            CalculationCache.make_shared_key([curve], strategy, 'CSUSC'))
+
+        self.assertEqual(result, ([1.0, 2.0], [3.0, 4.0]))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(other_cache), 1)
+
+    def test_shared_key_is_built_on_local_miss_only(self):
+        cache = CalculationCache(backend=MemoryCacheBackend())
+        strategy = InflectionPointCalculation(smoothness_degree=5, threshold=0)
+        built = []
+
+        def shared_key():
+            built.append(True)
+            return CalculationCache.make_shared_key([self.curve], strategy, 'CSUSC')
+
+        cache.get_or_compute(self.key(), self.compute, shared_key)
+        cache.get_or_compute(self.key(), self.compute, shared_key)
+        self.assertEqual(len(built), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_shared_key_depends_on_values_and_parameters(self):
+        strategy = InflectionPointCalculation(smoothness_degree=5, threshold=0)
+        key = CalculationCache.make_shared_key([self.curve], strategy, 'CSUSC')
+        self.assertNotEqual(key, CalculationCache.make_shared_key([self.curve], strategy, 'NSUSC'))
+        self.assertNotEqual(key, CalculationCache.make_shared_key(
+            [self.curve], InflectionPointCalculation(smoothness_degree=7, threshold=0), 'CSUSC'))
+
+        self.curve.update_point(0, 11.0)
+        self.assertNotEqual(key, CalculationCache.make_shared_key([self.curve], strategy, 'CSUSC'))
+
+
+if __name__ == '__main__':
+    unittest.main()
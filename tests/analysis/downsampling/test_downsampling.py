@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from tma.core.service.measurement.analysis.downsampling import lttb_indices, min_max_indices, downsample_indices
+from tma.core.service.measurement.model.measurement import Measurement
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        self.temperature = np.linspace(20, 700, 10000)
+        self.values = np.sin(self.temperature / 30)
+        # A single spike that a plot must not lose
+        self.values[5003] = 10.0
+
+    def test_lttb_keeps_the_budget_the_ends_and_the_peaks(self):
+        """
+        Test that LTTB returns max_points sorted indices with the first, the last and the outstanding point.
+        """
+        indices = lttb_indices(self.temperature, self.values, 500)
+
+        self.assertEqual(len(indices), 500)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertEqual((indices[0], indices[-1]), (0, 9999))
+        self.assertIn(5003, indices)
+
+    def test_min_max_keeps_the_envelope(self):
+        """
+        Test that min/max keeps the extremes of every bucket within the budget.
+        """
+        indices = min_max_indices(self.values, 500)
+
+        self.assertLessEqual(len(indices), 502)
+        self.assertIn(5003, indices)
+        self.assertEqual(self.values[indices].min(), self.values.min())
+
+    def test_small_curves_are_not_downsampled(self):
+        """
+        Test that a curve within the budget, or the 'none' mode, keeps every point.
+        """
+        self.assertIsNone(downsample_indices(self.temperature, self.values, 20000, 'lttb'))
+        self.assertIsNone(downsample_indices(self.temperature, self.values, 500, 'none'))
+        with self.assertRaises(ValueError):
+            downsample_indices(self.temperature, self.values, 500, 'random')
+
+    def test_traces_keep_the_raw_indices(self):
+        """
+        Test that a downsampled trace draws raw points and carries their indices in the curve.
+        """
+        measurement = Measurement(1, 'clw', ['TEMP', 'TSUSC'])
+        measurement.add_heating_data('TEMP', list(self.temperature), list(self.temperature))
+        measurement.add_heating_data('TSUSC', list(self.temperature), list(self.values))
+
+        trace = MeasurementManager.create_plot(measurement, 'TEMP', 'TSUSC', 'file', max_points=300)[0]
+
+        self.assertEqual(len(trace.x), 300)
+        np.testing.assert_array_equal(trace.x, self.temperature[trace.customdata])
+        np.testing.assert_array_equal(trace.y, self.values[trace.customdata])
+
+
+if __name__ == '__main__':
+    unittest.main()
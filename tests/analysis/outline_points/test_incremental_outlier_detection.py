@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+
+from tma.core.service.measurement.analysis.incremental_outlier_detection import \
+    IncrementalComparisonOutlierDetection, IncrementalMeanOutlierDetection, \
+    IncrementalStandardDeviationOutlierDetection, IncrementalRollingStandardDeviationOutlierDetection, \
+    IncrementalHampelOutlierDetection
+from tma.core.service.measurement.analysis.outlier_detection import ComparisonOutlierDetection, \
+    StandardDeviationOutlierDetection, RollingStandardDeviationOutlierDetection, HampelOutlierDetection
+
+
+def noisy_curve_with_spikes(length=300):
+    rng = np.random.default_rng(3)
+    x_values = np.linspace(20, 700, length)
+    y_values = 1000 / (1 + np.exp((x_values - 580) / 5)) + rng.normal(0, 1, length)
+    y_values[[0, 40, 41, 150, length - 2]] += [60, 80, -70, 90, 50]
+    return x_values, y_values
+
+
+def stream(detector, x_values, y_values, block_sizes):
+    found_x, found_y = [], []
+    start = 0
+    for size in block_sizes:
+        outlier_x, outlier_y = detector.update(x_values[start:start + size], y_values[start:start + size])
+        found_x.extend(outlier_x)
+        found_y.extend(outlier_y)
+        start += size
+    outlier_x, outlier_y = detector.update(x_values[start:], y_values[start:])
+    found_x.extend(outlier_x)
+    found_y.extend(outlier_y)
+    outlier_x, outlier_y = detector.flush()
+    found_x.extend(outlier_x)
+    found_y.extend(outlier_y)
+    return np.array(found_x), np.array(found_y)
+
+
+class TestIncrementalOutlierDetection(unittest.TestCase):
+    block_sizes = [1, 2, 7, 0, 33, 3, 100, 5]
+
+    def assert_same_as_batch(self, incremental, batch):
+        x_values, y_values = noisy_curve_with_spikes()
+        expected_x, expected_y = batch.detect(x_values, y_values)
+        found_x, found_y = stream(incremental, x_values, y_values, self.block_sizes)
+        self.assertGreater(len(expected_x), 0)
+        np.testing.assert_array_equal(found_x, expected_x)
+        np.testing.assert_array_equal(found_y, expected_y)
+
+    def test_comparison_matches_batch(self):
+        self.assert_same_as_batch(IncrementalComparisonOutlierDetection(20), ComparisonOutlierDetection(20))
+
+    def test_rolling_standard_deviation_matches_batch(self):
+        self.assert_same_as_batch(IncrementalRollingStandardDeviationOutlierDetection(9, 4),
+                                  RollingStandardDeviationOutlierDetection(9, 4))
+
+    def test_hampel_matches_batch(self):
+        self.assert_same_as_batch(IncrementalHampelOutlierDetection(11, 5), HampelOutlierDetection(11, 5))
+
+    def test_points_are_reported_once(self):
+        detector = IncrementalHampelOutlierDetection(7, 3)
+        x_values, y_values = noisy_curve_with_spikes()
+        found_x, _ = stream(detector, x_values, y_values, [10] * 20)
+        self.assertEqual(len(found_x), len(set(found_x)))
+
+    def test_running_standard_deviation_matches_full_statistics(self):
+        x_values, y_values = noisy_curve_with_spikes()
+        detector = IncrementalStandardDeviationOutlierDetection(2)
+        stream(detector, x_values, y_values, self.block_sizes)
+        self.assertAlmostEqual(detector.mean, np.mean(y_values))
+        self.assertAlmostEqual(np.sqrt(detector.squared_deviations / detector.count), np.std(y_values))
+
+        expected_x, _ = StandardDeviationOutlierDetection(2).detect(x_values, y_values)
+        found_x, _ = IncrementalStandardDeviationOutlierDetection(2).detect(x_values, y_values)
+        np.testing.assert_array_equal(found_x, expected_x)
+
+    def test_mean_reports_only_new_block(self):
+        detector = IncrementalMeanOutlierDetection(10)
+        detector.update([0, 1, 2], [10, 10, 10])
+        outlier_x, outlier_y = detector.update([3, 4], [10, 40])
+        np.testing.assert_array_equal(outlier_x, [4])
+        np.testing.assert_array_equal(outlier_y, [40])
+
+    def test_reset(self):
+        detector = IncrementalComparisonOutlierDetection(5)
+        detector.update([0], [0])
+        detector.reset()
+        outlier_x, _ = detector.update([1], [100])
+        self.assertEqual(len(outlier_x), 0)
+
+    def test_equal_lengths(self):
+        with self.assertRaises(ValueError):
+            IncrementalHampelOutlierDetection().update([0, 1, 2], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
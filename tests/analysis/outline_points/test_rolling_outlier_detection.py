@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.analysis.outlier_detection import RollingStandardDeviationOutlierDetection, \
+    HampelOutlierDetection, MeanOutlierDetection
+from tma.core.service.measurement.analysis.rolling_statistics import rolling_mean_std, rolling_median_mad
+
+
+def curie_drop_curve(length=200):
+    """
+    Magnetization-like curve with a steep drop in the middle and small noise.
+    """
+    rng = np.random.default_rng(0)
+    x_values = np.linspace(20, 700, length)
+    y_values = 1000 / (1 + np.exp((x_values - 580) / 5)) + rng.normal(0, 1, length)
+    return x_values, y_values
+
+
+class TestRollingStatistics(unittest.TestCase):
+    def test_rolling_mean_std_matches_direct_computation(self):
+        values = np.random.default_rng(1).normal(size=(50, 3))
+        mean, std = rolling_mean_std(values, 5)
+        for index in range(50):
+            window = values[max(index - 2, 0):index + 3]
+            np.testing.assert_allclose(mean[index], window.mean(axis=0))
+            np.testing.assert_allclose(std[index], window.std(axis=0), atol=1e-9)
+
+    def test_rolling_std_of_large_values_keeps_precision(self):
+        values = 1e4 + np.random.default_rng(3).normal(0, 1e-3, 20000)
+        mean, std = rolling_mean_std(values, 7, exclude_center=True)
+        for index in (3, 9999, 19996):
+            window = np.delete(values[index - 3:index + 4], 3)
+            np.testing.assert_allclose(mean[index], window.mean(), rtol=1e-12)
+            np.testing.assert_allclose(std[index], window.std(), rtol=1e-6)
+
+    def test_rolling_median_mad_shape(self):
+        values = np.random.default_rng(2).normal(size=(40, 2))
+        median, mad = rolling_median_mad(values, 7)
+        self.assertEqual(median.shape, values.shape)
+        self.assertEqual(mad.shape, values.shape)
+        np.testing.assert_allclose(median[20], np.median(values[17:24], axis=0))
+
+
+class TestRollingOutlierDetection(unittest.TestCase):
+    def test_equal_lengths(self):
+        with self.assertRaises(ValueError):
+            HampelOutlierDetection(window_size=5).detect([0, 1, 2], [1, 2])
+
+    def test_spikes_detected_at_edges_and_middle(self):
+        """
+        Test that spikes are found everywhere, including next to the first and last points.
+        """
+        x_values = np.arange(30)
+        y_values = np.ones(30) + 0.01 * np.sin(x_values)
+        y_values[[1, 15, 28]] = [10, -10, 10]
+        for detector in [HampelOutlierDetection(window_size=7, threshold=3),
+                         RollingStandardDeviationOutlierDetection(window_size=7, threshold=3)]:
+            outlier_x, outlier_y = detector.detect(x_values, y_values)
+            self.assertEqual(list(outlier_x), [1, 15, 28])
+            self.assertEqual(list(outlier_y), [10, -10, 10])
+
+        # The first and the last points are only compared with one side by the Hampel filter
+        y_values = np.ones(30) + 0.01 * np.sin(x_values)
+        y_values[[0, 29]] = 10
+        outlier_x, _ = HampelOutlierDetection(window_size=7, threshold=3).detect(x_values, y_values)
+        self.assertEqual(list(outlier_x), [0, 29])
+        outlier_x, _ = RollingStandardDeviationOutlierDetection(window_size=7, threshold=3).detect(x_values, y_values)
+        self.assertEqual(list(outlier_x), [])
+
+    def test_trend_is_not_flagged_at_edges(self):
+        x_values = np.arange(10)
+        for window_size in (3, 5, 7):
+            for threshold in (1, 2, 3):
+                detector = RollingStandardDeviationOutlierDetection(window_size, threshold)
+                outlier_x, _ = detector.detect(x_values, 2.0 * x_values + 1)
+                self.assertEqual(list(outlier_x), [], (window_size, threshold))
+
+    def test_methods_have_default_windows(self):
+        _, y_values = curie_drop_curve()
+        for method in DataCalculation.get_available_outlier_detection_methods():
+            data_calc = DataCalculation()
+            data_calc.set_outline_detection_strategy(method, threshold=5)
+            data_calc.detect_outline_points(np.arange(len(y_values)), y_values)
+
+    def test_curie_drop_is_not_flagged(self):
+        """
+        Test that a smooth Curie drop is not mistaken for outliers, unlike with global statistics.
+        """
+        x_values, y_values = curie_drop_curve()
+        y_values[50] += 40
+
+        global_x, _ = MeanOutlierDetection(threshold=300).detect(x_values, y_values)
+        self.assertGreater(len(global_x), 1)
+
+        outlier_x, _ = HampelOutlierDetection(window_size=11, threshold=5).detect(x_values, y_values)
+        self.assertEqual(list(outlier_x), [x_values[50]])
+
+    def test_detect_mask_is_vectorized_over_columns(self):
+        _, y_values = curie_drop_curve()
+        block = np.column_stack([y_values, y_values * 2, -y_values])
+        for detector in [HampelOutlierDetection(window_size=7, threshold=5),
+                         RollingStandardDeviationOutlierDetection(window_size=7, threshold=5)]:
+            mask = detector.detect_mask(block)
+            self.assertEqual(mask.shape, block.shape)
+            for column in range(block.shape[1]):
+                np.testing.assert_array_equal(mask[:, column], detector.detect_mask(block[:, column]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import copy
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tma.core.data.parser.model.parameter import Parameter
+from tma.core.service.exceptions.pipeline_error import PipelineError
+from tma.core.service.measurement.analysis.curie_calculation import InflectionPointCalculation
+from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.model.measurement import Measurement
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+from tma.core.service.measurement.pipeline.processing_pipeline import ProcessingPipeline
+from tma.core.service.measurement.pipeline.stages import FurnaceConstantCorrectionStage, BulkCalculationStage, \
+    SmoothingStage, CurieDetectionStage, OutlierDetectionStage
+from tma.core.service.sample.controller.sample_correction_controller import SampleCorrectionController
+
+
+def create_manager():
+    columns = [Parameter.TEMP.value, Parameter.TSUSC.value, Parameter.CSUSC.value]
+    measurement = Measurement(1, 'furnace', columns)
+    temperatures = np.linspace(20, 700, 120)
+    susceptibility = 1000 / (1 + np.exp((temperatures - 580) / 10)) + 5
+    for column, values in zip(columns, [temperatures, susceptibility, susceptibility]):
+        measurement.add_heating_data(column, temperatures.tolist(), values.tolist())
+        measurement.add_cooling_data(column, temperatures[::-1].tolist(), values[::-1].tolist())
+    return MeasurementManager(measurement)
+
+
+def create_pipeline(constant=5.0, volume=6.7, smoothness_degree=11):
+    return ProcessingPipeline([
+        CurieDetectionStage(Parameter.BSUSC.value, InflectionPointCalculation, depends_on=['smoothing'],
+                            smoothness_degree=smoothness_degree, threshold=0),
+        SmoothingStage('Savitzky-Golay', depends_on=['bulk'], window_size=7),
+        BulkCalculationStage('volume', volume=volume, depends_on=['furnace_correction']),
+        FurnaceConstantCorrectionStage(constant),
+    ])
+
+
+class TestProcessingPipeline(unittest.TestCase):
+    def test_stages_are_sorted_by_dependencies(self):
+        names = [stage.name for stage in create_pipeline().stages]
+        self.assertEqual(names, ['furnace_correction', 'bulk', 'smoothing', 'curie'])
+
+    def test_invalid_graphs(self):
+        with self.assertRaises(PipelineError):
+            ProcessingPipeline([SmoothingStage(depends_on=['bulk'])])
+        with self.assertRaises(PipelineError):
+            ProcessingPipeline([SmoothingStage(name='a', depends_on=['b']), SmoothingStage(name='b', depends_on=['a'])])
+        with self.assertRaises(PipelineError):
+            ProcessingPipeline([SmoothingStage(), SmoothingStage()])
+        with self.assertRaises(PipelineError):
+            ProcessingPipeline([FurnaceConstantCorrectionStage(5.0), SmoothingStage()])
+
+    def test_result_matches_imperative_processing(self):
+        manager = create_manager()
+        expected = create_manager()
+
+        state = create_pipeline().execute(manager)
+
+        expected.correct_by_constant(5.0)
+        data_calc = DataCalculation()
+        data_calc.set_bulk_calculation_strategy('volume', volume=6.7)
+        expected.calculate_bulk(data_calc)
+        data_calc.set_smoothing_strategy('Savitzky-Golay', window_size=7)
+        expected.smooth(data_calc)
+        data_calc.set_curie_calculation_strategy(InflectionPointCalculation, smoothness_degree=11, threshold=0)
+
+        for column in [Parameter.CSUSC.value, Parameter.BSUSC.value]:
+            np.testing.assert_allclose(manager.measurement.heating_curve[column].values,
+                                       expected.measurement.heating_curve[column].values)
+        self.assertEqual(state.results['curie'], expected.calculate_curie(data_calc, Parameter.BSUSC.value))
+
+    def test_only_downstream_stages_are_executed(self):
+        manager = create_manager()
+        state = create_pipeline().execute(manager)
+        self.assertEqual(state.executed, ['furnace_correction', 'bulk', 'smoothing', 'curie'])
+
+        state = create_pipeline().execute(manager, state)
+        self.assertEqual(state.executed, [])
+        self.assertFalse(state.output_changed)
+
+        state = create_pipeline(smoothness_degree=9).execute(manager, state)
+        self.assertEqual(state.executed, ['curie'])
+
+        state = create_pipeline(volume=3.0, smoothness_degree=9).execute(manager, state)
+        self.assertEqual(state.executed, ['bulk', 'smoothing', 'curie'])
+
+        state = create_pipeline(constant=7.0, volume=3.0, smoothness_degree=9).execute(manager, state)
+        self.assertEqual(state.executed, ['furnace_correction', 'bulk', 'smoothing', 'curie'])
+
+    def test_re_execution_starts_from_the_snapshot(self):
+        manager = create_manager()
+        state = create_pipeline().execute(manager)
+        first_output = copy.deepcopy(manager.measurement.heating_curve[Parameter.BSUSC.value].values)
+
+        state = create_pipeline(volume=3.0).execute(manager, state)
+        state = create_pipeline().execute(manager, state)
+
+        np.testing.assert_allclose(manager.measurement.heating_curve[Parameter.BSUSC.value].values, first_output)
+
+    def test_removed_stage_drops_its_columns(self):
+        manager = create_manager()
+        state = create_pipeline().execute(manager)
+        self.assertIn(Parameter.BSUSC.value, manager.measurement.columns)
+
+        pipeline = ProcessingPipeline([FurnaceConstantCorrectionStage(5.0),
+                                       SmoothingStage('Savitzky-Golay', depends_on=['furnace_correction'],
+                                                      window_size=7)])
+        state = pipeline.execute(manager, state)
+        self.assertEqual(state.executed, ['smoothing'])
+        self.assertNotIn(Parameter.BSUSC.value, manager.measurement.columns)
+        self.assertNotIn('curie', state.results)
+
+    def test_edited_point_is_the_new_input(self):
+        manager = create_manager()
+        pipeline = create_pipeline()
+        state = pipeline.execute(manager)
+
+        manager.update_points({Parameter.TSUSC.value: 9999.0}, 10)
+        state = pipeline.execute(manager, state)
+
+        self.assertEqual(state.executed, ['furnace_correction', 'bulk', 'smoothing', 'curie'])
+        self.assertTrue(state.output_changed)
+        # The edit is kept, smoothed over its neighbours, instead of being replaced by the first input (1005)
+        self.assertGreater(manager.measurement.heating_curve[Parameter.CSUSC.value].values[10], 2000)
+
+        state = pipeline.execute(manager, state)
+        self.assertEqual(state.executed, [])
+
+    def test_stage_reads_the_data_of_its_dependencies(self):
+        def pipeline(volume):
+            return ProcessingPipeline([
+                FurnaceConstantCorrectionStage(5.0),
+                BulkCalculationStage('volume', volume=volume, depends_on=['furnace_correction']),
+                OutlierDetectionStage(Parameter.CSUSC.value, depends_on=['furnace_correction'], threshold=2),
+            ])
+
+        manager = create_manager()
+        state = pipeline(6.7).execute(manager)
+        self.assertEqual(state.executed, ['furnace_correction', 'bulk', 'outliers'])
+
+        state = pipeline(3.0).execute(manager, state)
+        self.assertEqual(state.executed, ['bulk'])
+        self.assertIn(Parameter.BSUSC.value, manager.measurement.columns)
+
+
+class TestRunPipeline(unittest.TestCase):
+    def test_failing_stage_is_reported_by_file(self):
+        items = [MagicMock(filename=MagicMock(value=f'file_{index}.clw')) for index in range(3)]
+        items[0].run_pipeline.side_effect = ValueError('Window size must be an odd number.')
+        items[2].pipeline_state.output_changed = False
+        controller = SampleCorrectionController(MagicMock())
+
+        with patch.object(controller, '_get_specimen_items_to_calculate', return_value=(items, [])), \
+                patch.object(controller, '_save_measured_data') as save_measured_data:
+            error = controller.run_pipeline(create_pipeline(), apply_to_all_files=True)
+
+        self.assertEqual(error, 'Error with file file_0.clw: Window size must be an odd number.')
+        save_measured_data.assert_called_once_with([items[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import plotly.graph_objects as go
+
+from tma.multipages.components.plot_widget.figure_model import FigureModel, changed_keys, same_value
+from tma.multipages.components.plot_widget.plot_renderer import hide_repeated_legends
+
+
+def create_figure(y_values=(1.0, np.nan), trace_type=go.Scatter, title='Sample', with_line=True):
+    fig = go.Figure([go.Scatter(x=np.arange(5.0), y=np.arange(5.0), name='heating'),
+                     trace_type(x=[1.0, 2.0], y=list(y_values), name='points')])
+    fig.update_layout(title=title)
+    if with_line:
+        fig.add_vline(x=0)
+    return fig
+
+
+class TestFigureModel(unittest.TestCase):
+    def setUp(self):
+        self.widget = go.FigureWidget()
+        self.model = FigureModel()
+        self.model.update(self.widget, create_figure())
+
+    def assert_shows(self, fig):
+        self.assertEqual([trace.type for trace in self.widget.data], [trace.type for trace in fig.data])
+        for shown, expected in zip(self.widget.data, fig.data):
+            np.testing.assert_array_equal(np.asarray(shown.y, dtype=float), np.asarray(expected.y, dtype=float))
+        self.assertEqual(self.widget.layout.title.text, fig.layout.title.text)
+        self.assertEqual(len(self.widget.layout.shapes), len(fig.layout.shapes))
+
+    def test_same_value(self):
+        self.assertTrue(same_value([1.0, np.nan], np.array([1.0, np.nan])))
+        self.assertTrue(same_value({'line': {'color': 'red'}}, {'line': {'color': 'red'}}))
+        self.assertFalse(same_value({'line': {'color': 'red'}}, {'line': {'color': 'blue'}}))
+        self.assertFalse(same_value(['a', 'b'], ['a', 'c']))
+        self.assertFalse(same_value([1.0], 1.0))
+        self.assertFalse(same_value(1, True))
+
+    def test_changed_keys(self):
+        self.assertEqual(changed_keys({'x': [1], 'name': 'a', 'mode': 'lines'}, {'x': [1], 'name': 'b'}),
+                         {'name': 'b', 'mode': None})
+
+    def test_unchanged_figure_sends_nothing(self):
+        traces = list(self.widget.data)
+        with patch.object(self.widget, '_send_update_msg') as send_update:
+            self.model.update(self.widget, create_figure())
+        send_update.assert_not_called()
+        self.assertEqual([id(trace) for trace in self.widget.data], [id(trace) for trace in traces])
+
+    def test_edited_trace_is_patched(self):
+        traces = list(self.widget.data)
+        fig = create_figure(y_values=(7.0, np.nan))
+        self.model.update(self.widget, fig)
+
+        self.assert_shows(fig)
+        self.assertEqual([id(trace) for trace in self.widget.data], [id(trace) for trace in traces])
+
+    def test_added_and_removed_traces(self):
+        fig = create_figure()
+        fig.add_trace(go.Scatter(x=[3.0], y=[3.0], name='added'))
+        self.model.update(self.widget, fig)
+        self.assert_shows(fig)
+
+        fig = create_figure()
+        fig.data = fig.data[:1]
+        self.model.update(self.widget, fig)
+        self.assert_shows(fig)
+
+    def test_changed_trace_type_replaces_the_trace(self):
+        first = self.widget.data[0]
+        fig = create_figure(trace_type=go.Scattergl)
+        self.model.update(self.widget, fig)
+
+        self.assert_shows(fig)
+        self.assertIs(self.widget.data[0], first)
+
+        fig = create_figure()
+        self.model.update(self.widget, fig)
+        self.assert_shows(fig)
+
+    def test_changed_and_removed_layout_keys(self):
+        fig = create_figure(title='Other', with_line=False)
+        self.model.update(self.widget, fig)
+        self.assert_shows(fig)
+
+    def test_new_widget_is_filled(self):
+        widget = go.FigureWidget()
+        fig = create_figure(y_values=(3.0, 4.0))
+        self.model.update(widget, fig)
+
+        self.widget = widget
+        self.assert_shows(fig)
+
+
+class TestHideRepeatedLegends(unittest.TestCase):
+    def test_repeated_names_are_hidden_after_start(self):
+        fig = go.Figure([go.Scatter(name='curve'), go.Scatter(name='curve'), go.Scatter(name='points'),
+                         go.Scatter(name='curve'), go.Scatter(name='points'), go.Scatter(name='other')])
+
+        hide_repeated_legends(fig, start=2)
+
+        self.assertEqual([trace.showlegend for trace in fig.data], [None, None, None, False, False, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+import plotly.graph_objects as go
+
+from tma.multipages.components.graphic_elements import line
+from tma.multipages.components.graphic_elements.line import HorizontalLine, Line, VerticalLine, draw_lines
+from tma.multipages.components.graphic_elements.style import LineTypes
+from tma.multipages.components.plot_widget import plot_renderer
+from tma.multipages.components.plot_widget.plot_renderer import build_figure
+
+
+def create_curves():
+    return [[go.Scatter(x=[0.0, 700.0], y=[0.0, 1.0], name='heating')]]
+
+
+class TestMarkerLines(unittest.TestCase):
+    def test_segments_are_split_by_none(self):
+        self.assertEqual(VerticalLine([580, 600], LineTypes.StoredCurieLine).segments(),
+                         ([580, 580, None, 600, 600, None], [0, 1, None, 0, 1, None]))
+        self.assertEqual(HorizontalLine([0.5], LineTypes.StoredCurieLine).segments(),
+                         ([0, 1, None], [0.5, 0.5, None]))
+
+    def test_one_trace_per_direction_and_style(self):
+        lines = [VerticalLine([580 + index], LineTypes.StoredCurieLine) for index in range(50)]
+        lines += [VerticalLine([590], LineTypes.InflectionPointLine), HorizontalLine([0.5, 0.7],
+                                                                                   LineTypes.StoredCurieLine)]
+        fig = draw_lines(go.Figure(), lines)
+
+        self.assertEqual(len(fig.data), 3)
+        curie_lines, inflection_lines, horizontal_lines = fig.data
+        self.assertEqual(len(curie_lines.x), 150)
+        self.assertEqual((curie_lines.xaxis, curie_lines.yaxis), ('x', line.LINES_Y_AXIS))
+        self.assertEqual((horizontal_lines.xaxis, horizontal_lines.yaxis), (line.LINES_X_AXIS, 'y'))
+        self.assertEqual((inflection_lines.line.color, inflection_lines.line.width, inflection_lines.line.dash),
+                         (LineTypes.InflectionPointLine.color, LineTypes.InflectionPointLine.width,
+                          LineTypes.InflectionPointLine.dash))
+        self.assertEqual(fig.layout.yaxis9.range, (0, 1))
+        self.assertFalse(fig.layout.xaxis9.visible)
+
+    def test_no_lines_leave_the_figure_untouched(self):
+        fig = draw_lines(go.Figure(), [])
+        self.assertEqual(len(fig.data), 0)
+        self.assertNotIn('xaxis9', fig.layout)
+
+    def test_line_requires_segments(self):
+        class IncompleteLine(Line):
+            def draw_shapes(self, fig):
+                return fig
+
+        with self.assertRaises(TypeError):
+            IncompleteLine(LineTypes.StoredCurieLine)
+
+    def test_axes_lines_are_batched_after_the_curves(self):
+        with patch.object(plot_renderer.settings, 'plot_marker_lines', 'traces'):
+            fig = build_figure(create_curves(), [VerticalLine([580], LineTypes.StoredCurieLine)])
+
+        self.assertEqual(len(fig.layout.shapes), 0)
+        self.assertEqual(fig.data[0].name, 'heating')
+        axes_lines = [trace for trace in fig.data if trace.line.color == LineTypes.BaseLine.color]
+        self.assertEqual([(trace.x, trace.y) for trace in axes_lines],
+                         [((0, 1, None), (0, 0, None)), ((0, 0, None), (0, 1, None))])
+
+    def test_shapes_mode(self):
+        with patch.object(plot_renderer.settings, 'plot_marker_lines', 'shapes'), \
+                patch.object(line.settings, 'plot_marker_lines', 'shapes'):
+            fig = build_figure(create_curves(), [VerticalLine([580, 600], LineTypes.StoredCurieLine)])
+
+        self.assertEqual(len(fig.data), 1)
+        self.assertEqual(len(fig.layout.shapes), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+import plotly.graph_objects as go
+
+from tma.multipages.components.graphic_elements.plot_appearance_settings import PlotAppearanceSettings
+from tma.multipages.components.graphic_elements.style import PointTypes
+from tma.multipages.components.plot_widget.webgl import to_webgl
+
+
+class TestToWebgl(unittest.TestCase):
+    def test_curve_styles_survive(self):
+        settings = PlotAppearanceSettings('Sample').heating_settings
+        settings.update(mode='lines+markers', line_dash='dash', marker_symbol='square')
+        trace = go.Scatter(settings.to_dict(x=np.arange(3.0), y=np.arange(3.0), name='heating'))
+
+        webgl = to_webgl(trace)
+
+        self.assertIsInstance(webgl, go.Scattergl)
+        self.assertEqual((webgl.name, webgl.mode, webgl.showlegend), ('Sample Heating', 'lines+markers', True))
+        self.assertEqual((webgl.line.color, webgl.line.width, webgl.line.dash), ('red', 2, 'dash'))
+        self.assertEqual((webgl.marker.symbol, webgl.marker.size), ('square', 6))
+        np.testing.assert_array_equal(webgl.y, trace.y)
+
+    def test_marker_styles_survive(self):
+        style = PointTypes.OutlinePoint
+        trace = go.Scatter(x=[1.0], y=[2.0], mode='markers', name=style.name,
+                           marker=dict(color=style.color, size=style.size, symbol=style.symbol,
+                                       line=dict(width=1, color=style.marker_line_color)))
+
+        marker = to_webgl(trace).marker
+
+        self.assertEqual((marker.color, marker.size, marker.symbol), ('#009E73', 8, 'star-diamond'))
+        self.assertEqual((marker.line.width, marker.line.color), (1, '#000000'))
+
+    def test_svg_only_properties_are_dropped(self):
+        trace = go.Scatter(x=[1.0, 2.0], y=[1.0, 2.0], cliponaxis=False,
+                           line=dict(shape='spline', smoothing=1.0, color='blue'))
+
+        webgl = to_webgl(trace)
+
+        self.assertEqual(webgl.line.to_plotly_json(), {'color': 'blue'})
+        self.assertNotIn('cliponaxis', webgl.to_plotly_json())
+
+    def test_step_shape_is_kept(self):
+        trace = go.Scatter(x=[1.0, 2.0], y=[1.0, 2.0], line=dict(shape='hv'))
+        self.assertEqual(to_webgl(trace).line.shape, 'hv')
+
+
+if __name__ == '__main__':
+    unittest.main()
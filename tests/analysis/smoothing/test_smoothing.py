@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.analysis.smoothing import SavitzkyGolaySmoothing, GaussianSmoothing, \
+    RunningMedianSmoothing, MovingAverageSmoothing
+from tma.core.service.measurement.model.curve import Curve
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+
+
+class TestKernelSmoothing(unittest.TestCase):
+    def setUp(self):
+        temperatures = np.linspace(20, 700, 200)
+        self.block = np.column_stack([np.sin(temperatures / 100), np.cos(temperatures / 50), temperatures / 10])
+
+    def test_length_is_preserved(self):
+        """
+        Test that every kernel strategy returns as many points as it was given.
+        """
+        for strategy in [SavitzkyGolaySmoothing(7), GaussianSmoothing(7), RunningMedianSmoothing(7)]:
+            smoothed = strategy.smooth(self.block[:, 0])
+            self.assertEqual(smoothed.shape, self.block[:, 0].shape)
+
+    def test_block_equals_column_by_column(self):
+        """
+        Test that smoothing a 2-D block gives the same result as smoothing each column separately.
+        """
+        for strategy in [SavitzkyGolaySmoothing(7), GaussianSmoothing(7), RunningMedianSmoothing(7)]:
+            smoothed_block = strategy.smooth_block(self.block)
+            for column in range(self.block.shape[1]):
+                np.testing.assert_allclose(smoothed_block[:, column], strategy.smooth(self.block[:, column]))
+
+    def test_output_is_written_in_place(self):
+        """
+        Test that the result is written into the preallocated output array.
+        """
+        out = np.empty_like(self.block)
+        result = GaussianSmoothing(5).smooth_block(self.block, out=out)
+        self.assertIs(result, out)
+
+        block = self.block.copy()
+        RunningMedianSmoothing(5).smooth_block(block, out=block)
+        np.testing.assert_allclose(block, RunningMedianSmoothing(5).smooth_block(self.block))
+
+    def test_savitzky_golay_keeps_polynomial(self):
+        """
+        Test that Savitzky-Golay smoothing does not change a polynomial of lower order, edges included.
+        """
+        x = np.linspace(-1, 1, 50)
+        smoothed = SavitzkyGolaySmoothing(window_size=9, polyorder=2).smooth(3 * x ** 2 - x + 1)
+        np.testing.assert_allclose(smoothed, np.round(3 * x ** 2 - x + 1, 3), atol=1e-3)
+
+    def test_running_median_removes_spike(self):
+        """
+        Test that a single spike is removed by the running median.
+        """
+        values = np.ones(20)
+        values[10] = 100
+        np.testing.assert_allclose(RunningMedianSmoothing(5).smooth(values), np.ones(20))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            SavitzkyGolaySmoothing(window_size=4)
+        with self.assertRaises(ValueError):
+            SavitzkyGolaySmoothing(window_size=5, polyorder=5)
+        with self.assertRaises(ValueError):
+            GaussianSmoothing(window_size=5, mode='interp')
+
+
+class TestDataCalculationSmoothing(unittest.TestCase):
+    def test_set_smoothing_strategy_by_name(self):
+        data_calc = DataCalculation()
+        data_calc.set_smoothing_strategy('Savitzky-Golay', window_size=5)
+        self.assertIsInstance(data_calc.smoothing_strategy, SavitzkyGolaySmoothing)
+
+    def test_smooth_block_requires_length_preserving_strategy(self):
+        data_calc = DataCalculation()
+        data_calc.set_smoothing_strategy(MovingAverageSmoothing, window_size=5)
+        with self.assertRaises(ValueError):
+            data_calc.smooth_block(np.ones((10, 2)))
+
+    def test_smooth_curves_of_several_lengths(self):
+        """
+        Test that curves are smoothed in place and keep their lengths.
+        """
+        data_calc = DataCalculation()
+        data_calc.set_smoothing_strategy('Running Median', window_size=3)
+        curves = [Curve(list(range(6)), [1.0, 1.0, 9.0, 1.0, 1.0, 1.0]),
+                  Curve(list(range(4)), [2.0, 2.0, 8.0, 2.0]),
+                  Curve(list(range(6)), [0.0, 5.0, 0.0, 0.0, 0.0, 0.0])]
+
+        MeasurementManager.smooth_curves(curves, data_calc)
+
+        self.assertEqual(curves[0].values, [1.0] * 6)
+        self.assertEqual(curves[1].values, [2.0] * 4)
+        self.assertEqual(curves[2].values, [0.0] * 6)
+        self.assertEqual([len(curve.temperature) for curve in curves], [6, 4, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
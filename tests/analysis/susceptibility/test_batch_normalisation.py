@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tma.core.data.parser.model.parameter import Parameter
+from tma.core.service.exceptions.parameter_error import ParameterError
+from tma.core.service.measurement.analysis.batch_scaling import scale_blocks
+from tma.core.service.measurement.analysis.bulk_calculation import VolumeCalculation, MassSusceptibilityCalculation
+from tma.core.service.measurement.analysis.data_calculation import DataCalculation
+from tma.core.service.measurement.analysis.mass_calculation import MassCalculation
+from tma.core.service.measurement.model.measurement import Measurement
+from tma.core.service.measurement.model.measurement_manager import MeasurementManager
+from tma.core.service.sample.controller.sample_correction_controller import SampleCorrectionController
+from tma.core.service.sample.model.specimen_item import SpecimenItem
+
+
+def calculated_curves(manager, parameter):
+    curves = [manager.measurement.heating_curve[parameter]]
+    if manager.measurement.has_cooling_curve[Parameter.CSUSC.value]:
+        curves.append(manager.measurement.cooling_curve[parameter])
+    return curves
+
+
+def create_manager(length, with_cooling=True, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = [Parameter.TEMP.value, Parameter.CSUSC.value]
+    measurement = Measurement(1, 'furnace', columns)
+    temperatures = np.linspace(20, 700, length).tolist()
+    measurement.add_heating_data(Parameter.TEMP.value, temperatures, temperatures)
+    measurement.add_heating_data(Parameter.CSUSC.value, temperatures, rng.uniform(0, 500, length).tolist())
+    if with_cooling:
+        measurement.add_cooling_data(Parameter.TEMP.value, temperatures[::-1], temperatures[::-1])
+        measurement.add_cooling_data(Parameter.CSUSC.value, temperatures[::-1], rng.uniform(0, 500, length).tolist())
+    return MeasurementManager(measurement)
+
+
+class TestBatchNormalisation(unittest.TestCase):
+    def test_scale_blocks_writes_into_output(self):
+        out = np.empty(5)
+        blocks = scale_blocks([[1.0, 2.0], [3.0, 4.0, 5.0]], [2.0, 0.5], 3, out=out)
+        np.testing.assert_array_equal(out, [2.0, 4.0, 1.5, 2.0, 2.5])
+        self.assertTrue(np.shares_memory(blocks[1], out))
+        self.assertEqual(scale_blocks([], [], 3), [])
+
+    def test_bulk_batch_matches_single_calculation(self):
+        managers = [create_manager(50, seed=0), create_manager(80, with_cooling=False, seed=1),
+                    create_manager(30, seed=2)]
+        volumes = [6.7, 2.5, 9.1]
+        expected = []
+        for manager, volume in zip(managers, volumes):
+            strategy = VolumeCalculation(volume)
+            expected.append([strategy.calculate(curve.values) for curve in manager.get_curves(Parameter.CSUSC.value)])
+
+        MeasurementManager.calculate_bulk_many(managers, DataCalculation(), 'volume', volumes=volumes)
+
+        for manager, expected_values in zip(managers, expected):
+            for curve, values in zip(calculated_curves(manager, Parameter.BSUSC.value), expected_values):
+                np.testing.assert_array_equal(curve.values, values)
+
+    def test_bulk_by_mass_with_shared_density(self):
+        managers = [create_manager(40, seed=3), create_manager(40, seed=4)]
+        masses = [5.5, 7.1]
+        MeasurementManager.calculate_bulk_many(managers, DataCalculation(), 'mass', masses=masses, densities=1.2)
+
+        for manager, mass in zip(managers, masses):
+            ratio = (MassSusceptibilityCalculation.nominal_volume * 1.2) / mass
+            for source, result in zip(manager.get_curves(Parameter.CSUSC.value),
+                                      calculated_curves(manager, Parameter.BSUSC.value)):
+                # Mass based bulk susceptibility is rounded to one decimal
+                np.testing.assert_array_equal(result.values, np.round(np.array(source.values) * ratio, 1))
+
+    def test_mass_batch(self):
+        managers = [create_manager(20, seed=5), create_manager(25, seed=6)]
+        MeasurementManager.calculate_mass_many(managers, DataCalculation(), masses=[3.0, 4.0])
+
+        for manager, mass in zip(managers, [3.0, 4.0]):
+            for source, result in zip(manager.get_curves(Parameter.CSUSC.value),
+                                      calculated_curves(manager, Parameter.MSUSC.value)):
+                np.testing.assert_array_equal(result.values, np.round(np.array(source.values) * (10 / mass) / 10, 1))
+                np.testing.assert_array_equal(result.values, MassCalculation(mass).calculate(source.values))
+
+    def test_invalid_parameters_leave_data_untouched(self):
+        managers = [create_manager(10, seed=7), create_manager(10, seed=8)]
+        with self.assertRaises(ParameterError):
+            MeasurementManager.calculate_bulk_many(managers, DataCalculation(), 'volume', volumes=[1.0, 0])
+        with self.assertRaises(ParameterError):
+            MeasurementManager.calculate_bulk_many(managers, DataCalculation(), 'mass', masses=[1.0, 2.0])
+        for manager in managers:
+            self.assertNotIn(Parameter.BSUSC.value, manager.get_measurement_columns())
+
+    def test_failing_file_is_reported_by_name(self):
+        items = [MagicMock(filename=MagicMock(value=f'file_{index}.clw')) for index in range(3)]
+        items[1].calculate_mass.side_effect = ParameterError('No CSUSC column.')
+        controller = SampleCorrectionController(MagicMock())
+
+        with patch.object(controller, '_get_specimen_items_to_calculate', return_value=(items, [])), \
+                patch.object(controller, '_save_measured_data') as save_measured_data, \
+                patch.object(SpecimenItem, 'calculate_mass_many', side_effect=ValueError('Batch failed.')):
+            error = controller.calculate_mass(2.0, calculate_for_all_files=True)
+
+        self.assertEqual(error, 'Error with file file_1.clw: No CSUSC column.')
+        save_measured_data.assert_called_once_with([items[0], items[2]])
+
+    def test_failing_bulk_file_is_reported_by_name(self):
+        items = [MagicMock(filename=MagicMock(value=f'file_{index}.clw')) for index in range(3)]
+        items[2].calculate_bulk.side_effect = ParameterError('No CSUSC column.')
+        controller = SampleCorrectionController(MagicMock())
+
+        with patch.object(controller, '_get_specimen_items_to_calculate', return_value=(items, [])), \
+                patch.object(controller, '_save_measured_data') as save_measured_data, \
+                patch.object(SpecimenItem, 'calculate_bulk_many', side_effect=ParameterError('Batch failed.')):
+            error = controller.calculate_bulk('volume', calculate_for_all_files=True, volume=2.0)
+
+        self.assertEqual(error, 'Error with file file_2.clw: No CSUSC column.')
+        items[0].calculate_bulk.assert_called_once_with('volume', volume=2.0, mass=None, density=None)
+        save_measured_data.assert_called_once_with([items[0], items[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
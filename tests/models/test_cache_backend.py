@@ -0,0 +1,163 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import redis
+
+from tma.core.cache_backend import MemoryCacheBackend, RedisCacheBackend
+from tma.core.service.measurement.model import measurement_factory
+from tma.core.service.measurement.model.measurement_factory import MeasurementFactory
+from tma.core.service.services.measured_data_cache import MeasuredDataCache
+
+FILES_PATH = Path(__file__).resolve().parents[1] / 'files'
+
+
+class LocalRedis:
+    """
+    A stand-in for the Redis client, with the commands used by RedisCacheBackend.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+        self.available = True
+
+    def _check(self):
+        if not self.available:
+            raise redis.ConnectionError("Redis is not available.")
+
+    def mget(self, keys):
+        self._check()
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.values[key] = value
+        self.expiry[key] = ex
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return LocalPipeline(self)
+
+
+class LocalPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, *args, **kwargs):
+        self.commands.append((args, kwargs))
+
+    def execute(self):
+        return [self.client.set(*args, **kwargs) for args, kwargs in self.commands]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.backend = MemoryCacheBackend(max_bytes=100, ttl=60, clock=self.clock)
+
+    def test_get_many_returns_only_cached_keys(self):
+        self.backend.set_many({'a': b'1', 'b': b'2'})
+        self.assertEqual(self.backend.get_many(['a', 'c']), {'a': b'1'})
+        self.assertEqual(self.backend.get('b'), b'2')
+
+    def test_values_expire(self):
+        self.backend.set('a', b'1')
+        self.clock.now = 61
+        self.assertIsNone(self.backend.get('a'))
+        self.assertEqual(self.backend.size_bytes, 0)
+
+    def test_least_recently_used_values_are_evicted_over_budget(self):
+        self.backend.set_many({'a': b'x' * 40, 'b': b'x' * 40})
+        self.backend.get('a')
+        self.backend.set('c', b'x' * 40)
+        self.assertEqual(set(self.backend.get_many(['a', 'b', 'c'])), {'a', 'c'})
+        self.assertLessEqual(self.backend.size_bytes, 100)
+
+    def test_delete(self):
+        self.backend.set_many({'a': b'1', 'b': b'2'})
+        self.backend.delete('a', 'missing')
+        self.assertEqual(self.backend.get_many(['a', 'b']), {'b': b'2'})
+
+
+class TestRedisCacheBackend(unittest.TestCase):
+    def setUp(self):
+        self.client = LocalRedis()
+        self.backend = RedisCacheBackend(self.client, ttl=60)
+
+    def test_values_are_prefixed_and_expire(self):
+        self.backend.set_many({'a': b'1', 'b': b'2'})
+        self.assertEqual(self.client.values, {'tma:a': b'1', 'tma:b': b'2'})
+        self.assertEqual(self.client.expiry['tma:a'], 60)
+        self.assertEqual(self.backend.get_many(['a', 'c']), {'a': b'1'})
+
+        self.backend.delete('a')
+        self.assertIsNone(self.backend.get('a'))
+
+    def test_unavailable_redis_misses(self):
+        self.backend.set('a', b'1')
+        self.client.available = False
+        self.assertIsNone(self.backend.get('a'))
+        self.backend.set('b', b'2')
+        self.backend.delete('a')
+
+
+class TestMeasuredDataCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = MeasuredDataCache(RedisCacheBackend(LocalRedis()))
+        self.loaded_ids = []
+
+    def load(self, specimen_item_ids):
+        self.loaded_ids.append(list(specimen_item_ids))
+        return {specimen_item_id: {'TEMP': {'increasing': np.array([20.0, 30.0])},
+                                   'BSUSC': {'increasing': np.array([1.0, float(specimen_item_id)])}}
+                for specimen_item_id in specimen_item_ids}
+
+    def test_only_missing_specimen_items_are_loaded(self):
+        self.cache.get_data_by_specimen_item_ids([1, 2], self.load)
+        measured_data = self.cache.get_data_by_specimen_item_ids([1, 2, 3], self.load)
+
+        self.assertEqual(self.loaded_ids, [[1, 2], [3]])
+        np.testing.assert_array_equal(measured_data[2]['BSUSC']['increasing'], [1.0, 2.0])
+        measured_data[2]['BSUSC']['increasing'][0] = 5.0
+
+    def test_invalidate(self):
+        self.cache.get_data_by_specimen_item_ids([1, 2], self.load)
+        self.cache.invalidate([1])
+        self.cache.get_data_by_specimen_item_ids([1, 2], self.load)
+        self.assertEqual(self.loaded_ids, [[1, 2], [1]])
+
+
+class TestParsedFileCache(unittest.TestCase):
+    def test_file_with_the_same_content_is_parsed_once(self):
+        backend = MemoryCacheBackend()
+        content = (FILES_PATH / 'VF03_L1.clw').read_bytes()
+        with patch.object(measurement_factory, 'get_cache_backend', lambda: backend), \
+                patch.object(measurement_factory, 'DataAnalyzer',
+                             wraps=measurement_factory.DataAnalyzer) as data_analyzer:
+            columns, measured_data = MeasurementFactory.parse_file(content)
+            cached_columns, cached_data = MeasurementFactory.parse_file(content)
+
+        self.assertEqual(data_analyzer.call_count, 1)
+        self.assertEqual(cached_columns, columns)
+        for column in columns:
+            for phase, values in measured_data[column].items():
+                np.testing.assert_array_equal(cached_data[column][phase], values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from tma.core.model.column_codec import encode_columns, decode_columns, is_encoded, encode_measurement, \
+    decode_measurement
+from tma.core.model.migrations.binary_measured_data import add_binary_column, convert_to_binary, convert_to_json
+from tma.core.model.migrations.measurement_blobs import convert_to_measurement_blobs
+
+
+class TestColumnCodec(unittest.TestCase):
+    def setUp(self):
+        self.data = {'increasing': np.linspace(20, 700, 1000), 'decreasing': np.array([1.5, -2.25])}
+
+    def test_round_trip(self):
+        decoded = decode_columns(encode_columns(self.data))
+        self.assertEqual(list(decoded), ['increasing', 'decreasing'])
+        for key, values in self.data.items():
+            np.testing.assert_array_equal(decoded[key], values)
+            self.assertEqual(decoded[key].dtype, np.float64)
+
+    def test_empty_arrays(self):
+        decoded = decode_columns(encode_columns({'increasing': np.array([]), 'decreasing': []}))
+        self.assertEqual(len(decoded['increasing']), 0)
+        self.assertEqual(len(decoded['decreasing']), 0)
+
+    def test_float32(self):
+        blob = encode_columns(self.data, dtype='float32')
+        decoded = decode_columns(blob)
+        self.assertEqual(decoded['increasing'].dtype, np.float32)
+        np.testing.assert_allclose(decoded['increasing'], self.data['increasing'], rtol=1e-6)
+        self.assertLess(len(blob), len(encode_columns(self.data)))
+
+    def test_zlib(self):
+        data = {'increasing': np.zeros(1000)}
+        blob = encode_columns(data, compression='zlib')
+        self.assertLess(len(blob), 1000 * 8)
+        np.testing.assert_array_equal(decode_columns(blob)['increasing'], data['increasing'])
+
+    def test_decode_does_not_copy(self):
+        blob = encode_columns(self.data)
+        decoded = decode_columns(blob)
+        self.assertFalse(decoded['increasing'].flags.owndata)
+        self.assertFalse(decoded['increasing'].flags.writeable)
+
+    def test_invalid_blob(self):
+        self.assertFalse(is_encoded(b'{"increasing": []}'))
+        self.assertTrue(is_encoded(encode_columns(self.data)))
+        with self.assertRaises(ValueError):
+            decode_columns(b'JSON' + bytes(8))
+
+    def test_invalid_dtype(self):
+        with self.assertRaises(ValueError):
+            encode_columns(self.data, dtype='int8')
+
+    def test_writable(self):
+        decoded = decode_columns(encode_columns(self.data), writable=True)
+        decoded['decreasing'][0] = 10
+        self.assertEqual(decoded['decreasing'][0], 10)
+
+    def test_measurement_round_trip(self):
+        measured_data = {'TEMP': {'increasing': np.array([20., 30.]), 'decreasing': np.array([30.])},
+                         'BSUSC': {'increasing': np.array([1., 2.]), 'decreasing': np.array([3.])},
+                         'CSUSC': {'increasing': np.array([4., 5.])}}
+        blob = encode_measurement(measured_data)
+
+        decoded = decode_measurement(blob)
+        self.assertEqual(list(decoded), ['TEMP', 'BSUSC', 'CSUSC'])
+        for column, curves in measured_data.items():
+            self.assertEqual(list(decoded[column]), list(curves))
+            for phase, values in curves.items():
+                np.testing.assert_array_equal(decoded[column][phase], values)
+
+        one_column = decode_measurement(blob, columns=['CSUSC'])
+        self.assertEqual(list(one_column), ['CSUSC'])
+        np.testing.assert_array_equal(one_column['CSUSC']['increasing'], [4., 5.])
+
+
+class TestBinaryMeasuredDataMigration(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE measured_data (measurement_data_id INTEGER PRIMARY KEY, data JSON)'))
+            connection.execute(text('INSERT INTO measured_data (measurement_data_id, data) VALUES (:id, :data)'),
+                               [{'id': i, 'data': f'{{"increasing": [{i}, 2.5], "decreasing": []}}'}
+                                for i in range(1, 6)])
+
+    def test_add_binary_column_once(self):
+        with self.engine.begin() as connection:
+            self.assertTrue(add_binary_column(connection))
+            self.assertFalse(add_binary_column(connection))
+
+    def test_convert_and_revert(self):
+        self.assertEqual(convert_to_binary(self.engine, batch_size=2), 5)
+        with self.engine.begin() as connection:
+            rows = connection.execute(text('SELECT data, data_blob FROM measured_data ORDER BY 1')).all()
+        self.assertTrue(all(data is None for data, _ in rows))
+        np.testing.assert_array_equal(decode_columns(rows[0][1])['increasing'], [1, 2.5])
+        self.assertEqual(convert_to_binary(self.engine), 0)
+
+        self.assertEqual(convert_to_json(self.engine, batch_size=2), 5)
+        with self.engine.begin() as connection:
+            data = connection.execute(text('SELECT data FROM measured_data WHERE measurement_data_id = 3')).scalar()
+        self.assertEqual(data, '{"increasing": [3.0, 2.5], "decreasing": []}')
+
+
+class TestMeasurementBlobsMigration(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE measured_data (measurement_data_id INTEGER PRIMARY KEY, '
+                                    'measurement_id INTEGER, specimen_item_id INTEGER, column_name TEXT, '
+                                    'data JSON, data_blob BLOB)'))
+            connection.execute(text('CREATE TABLE measurement_blobs (measurement_id INTEGER PRIMARY KEY, '
+                                    'specimen_item_id INTEGER, data BLOB NOT NULL)'))
+            connection.execute(
+                text('INSERT INTO measured_data (measurement_id, specimen_item_id, column_name, data, data_blob) '
+                     'VALUES (:measurement_id, :specimen_item_id, :column_name, :data, :data_blob)'),
+                [{'measurement_id': 1, 'specimen_item_id': 10, 'column_name': 'TEMP',
+                  'data': '{"increasing": [20, 30]}', 'data_blob': None},
+                 {'measurement_id': 1, 'specimen_item_id': 10, 'column_name': 'BSUSC',
+                  'data': None, 'data_blob': encode_columns({'increasing': [1.5, 2.5]})},
+                 {'measurement_id': 2, 'specimen_item_id': 11, 'column_name': 'TEMP',
+                  'data': '{"increasing": [40]}', 'data_blob': None}]
+            )
+
+    def test_convert(self):
+        self.assertEqual(convert_to_measurement_blobs(self.engine, batch_size=1), 2)
+        self.assertEqual(convert_to_measurement_blobs(self.engine), 0)
+        with self.engine.begin() as connection:
+            rows = connection.execute(text('SELECT measurement_id, specimen_item_id, data FROM measurement_blobs '
+                                           'ORDER BY measurement_id')).all()
+        self.assertEqual([(row[0], row[1]) for row in rows], [(1, 10), (2, 11)])
+        decoded = decode_measurement(rows[0][2])
+        np.testing.assert_array_equal(decoded['TEMP']['increasing'], [20, 30])
+        np.testing.assert_array_equal(decoded['BSUSC']['increasing'], [1.5, 2.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
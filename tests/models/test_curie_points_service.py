@@ -74,3 +74,23 @@ class TestCuriePointService(unittest.TestCase):
 
         self.mock_repository.delete_curie_point.assert_called_once_with(curie_point_id)
 
+
+class TestCuriePointServiceBatch(unittest.TestCase):
+    def setUp(self):
+        self.mock_repository = MagicMock(spec=CuriePointRepository)
+        self.service = CuriePointService(self.mock_repository)
+
+    def test_get_curie_points_models_by_specimen_item_ids(self):
+        mock_points = [
+            MagicMock(specimen_item_id=1, curie_point_id=1, id_plot_selected=0, column_name="BSUSC",
+                      temperature_value=100.0, magnetization_value=0.5),
+            MagicMock(specimen_item_id=2, curie_point_id=2, id_plot_selected=1, column_name="BSUSC",
+                      temperature_value=200.0, magnetization_value=0.7),
+        ]
+        self.mock_repository.get_curie_points_by_specimen_item_ids.return_value = mock_points
+
+        result = self.service.get_curie_points_models_by_specimen_item_ids([1, 2, 3])
+
+        self.mock_repository.get_curie_points_by_specimen_item_ids.assert_called_once_with([1, 2, 3])
+        self.assertEqual(list(result), [1, 2])
+        self.assertEqual(result[2][0].temperature_value, 200.0)
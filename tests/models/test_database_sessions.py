@@ -0,0 +1,50 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.pool import QueuePool
+
+from tma.core import database
+from tma.core.settings import settings
+
+
+class TestDatabaseSessions(unittest.TestCase):
+    def tearDown(self):
+        database.Session.remove()
+
+    def test_engine_uses_configured_pool(self):
+        self.assertIsInstance(database.engine.pool, QueuePool)
+        self.assertEqual(database.engine.pool.size(), settings.db_pool_size)
+
+    def test_session_is_reused_within_thread(self):
+        self.assertIs(database.Session(), database.Session())
+
+    def test_threads_get_own_sessions(self):
+        sessions = []
+
+        def get_session():
+            sessions.append(database.Session())
+            database.Session.remove()
+
+        threads = [threading.Thread(target=get_session) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(session) for session in sessions + [database.Session()]}), 4)
+
+    def test_close_sessions_of_kernel(self):
+        with patch.object(database, 'get_session_scope', return_value=('kernel', 1)):
+            with patch.object(database.Session.registry, 'scopefunc', database.get_session_scope):
+                kernel_session = database.Session()
+        own_session = database.Session()
+
+        self.assertEqual(database.close_sessions('kernel'), 1)
+        self.assertEqual(database.close_sessions('kernel'), 0)
+        self.assertIs(database.Session(), own_session)
+        self.assertIsNot(kernel_session, own_session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.cache_backend import get_cache_backend
+from tma.core.database import Base
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.model.repository.measurement_repository import MeasurementRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.service.measurement.model.curve import Curve
+from tma.core.service.sample.controller.repository_controllers import specimen_item_controller, \
+    measured_data_controller
+from tma.core.service.sample.controller.repository_controllers.measured_data_controller import \
+    MeasuredDataRepositoryController
+from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
+    SpecialItemRepositoryController
+
+
+class TestCurveChanges(unittest.TestCase):
+    def test_new_curve_is_changed(self):
+        curve = Curve([1, 2], [3, 4])
+        self.assertTrue(curve.has_changes())
+        self.assertIsNone(curve.changed_ranges)
+
+    def test_point_updates_are_merged(self):
+        curve = Curve([1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6])
+        curve.clear_changes()
+        self.assertFalse(curve.has_changes())
+
+        curve.update_point(4, 10)
+        curve.update_point(1, 10)
+        curve.update_point(2, 10)
+        self.assertEqual(curve.changed_ranges, [(1, 3), (4, 5)])
+
+        curve.update_point(3, 10)
+        self.assertEqual(curve.changed_ranges, [(1, 5)])
+
+    def test_replaced_values_change_the_whole_curve(self):
+        curve = Curve([1, 2, 3], [1, 2, 3])
+        curve.clear_changes()
+        curve.update_point(0, 5)
+        curve.delete_point(1)
+        self.assertIsNone(curve.changed_ranges)
+
+
+class TestSaveChanges(unittest.TestCase):
+    columns = ['TEMP', 'BSUSC', 'CSUSC', 'TSUSC']
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+        # Every test database reuses the same ids, so each test starts with an empty cache
+        get_cache_backend.cache_clear()
+        self.addCleanup(get_cache_backend.cache_clear)
+
+        repositories = {
+            specimen_item_controller: dict(
+                specimen_item_repo=SpecimenItemRepository(self.session),
+                measurement_repo=MeasurementRepository(self.session),
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+                curie_point_repo=CuriePointRepository(self.session),
+            ),
+            measured_data_controller: dict(
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+            ),
+        }
+        for module, module_repositories in repositories.items():
+            for name, repository in module_repositories.items():
+                patcher = patch.object(module, name, repository)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        for module in (specimen_item_controller, measured_data_controller):
+            patcher = patch.object(module.settings, 'measured_data_layout', 'column')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        curves = {'increasing': [20.0, 30.0, 40.0], 'decreasing': [40.0, 30.0]}
+        records = [(dict(sample_id=1, filename='file.clw', file_extension='clw', is_empty_source=False),
+                    dict(measurement_type='clw', columns=json.dumps(self.columns)),
+                    [dict(column_name=column, data=json.dumps(curves)) for column in self.columns])]
+        SpecimenItemRepository(self.session).create_specimen_items_many(records, MeasuredData)
+        self.specimen_item = SpecialItemRepositoryController(MagicMock(sample_id=1)).get_specimen_items_list()[0]
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: self.statements.append(statement))
+
+    def _stored_values(self, column):
+        data = self.session.query(MeasuredData).filter(MeasuredData.column_name == column).one().data
+        return json.loads(data)['increasing']
+
+    def test_loaded_specimen_item_has_no_changes(self):
+        MeasuredDataRepositoryController().save_changes(MagicMock(), self.specimen_item)
+        self.assertEqual(self.statements, [])
+
+    def test_only_changed_columns_are_updated(self):
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+
+        MeasuredDataRepositoryController().save_changes(MagicMock(), self.specimen_item)
+
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith('UPDATE measured_data'))
+        self.assertFalse(self.specimen_item.measurement.value.measurement.get_changes())
+        self.assertEqual(self._stored_values('BSUSC'), [20.0, 1.5, 40.0])
+        self.assertEqual(self._stored_values('CSUSC'), [20.0, 30.0, 40.0])
+
+    def test_missing_column_falls_back_to_full_update(self):
+        measurement = self.specimen_item.measurement.value.measurement
+        measurement.add_column_if_not_exist('MSUSC')
+        measurement.heating_curve['MSUSC'].values = [1.0, 2.0, 3.0]
+        sample = MagicMock()
+        sample.get_specimen_item_by_filename.return_value = self.specimen_item
+
+        MeasuredDataRepositoryController().save_changes(sample, self.specimen_item)
+
+        np.testing.assert_array_equal(self._stored_values('MSUSC'), [1.0, 2.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
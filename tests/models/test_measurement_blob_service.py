@@ -0,0 +1,67 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tma.core.model.column_codec import encode_measurement, decode_measurement
+from tma.core.service.services.measurement_blob_service import MeasurementBlobService
+
+
+class TestMeasurementBlobService(unittest.TestCase):
+    def setUp(self):
+        self.mock_repository = MagicMock()
+        self.service = MeasurementBlobService(self.mock_repository)
+        self.measured_data = {'TEMP': {'increasing': np.array([20., 30.])},
+                              'BSUSC': {'increasing': np.array([1., 2.])}}
+
+    def test_get_data_by_measurement_id(self):
+        self.mock_repository.get_blob.return_value = MagicMock(data=encode_measurement(self.measured_data))
+
+        result = self.service.get_data_by_measurement_id(1, columns=['BSUSC'])
+
+        self.mock_repository.get_blob.assert_called_once_with(1)
+        self.assertEqual(list(result), ['BSUSC'])
+        np.testing.assert_array_equal(result['BSUSC']['increasing'], [1., 2.])
+        result['BSUSC']['increasing'][0] = 5.
+
+    def test_get_data_by_measurement_id_without_blob(self):
+        self.mock_repository.get_blob.return_value = None
+
+        self.assertEqual(self.service.get_data_by_measurement_id(1), {})
+
+    def test_get_data_by_specimen_item_ids(self):
+        self.mock_repository.get_blobs_by_specimen_item_ids.return_value = [
+            MagicMock(specimen_item_id=4, data=encode_measurement(self.measured_data)),
+            MagicMock(specimen_item_id=5, data=encode_measurement({'TEMP': {'increasing': np.array([40.])}})),
+        ]
+
+        result = self.service.get_data_by_specimen_item_ids([4, 5])
+
+        self.mock_repository.get_blobs_by_specimen_item_ids.assert_called_once_with([4, 5])
+        self.assertEqual(list(result), [4, 5])
+        np.testing.assert_array_equal(result[5]['TEMP']['increasing'], [40.])
+
+    def test_add_measured_data_by_model(self):
+        self.service.add_measured_data_by_model(1, 2, self.measured_data)
+
+        measurement_id, specimen_item_id, blob = self.mock_repository.create_blob.call_args.args
+        self.assertEqual((measurement_id, specimen_item_id), (1, 2))
+        np.testing.assert_array_equal(decode_measurement(blob)['TEMP']['increasing'], [20., 30.])
+
+    def test_save_measured_data_many(self):
+        self.service.save_measured_data_many([(3, 4, self.measured_data)], {3: ['TEMP', 'BSUSC']})
+
+        self.mock_repository.save_blobs.assert_called_once_with(
+            {3: (4, encode_measurement(self.measured_data))},
+            {3: {'columns': json.dumps(['TEMP', 'BSUSC'])}}
+        )
+
+    def test_remove_measured_data_by_measurement_id(self):
+        self.service.remove_measured_data_by_measurement_id(3)
+
+        self.mock_repository.delete_blob.assert_called_once_with(3)
+
+
+if __name__ == '__main__':
+    unittest.main()
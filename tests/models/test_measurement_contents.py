@@ -0,0 +1,125 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.cache_backend import get_cache_backend
+from tma.core.database import Base
+from tma.core.model.models.measurement_content import MeasurementContent
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.model.repository.measurement_content_repository import MeasurementContentRepository
+from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.model.repository.measurement_repository import MeasurementRepository
+from tma.core.model.repository.sample_repository import SampleRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.service.sample.controller.repository_controllers import specimen_item_controller, \
+    measured_data_controller
+from tma.core.service.sample.controller.repository_controllers.measured_data_controller import \
+    MeasuredDataRepositoryController
+from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
+    SpecialItemRepositoryController
+from tma.core.service.sample.model.specimen_item import SpecimenItem
+
+FILES_PATH = Path(__file__).resolve().parents[1] / 'files'
+
+
+class TestMeasurementContents(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+        # Every test database reuses the same ids, so each test starts with an empty cache
+        get_cache_backend.cache_clear()
+        self.addCleanup(get_cache_backend.cache_clear)
+
+        repositories = {
+            specimen_item_controller: dict(
+                specimen_item_repo=SpecimenItemRepository(self.session),
+                measurement_repo=MeasurementRepository(self.session),
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+                measurement_content_repo=MeasurementContentRepository(self.session),
+                curie_point_repo=CuriePointRepository(self.session),
+            ),
+            measured_data_controller: dict(
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+                measurement_repo=MeasurementRepository(self.session),
+            ),
+        }
+        for module, module_repositories in repositories.items():
+            for name, repository in module_repositories.items():
+                patcher = patch.object(module, name, repository)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        for module in (specimen_item_controller, measured_data_controller):
+            patcher = patch.object(module.settings, 'measured_data_layout', 'column')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.sample_repository = SampleRepository(self.session)
+        self.sample_ids = [
+            self.sample_repository.create_sample(user_id=user_id, x_column='TEMP', y_column='CSUSC',
+                                                 selected_file_index=0, name='sample').sample_id
+            for user_id in (1, 2)]
+        self.content = (FILES_PATH / 'VF03_L1.clw').read_bytes()
+        for sample_id in self.sample_ids:
+            self._controller(sample_id).create_specimen_items([self._upload()])
+
+    def _upload(self):
+        return SpecimenItem.load_from_file({'name': 'VF03_L1.clw', 'data': self.content}, uploaded=True)
+
+    @staticmethod
+    def _controller(sample_id):
+        return SpecialItemRepositoryController(MagicMock(sample_id=sample_id))
+
+    def _contents(self):
+        self.session.expire_all()
+        return self.session.query(MeasurementContent).all()
+
+    def test_uploaded_file_is_stored_once(self):
+        contents = self._contents()
+
+        self.assertEqual(len(contents), 1)
+        self.assertEqual(contents[0].ref_count, 2)
+        self.assertEqual(self.session.query(MeasuredData).count(), 0)
+
+        uploaded = self._upload().measurement.value.measurement
+        for sample_id in self.sample_ids:
+            measurement = self._controller(sample_id).get_specimen_items_list()[0].measurement.value.measurement
+            self.assertEqual(measurement.columns, uploaded.columns)
+            np.testing.assert_array_equal(measurement.heating_curve['CSUSC'].values,
+                                          uploaded.heating_curve['CSUSC'].values)
+
+    def test_edits_are_stored_over_the_shared_file(self):
+        specimen_item = self._controller(self.sample_ids[0]).get_specimen_items_list(columns=['CSUSC'])[0]
+        original = list(specimen_item.measurement.value.measurement.heating_curve['CSUSC'].values)
+        specimen_item.update_point({'CSUSC': 1.5}, 0, 0)
+        sample = MagicMock(sample_id=self.sample_ids[0])
+        sample.get_specimen_item_by_filename.return_value = specimen_item
+
+        MeasuredDataRepositoryController().save_changes(sample, specimen_item)
+        get_cache_backend.cache_clear()
+
+        edited, other = [self._controller(sample_id).get_specimen_items_list(columns=['CSUSC'])[0]
+                         for sample_id in self.sample_ids]
+        self.assertEqual(edited.measurement.value.measurement.heating_curve['CSUSC'].values[0], 1.5)
+        np.testing.assert_array_equal(other.measurement.value.measurement.heating_curve['CSUSC'].values, original)
+        self.assertEqual(self._contents()[0].ref_count, 2)
+
+    def test_file_is_deleted_with_its_last_reference(self):
+        self.sample_repository.delete_sample_tree(self.sample_ids[0])
+        self.assertEqual(self._contents()[0].ref_count, 1)
+
+        self.sample_repository.delete_sample_tree(self.sample_ids[1])
+        self.assertEqual(self._contents(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
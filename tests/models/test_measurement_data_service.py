@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 import json
 import numpy as np
 
+from tma.core.model.column_codec import encode_columns
 from tma.core.service.services.measured_data_service import MeasuredDataService
 
 
@@ -80,3 +81,49 @@ class TestMeasuredDataService(unittest.TestCase):
         self.service.remove_measured_data_by_measurement_id(measurement_id)
 
         self.mock_repository.delete_measured_data_by_measurement_id.assert_called_once_with(measurement_id)
+
+    def test_save_measured_data_many(self):
+        updated_data = {1: {'increasing': np.array([1, 2])}}
+        new_data = [(3, 4, 'BSUSC', {'increasing': np.array([5.5])})]
+        measurement_columns = {3: ['TEMP', 'BSUSC']}
+
+        self.service.save_measured_data_many(updated_data, new_data, measurement_columns)
+
+        self.mock_repository.save_measured_data_many.assert_called_once_with(
+            {1: {'data': json.dumps({'increasing': [1, 2]})}},
+            [dict(measurement_id=3, specimen_item_id=4, column_name='BSUSC',
+                  data=json.dumps({'increasing': [5.5]}))],
+            {3: {'columns': json.dumps(['TEMP', 'BSUSC'])}}
+        )
+
+
+class TestBinaryMeasuredDataService(unittest.TestCase):
+    def setUp(self):
+        self.mock_repository = MagicMock()
+        self.service = MeasuredDataService(self.mock_repository, storage_format='binary')
+
+    def test_add_measured_data_by_model(self):
+        measured_data = {'test_column': {'key': np.array([1, 2, 3])}}
+
+        self.service.add_measured_data_by_model(1, 2, measured_data)
+
+        self.mock_repository.create_measured_data.assert_called_once_with(
+            1, 2, 'test_column', None, data_blob=encode_columns({'key': np.array([1, 2, 3])})
+        )
+
+    def test_get_data_by_measurement_id_reads_both_formats(self):
+        self.mock_repository.get_measured_data.return_value = [
+            MagicMock(data=None, data_blob=encode_columns({'key': np.array([1.5])}), column_name='binary_column'),
+            MagicMock(data=json.dumps({'key': [1, 2]}), data_blob=None, column_name='json_column'),
+        ]
+
+        result = self.service.get_data_by_measurement_id(1)
+
+        np.testing.assert_array_equal(result['binary_column']['key'], [1.5])
+        np.testing.assert_array_equal(result['json_column']['key'], [1, 2])
+
+    def test_to_records(self):
+        records = self.service.to_records({'TEMP': {'increasing': np.array([1.5])}})
+
+        self.assertEqual(records, [dict(column_name='TEMP', data=None,
+                                        data_blob=encode_columns({'increasing': np.array([1.5])}))])
@@ -21,6 +21,19 @@ class TestMeasurementService(unittest.TestCase):
         self.mock_repository.get_measurement_by_id.assert_called_once_with(measurement_id)
         self.assertEqual(result, mock_measurement)
 
+    def test_get_measurements_by_specimen_item_ids(self):
+        mock_measurements = [MagicMock(specimen_item_id=1), MagicMock(specimen_item_id=2)]
+        self.mock_repository.get_measurements_by_specimen_item_ids.return_value = mock_measurements
+
+        result = self.service.get_measurements_by_specimen_item_ids([1, 2])
+
+        self.mock_repository.get_measurements_by_specimen_item_ids.assert_called_once_with([1, 2])
+        self.assertEqual(result, {1: mock_measurements[0], 2: mock_measurements[1]})
+
+    def test_get_columns(self):
+        self.assertEqual(MeasurementService.get_columns(MagicMock(columns=json.dumps(['TEMP', 'BSUSC']))),
+                         ['TEMP', 'BSUSC'])
+
     def test_get_measurement_by_specimen_item_id(self):
         specimen_item_id = 1
         mock_measurement = MagicMock()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from tma.core.database import Base
+from tma.core.model.migrations.upgrade import upgrade_database, downgrade_database, get_current_revision
+from tma.core.model.models import curie_point, measurement, measurement_blob, measurement_content, \
+    measurement_data, sample, specimen_item, user  # noqa: F401
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.engine = create_engine(f'sqlite:///{Path(directory.name) / "tma.db"}')
+        self.addCleanup(self.engine.dispose)
+
+    def test_upgrade_creates_the_schema_of_the_models(self):
+        upgrade_database(self.engine)
+
+        self.assertEqual(get_current_revision(self.engine), '0004')
+        with self.engine.connect() as connection:
+            self.assertEqual(compare_metadata(MigrationContext.configure(connection), Base.metadata), [])
+            inspector = inspect(connection)
+            self.assertIn('ix_measured_data_specimen_item_id',
+                          {index['name'] for index in inspector.get_indexes('measured_data')})
+            self.assertEqual({key['referred_table'] for key in inspector.get_foreign_keys('measured_data')},
+                             {'measurements', 'specimenitems'})
+
+    def test_database_created_before_the_migrations_is_upgraded(self):
+        upgrade_database(self.engine, '0001')
+        with self.engine.begin() as connection:
+            connection.execute(text('DROP TABLE alembic_version'))
+            connection.execute(text("INSERT INTO users (user_id, session_id) VALUES (1, 'session')"))
+            connection.execute(text("INSERT INTO samples (sample_id, user_id, x_column, y_column, "
+                                    "selected_file_index) VALUES (1, 1, 'TEMP', 'CSUSC', 0)"))
+
+        upgrade_database(self.engine)
+
+        self.assertEqual(get_current_revision(self.engine), '0004')
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT user_id FROM samples')).scalars().all(), [1])
+            columns = {column['name'] for column in inspect(connection).get_columns('measured_data')}
+        self.assertIn('data_blob', columns)
+
+    def test_upgrade_is_idempotent_and_reversible(self):
+        upgrade_database(self.engine)
+        upgrade_database(self.engine)
+        downgrade_database(self.engine, 'base')
+
+        with self.engine.connect() as connection:
+            self.assertEqual(inspect(connection).get_table_names(), ['alembic_version'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.cache_backend import get_cache_backend
+from tma.core.database import Base
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.models.user import User
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.model.repository.measurement_repository import MeasurementRepository
+from tma.core.model.repository.sample_repository import SampleRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.model.repository.user_repository import UserRepository
+from tma.core.service.measurement.model.curve import Curve
+from tma.core.service.sample.controller.repository_controllers import sample_controller, specimen_item_controller
+from tma.core.service.sample.controller.repository_controllers.sample_controller import SampleRepositoryController
+from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
+    SpecialItemRepositoryController
+from tma.core.service.sample.sample_cache import SampleCache, estimate_sample_size
+
+
+def make_sample(points):
+    curve = Curve([0.0] * points, [1.0] * points)
+    measurement = SimpleNamespace(heating_curve={'BSUSC': curve}, cooling_curve={})
+    specimen_item = SimpleNamespace(measurement=SimpleNamespace(value=SimpleNamespace(measurement=measurement)))
+    return SimpleNamespace(specimen_items=[specimen_item])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSampleCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SampleCache(max_bytes=10_000, ttl=60, clock=self.clock)
+
+    def test_get_returns_the_cached_sample(self):
+        sample = make_sample(10)
+        self.cache.put_sample(('session', 1), SimpleNamespace(sample_id=1), sample)
+
+        self.assertIs(self.cache.get(('session', 1)).sample, sample)
+        self.assertIsNone(self.cache.get(('session', 2)))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_estimate_sample_size(self):
+        self.assertEqual(estimate_sample_size(make_sample(10)), 160)
+
+    def test_idle_entries_expire(self):
+        self.cache.put_sample(('session', 1), SimpleNamespace(sample_id=1), make_sample(10))
+        self.cache.put_sample(('session', 2), SimpleNamespace(sample_id=2), make_sample(10))
+        self.clock.now = 50
+        self.cache.get(('session', 1))
+        self.clock.now = 100
+
+        self.assertIsNotNone(self.cache.get(('session', 1)))
+        self.assertNotIn(('session', 2), self.cache)
+        self.assertEqual(self.cache.size_bytes, 160)
+
+    def test_least_recently_used_samples_are_evicted_over_budget(self):
+        for index in range(3):
+            self.cache.put_sample(('session', index), SimpleNamespace(sample_id=index), make_sample(200))
+        self.cache.get(('session', 0))
+        self.cache.put_sample(('session', 3), SimpleNamespace(sample_id=3), make_sample(200))
+
+        self.assertEqual(set(key[1] for key in self.cache._entries), {0, 2, 3})
+        self.assertLessEqual(self.cache.size_bytes, self.cache.max_bytes)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_sample_over_budget_is_not_cached(self):
+        self.cache.put_sample(('session', 1), SimpleNamespace(sample_id=1), make_sample(1000))
+
+        self.assertIsNone(self.cache.get(('session', 1)).sample)
+        self.assertEqual(self.cache.size_bytes, 0)
+
+    def test_invalidate_keeps_the_written_sample(self):
+        written, other = make_sample(10), make_sample(10)
+        self.cache.put_sample(('session', 1), SimpleNamespace(sample_id=1), written)
+        self.cache.put_sample(('session', 2), SimpleNamespace(sample_id=1), other)
+        self.cache.put_sample(('other', 1), SimpleNamespace(sample_id=2), make_sample(10))
+
+        self.assertEqual(self.cache.invalidate(1, keep=written), 1)
+        self.assertIn(('session', 1), self.cache)
+        self.assertIn(('other', 1), self.cache)
+        self.assertEqual(self.cache.invalidate(1), 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_invalidate_context(self):
+        self.cache.put_sample(('session', 1), SimpleNamespace(sample_id=1), make_sample(10))
+        self.cache.put_sample_model(('session', 2), SimpleNamespace(sample_id=1))
+
+        self.assertEqual(self.cache.invalidate_context(1), 1)
+        self.assertEqual(list(self.cache._entries), [('session', 2)])
+        self.assertEqual(self.cache.size_bytes, 0)
+
+
+class TestSampleRepositoryControllerCache(unittest.TestCase):
+    session_id = 'session'
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+        # Every test database reuses the same ids, so each test starts with an empty cache
+        get_cache_backend.cache_clear()
+        self.addCleanup(get_cache_backend.cache_clear)
+        UserRepository(self.session).add_user(User(session_id=self.session_id))
+
+        self.cache = SampleCache()
+        patchers = [
+            patch.object(sample_controller, 'user_repo', UserRepository(self.session)),
+            patch.object(sample_controller, 'sample_repo', SampleRepository(self.session)),
+            patch.object(sample_controller, 'specimen_item_repo', SpecimenItemRepository(self.session)),
+            patch.object(sample_controller, 'sample_cache', self.cache),
+            patch.object(specimen_item_controller, 'sample_cache', self.cache),
+            patch.object(specimen_item_controller.settings, 'measured_data_layout', 'column'),
+        ]
+        repositories = dict(
+            specimen_item_repo=SpecimenItemRepository(self.session),
+            measurement_repo=MeasurementRepository(self.session),
+            measured_data_repo=MeasuredDataRepository(self.session),
+            measurement_blob_repo=MeasurementBlobRepository(self.session),
+            curie_point_repo=CuriePointRepository(self.session),
+        )
+        patchers += [patch.object(specimen_item_controller, name, repository)
+                     for name, repository in repositories.items()]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: self.statements.append(statement))
+
+    def _create_specimen_item(self, sample_id, filename):
+        measured_data = {'TEMP': {'increasing': [20.0, 30.0], 'decreasing': [30.0, 20.0]},
+                         'BSUSC': {'increasing': [1.0, 2.0], 'decreasing': [2.0, 1.0]}}
+        records = [(
+            dict(sample_id=sample_id, filename=filename, file_extension='clw', is_empty_source=False),
+            dict(measurement_type='clw', columns=json.dumps(list(measured_data))),
+            [dict(column_name=column, data=json.dumps(data)) for column, data in measured_data.items()],
+        )]
+        SpecimenItemRepository(self.session).create_specimen_items_many(records, MeasuredData)
+
+    def test_page_render_reads_the_database_once(self):
+        sample = SampleRepositoryController(self.session_id).get_sample()
+        self.statements.clear()
+
+        cached_sample = SampleRepositoryController(self.session_id).get_sample()
+
+        self.assertIs(cached_sample, sample)
+        self.assertEqual(self.statements, [])
+
+    def test_creating_specimen_items_invalidates_the_sample(self):
+        controller = SampleRepositoryController(self.session_id)
+        sample = controller.get_sample()
+        with patch.object(specimen_item_controller.SpecimenItemService, 'add_specimen_items_by_model_many',
+                          side_effect=lambda sample_id, *args: self._create_specimen_item(sample_id, 'file.clw')):
+            SpecialItemRepositoryController(controller.sample_model).create_specimen_items([])
+
+        reloaded = SampleRepositoryController(self.session_id).get_sample()
+
+        self.assertIsNot(reloaded, sample)
+        self.assertEqual([item.filename.value for item in reloaded.specimen_items], ['file.clw'])
+
+    def test_update_sample_keeps_the_written_sample(self):
+        controller = SampleRepositoryController(self.session_id)
+        sample = controller.get_sample()
+        sample.selected_file_index = 3
+        controller.update_sample(selected_file_index=3)
+        self.statements.clear()
+
+        other_controller = SampleRepositoryController(self.session_id)
+
+        self.assertEqual(other_controller.sample_model.selected_file_index, 3)
+        self.assertIs(other_controller.get_sample(), sample)
+        self.assertEqual(self.statements, [])
+
+    def test_delete_sample_drops_the_cached_sample(self):
+        controller = SampleRepositoryController(self.session_id)
+        controller.get_sample()
+        controller.delete_sample()
+        self.statements.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNotNone(SampleRepositoryController(self.session_id).sample_model.sample_id)
+        self.assertTrue(any(statement.startswith('INSERT INTO samples') for statement in self.statements))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.database import Base
+from tma.core.model.models.curie_point import CuriePoint
+from tma.core.model.models.measurement import Measurement
+from tma.core.model.models.measurement_blob import MeasurementBlob
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.models.sample import Sample
+from tma.core.model.models.specimen_item import SpecimenItem
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.sample_repository import SampleRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+
+
+class TestDeleteSampleTree(unittest.TestCase):
+    columns = ['TEMP', 'BSUSC']
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+        self.repository = SampleRepository(self.session)
+
+        self.sample_ids = [
+            self.repository.create_sample(user_id=user_id, x_column='TEMP', y_column='BSUSC',
+                                          selected_file_index=0, name='sample').sample_id
+            for user_id in (1, 2)]
+        for sample_id in self.sample_ids:
+            self._create_specimen_items(sample_id, count=3)
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: self.statements.append(statement))
+
+    def _create_specimen_items(self, sample_id, count):
+        curves = {'increasing': [20.0, 30.0], 'decreasing': [30.0, 20.0]}
+        records = [(dict(sample_id=sample_id, filename=f'file_{index}.clw', file_extension='clw',
+                         is_empty_source=False),
+                    dict(measurement_type='clw', columns=json.dumps(self.columns)),
+                    [dict(column_name=column, data=json.dumps(curves)) for column in self.columns])
+                   for index in range(count)]
+        created = SpecimenItemRepository(self.session).create_specimen_items_many(records, MeasuredData)
+        for specimen_item, measurement in created:
+            CuriePointRepository(self.session).add_curie_point(specimen_item.specimen_item_id, 'BSUSC', 0, 580.0, 1.0)
+            self.session.add(MeasurementBlob(measurement_id=measurement.measurement_id,
+                                             specimen_item_id=specimen_item.specimen_item_id, data=b''))
+        self.session.commit()
+
+    def _count(self, model, sample_id):
+        specimen_item_ids = self.session.query(SpecimenItem.specimen_item_id).filter(
+            SpecimenItem.sample_id == sample_id)
+        if model is SpecimenItem:
+            return specimen_item_ids.count()
+        if model is Sample:
+            return self.session.query(Sample).filter(Sample.sample_id == sample_id).count()
+        return self.session.query(model).filter(model.specimen_item_id.in_(specimen_item_ids.scalar_subquery())).count()
+
+    def test_sample_tree_is_deleted_with_one_statement_per_table(self):
+        deleted_ids = self.repository.delete_sample_tree(self.sample_ids[0])
+
+        self.assertEqual(len(deleted_ids), 3)
+        # One DELETE per table, and one for the uploaded files left without reference
+        self.assertEqual(len([statement for statement in self.statements if statement.startswith('DELETE')]), 7)
+        self.assertEqual(len([statement for statement in self.statements if statement.startswith('SELECT')]), 1)
+        self.assertEqual(self.session.query(SpecimenItem).filter(SpecimenItem.specimen_item_id.in_(deleted_ids))
+                         .count(), 0)
+        for model in (CuriePoint, MeasuredData, MeasurementBlob, Measurement):
+            self.assertEqual(self.session.query(model).filter(model.specimen_item_id.in_(deleted_ids)).count(), 0)
+        self.assertIsNone(self.repository.get_sample_by_id(self.sample_ids[0]))
+
+    def test_other_samples_are_kept(self):
+        self.repository.delete_sample_tree(self.sample_ids[0])
+
+        for model, count in ((SpecimenItem, 3), (Measurement, 3), (MeasuredData, 6), (MeasurementBlob, 3),
+                             (CuriePoint, 3), (Sample, 1)):
+            self.assertEqual(self._count(model, self.sample_ids[1]), count, model.__name__)
+
+    def test_empty_sample_is_deleted(self):
+        sample_id = self.repository.create_sample(user_id=3, x_column='TEMP', y_column='BSUSC',
+                                                  selected_file_index=0, name='empty').sample_id
+
+        self.assertEqual(self.repository.delete_sample_tree(sample_id), [])
+        self.assertIsNone(self.repository.get_sample_by_id(sample_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,3 +36,9 @@ def test_remove_sample(sample_service, sample_repository):
     sample_repository.delete_sample.return_value = True
     assert sample_service.remove_sample(1) == True
     sample_repository.delete_sample.assert_called_once_with(1)
+
+
+def test_remove_sample_tree(sample_service, sample_repository):
+    sample_repository.delete_sample_tree.return_value = [1, 2]
+    assert sample_service.remove_sample_tree(1) == [1, 2]
+    sample_repository.delete_sample_tree.assert_called_once_with(1)
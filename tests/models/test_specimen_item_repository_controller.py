@@ -0,0 +1,152 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.cache_backend import get_cache_backend
+from tma.core.database import Base
+from tma.core.model.models.curie_point import CuriePoint
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.model.repository.measurement_repository import MeasurementRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.service.sample.controller.repository_controllers import specimen_item_controller
+from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
+    SpecialItemRepositoryController
+
+
+class TestSpecimenItemsHydration(unittest.TestCase):
+    sample_id = 1
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.specimen_item_repo = SpecimenItemRepository(self.session)
+        # Every test database reuses the same ids, so each test starts with an empty cache
+        get_cache_backend.cache_clear()
+        self.addCleanup(get_cache_backend.cache_clear)
+
+        repositories = dict(
+            specimen_item_repo=self.specimen_item_repo,
+            measurement_repo=MeasurementRepository(self.session),
+            measured_data_repo=MeasuredDataRepository(self.session),
+            measurement_blob_repo=MeasurementBlobRepository(self.session),
+            curie_point_repo=CuriePointRepository(self.session),
+        )
+        patchers = [patch.object(specimen_item_controller, name, repository) for name, repository in
+                    repositories.items()]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.session.close)
+
+        self.controller = SpecialItemRepositoryController(MagicMock(sample_id=self.sample_id))
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: self.statements.append(statement))
+
+    def _create_specimen_items(self, count, prefix='file', columns=('TEMP', 'BSUSC')):
+        measured_data = {'TEMP': {'increasing': [20.0, 30.0], 'decreasing': [30.0, 20.0]},
+                         'BSUSC': {'increasing': [1.0, 2.0], 'decreasing': [2.0, 1.0]},
+                         'CSUSC': {'increasing': [3.0, 4.0], 'decreasing': [4.0, 3.0]}}
+        measured_data = {column: measured_data[column] for column in columns}
+        records = [
+            (dict(sample_id=self.sample_id, filename=f'{prefix}_{index}.clw', file_extension='clw',
+                  is_empty_source=False),
+             dict(measurement_type='clw', columns=json.dumps(list(measured_data))),
+             [dict(column_name=column, data=json.dumps(data)) for column, data in measured_data.items()])
+            for index in range(count)
+        ]
+        created = self.specimen_item_repo.create_specimen_items_many(records, MeasuredData)
+        self.session.add(CuriePoint(specimen_item_id=created[0][0].specimen_item_id, column_name='BSUSC',
+                                    temperature_value=25.0, magnetization_value=1.5))
+        self.session.commit()
+        self.session.expire_all()
+        self.statements.clear()
+
+    def _load(self, columns=None):
+        with patch.object(specimen_item_controller.settings, 'measured_data_layout', 'column'):
+            return self.controller.get_specimen_items_list(columns)
+
+    def _measured_data_queries(self):
+        return [statement for statement in self.statements if 'FROM measured_data' in statement]
+
+    def test_query_count_does_not_depend_on_specimen_items(self):
+        self._create_specimen_items(2)
+        self._load()
+        queries_for_two = len(self.statements)
+
+        self._create_specimen_items(10, prefix='other')
+        result = self._load()
+
+        self.assertEqual(queries_for_two, 4)
+        self.assertEqual(len(self.statements), 4)
+        self.assertEqual(len(result), 12)
+
+    def test_specimen_items_are_assembled(self):
+        self._create_specimen_items(3)
+
+        result = self._load()
+
+        self.assertEqual([item.filename.value for item in result], ['file_0.clw', 'file_1.clw', 'file_2.clw'])
+        measurement = result[1].measurement.value
+        self.assertEqual(measurement.get_measurement_columns(), ['TEMP', 'BSUSC'])
+        np.testing.assert_array_equal(measurement.measurement.heating_curve['BSUSC'].values, [1.0, 2.0])
+        self.assertEqual(len(result[0].curie_points), 1)
+        self.assertEqual(len(result[1].curie_points), 0)
+
+    def test_cached_measured_data_is_not_read_again(self):
+        self._create_specimen_items(3)
+        self._load()
+        self.statements.clear()
+
+        result = self._load()
+
+        self.assertEqual(len(self.statements), 3)
+        self.assertFalse(any('measured_data' in statement for statement in self.statements))
+        np.testing.assert_array_equal(result[1].measurement.value.measurement.heating_curve['BSUSC'].values,
+                                      [1.0, 2.0])
+
+    def test_only_the_shown_columns_are_read(self):
+        self._create_specimen_items(3, columns=('TEMP', 'BSUSC', 'CSUSC'))
+
+        result = self._load(columns=['BSUSC'])
+
+        self.assertEqual(len(self._measured_data_queries()), 1)
+        measurement = result[1].measurement.value.measurement
+        self.assertEqual(measurement.columns, ['TEMP', 'BSUSC', 'CSUSC'])
+        self.assertTrue(measurement.heating_curve['BSUSC'].is_loaded)
+        self.assertFalse(measurement.heating_curve['CSUSC'].is_loaded)
+        np.testing.assert_array_equal(measurement.cooling_curve['BSUSC'].values, [2.0, 1.0])
+
+    def test_other_columns_are_read_once_on_first_access(self):
+        self._create_specimen_items(3, columns=('TEMP', 'BSUSC', 'CSUSC'))
+        result = self._load(columns=['BSUSC'])
+        self.statements.clear()
+
+        for item in result:
+            measurement = item.measurement.value.measurement
+            np.testing.assert_array_equal(measurement.heating_curve['CSUSC'].values, [3.0, 4.0])
+            np.testing.assert_array_equal(measurement.cooling_curve['CSUSC'].temperature, [30.0, 20.0])
+
+        self.assertEqual(len(self._measured_data_queries()), 1)
+        self.assertFalse(result[0].measurement.value.measurement.get_changes())
+
+    def test_lazy_columns_are_written_whole(self):
+        self._create_specimen_items(1, columns=('TEMP', 'BSUSC', 'CSUSC'))
+        measurement_manager = self._load(columns=[])[0].measurement.value
+
+        measured_data = measurement_manager.get_measured_data()
+
+        self.assertEqual(list(measured_data), ['TEMP', 'BSUSC', 'CSUSC'])
+        np.testing.assert_array_equal(measured_data['CSUSC']['decreasing'], [4.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,3 +38,50 @@ def test_remove_specimen_item(specimen_item_service, specimen_item_repository):
     specimen_item_repository.delete_specimen_item.return_value = True
     assert specimen_item_service.remove_specimen_item(1) == True
     specimen_item_repository.delete_specimen_item.assert_called_once_with(1)
+
+
+def test_add_specimen_items_by_model_many(specimen_item_service, specimen_item_repository, mocker):
+    measured_data_service = mocker.Mock()
+    measured_data_service.to_records.return_value = [{'column_name': 'TEMP', 'data': '{}'}]
+    specimen_item = mocker.Mock(is_empty_source_file=False)
+    specimen_item.filename.value = 'file.clw'
+    specimen_item.file.file_extension.value = 'clw'
+    specimen_item.measurement.value.measurement.measurement_type = 'clw'
+    specimen_item.measurement.value.measurement.columns = ['TEMP']
+    specimen_item.measurement.value.measurement.content_hash = None
+    specimen_item_repository.create_specimen_items_many.return_value = ["new_specimen_item"]
+
+    assert specimen_item_service.add_specimen_items_by_model_many(1, [specimen_item], measured_data_service) == [
+        "new_specimen_item"]
+    specimen_item_repository.create_specimen_items_many.assert_called_once_with(
+        [(dict(sample_id=1, filename='file.clw', file_extension='clw', is_empty_source=False),
+          dict(measurement_type='clw', columns='["TEMP"]'),
+          [{'column_name': 'TEMP', 'data': '{}'}])],
+        measured_data_service.record_model,
+        {}
+    )
+
+
+def test_uploaded_file_is_stored_once(specimen_item_service, specimen_item_repository, mocker):
+    measured_data_service = mocker.Mock()
+    specimen_items = []
+    for filename in ('empty_furnace.clw', 'copy.clw'):
+        specimen_item = mocker.Mock(is_empty_source_file=True)
+        specimen_item.filename.value = filename
+        specimen_item.file.file_extension.value = 'clw'
+        measurement = specimen_item.measurement.value.measurement
+        measurement.measurement_type = 'clw'
+        measurement.columns = ['TEMP']
+        measurement.content_hash = 'a' * 64
+        measurement.get_changes.return_value = {}
+        specimen_item.measurement.value.get_measured_data.return_value = {'TEMP': {'increasing': [20.0, 30.0]}}
+        specimen_items.append(specimen_item)
+
+    specimen_item_service.add_specimen_items_by_model_many(1, specimen_items, measured_data_service)
+
+    records, _, contents = specimen_item_repository.create_specimen_items_many.call_args.args
+    assert [record[1]['content_hash'] for record in records] == ['a' * 64, 'a' * 64]
+    assert [record[2] for record in records] == [[], []]
+    assert list(contents) == ['a' * 64]
+    assert contents['a' * 64][1] == 2
+    measured_data_service.to_records.assert_not_called()
@@ -0,0 +1,89 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from tma.core import database
+from tma.core.database import create_database_engine, get_database_url
+from tma.core.model.migrations.upgrade import upgrade_database
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.models.user import User
+from tma.core.model.repository.sample_repository import SampleRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.model.repository.user_repository import UserRepository
+
+
+class TestDatabaseUrl(unittest.TestCase):
+    def test_url_follows_the_settings(self):
+        with patch.multiple(database.settings, database_backend='sqlite', sqlite_path='data/tma.db'):
+            self.assertEqual(get_database_url(), 'sqlite:///data/tma.db')
+        with patch.multiple(database.settings, database_backend='sqlite', sqlite_path=':memory:'):
+            self.assertEqual(get_database_url(), 'sqlite://')
+        with patch.multiple(database.settings, database_backend='postgres'):
+            self.assertEqual(get_database_url(), database.settings.pg_dsn)
+
+
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.engine = create_database_engine(f'sqlite:///{Path(directory.name) / "tma.db"}')
+        self.addCleanup(self.engine.dispose)
+        upgrade_database(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+
+    def _pragma(self, name):
+        with self.engine.connect() as connection:
+            return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+    def test_database_file_is_tuned(self):
+        self.assertEqual(self._pragma('journal_mode'), 'wal')
+        self.assertEqual(self._pragma('synchronous'), 1)
+        self.assertEqual(self._pragma('foreign_keys'), 1)
+
+    def test_repositories_store_and_cascade(self):
+        user = User(session_id='session')
+        UserRepository(self.session).add_user(user)
+        sample = SampleRepository(self.session).create_sample(user_id=user.user_id, x_column='TEMP',
+                                                              y_column='CSUSC', selected_file_index=0, name='sample')
+        records = [(dict(sample_id=sample.sample_id, filename='file.clw', file_extension='clw', is_empty_source=False),
+                    dict(measurement_type='clw', columns=json.dumps(['TEMP'])),
+                    [dict(column_name='TEMP', data=json.dumps({'increasing': [20.0, 30.0]}))])]
+        SpecimenItemRepository(self.session).create_specimen_items_many(records, MeasuredData)
+        self.assertEqual(self.session.query(MeasuredData).count(), 1)
+
+        self.session.delete(user)
+        self.session.commit()
+
+        self.assertIsNone(SampleRepository(self.session).get_sample_by_user_id(user.user_id))
+        self.assertEqual(self.session.query(MeasuredData).count(), 0)
+
+
+class TestSqliteMemoryBackend(unittest.TestCase):
+    def test_database_is_shared_by_the_threads(self):
+        engine = create_database_engine('sqlite://')
+        self.addCleanup(engine.dispose)
+        upgrade_database(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as session:
+            UserRepository(session).add_user(User(session_id='session'))
+
+        found = []
+
+        def read():
+            with session_factory() as thread_session:
+                found.append(UserRepository(thread_session).get_user_by_session_id('session') is not None)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        self.assertEqual(found, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
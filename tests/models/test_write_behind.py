@@ -0,0 +1,198 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tma.core.cache_backend import get_cache_backend
+from tma.core.database import Base
+from tma.core.model.models.curie_point import CuriePoint
+from tma.core.model.models.measurement_data import MeasuredData
+from tma.core.model.repository.curie_point_repository import CuriePointRepository
+from tma.core.model.repository.measurement_blob_repository import MeasurementBlobRepository
+from tma.core.model.repository.measurement_data_repository import MeasuredDataRepository
+from tma.core.model.repository.measurement_repository import MeasurementRepository
+from tma.core.model.repository.specimen_item_repository import SpecimenItemRepository
+from tma.core.service.exceptions.write_behind_error import WriteBehindError
+from tma.core.service.sample import write_behind
+from tma.core.service.sample.controller.repository_controllers import specimen_item_controller
+from tma.core.service.sample.controller.repository_controllers.specimen_item_controller import \
+    SpecialItemRepositoryController
+from tma.core.service.sample.write_behind import WriteBehindQueue
+from tma.core.service.services.measured_data_service import MeasuredDataService
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    columns = ['TEMP', 'BSUSC', 'CSUSC', 'TSUSC']
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.session.close)
+        # Every test database reuses the same ids, so each test starts with an empty cache
+        get_cache_backend.cache_clear()
+        self.addCleanup(get_cache_backend.cache_clear)
+
+        repositories = {
+            specimen_item_controller: dict(
+                specimen_item_repo=SpecimenItemRepository(self.session),
+                measurement_repo=MeasurementRepository(self.session),
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+                curie_point_repo=CuriePointRepository(self.session),
+            ),
+            write_behind: dict(
+                measured_data_repo=MeasuredDataRepository(self.session),
+                measurement_blob_repo=MeasurementBlobRepository(self.session),
+                curie_point_repo=CuriePointRepository(self.session),
+            ),
+        }
+        for module, module_repositories in repositories.items():
+            for name, repository in module_repositories.items():
+                patcher = patch.object(module, name, repository)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        for module in (specimen_item_controller, write_behind):
+            patcher = patch.object(module.settings, 'measured_data_layout', 'column')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        curves = {'increasing': [20.0, 30.0, 40.0], 'decreasing': [40.0, 30.0]}
+        records = [(dict(sample_id=1, filename='file.clw', file_extension='clw', is_empty_source=False),
+                    dict(measurement_type='clw', columns=json.dumps(self.columns)),
+                    [dict(column_name=column, data=json.dumps(curves)) for column in self.columns])]
+        SpecimenItemRepository(self.session).create_specimen_items_many(records, MeasuredData)
+        self.specimen_item = SpecialItemRepositoryController(MagicMock(sample_id=1)).get_specimen_items_list()[0]
+        self.sample = MagicMock(sample_id=1)
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: self.statements.append(statement))
+
+    def _queue(self, **kwargs) -> WriteBehindQueue:
+        queue = WriteBehindQueue(**{'interval': 60, **kwargs})
+        self.addCleanup(queue.close)
+        return queue
+
+    def _stored_values(self, column):
+        self.session.expire_all()
+        data = self.session.query(MeasuredData).filter(MeasuredData.column_name == column).one().data
+        return json.loads(data)['increasing']
+
+    def test_edits_are_coalesced_per_column(self):
+        queue = self._queue()
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+        self.specimen_item.update_point({'BSUSC': 2.5}, 2, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+        self.specimen_item.update_point({'CSUSC': 0.5}, 0, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+
+        self.assertEqual(self.statements, [])
+        self.assertEqual(len(queue), 1)
+        self.assertFalse(self.specimen_item.measurement.value.measurement.get_changes())
+
+        self.assertEqual(queue.flush(), 1)
+        updates = [statement for statement in self.statements if statement.startswith('UPDATE measured_data')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(self._stored_values('BSUSC'), [20.0, 1.5, 2.5])
+        self.assertEqual(self._stored_values('CSUSC'), [0.5, 30.0, 40.0])
+        self.assertEqual(queue.stats(), {'pending': 0, 'edits': 3, 'writes': 1, 'failures': 0})
+
+    def test_no_interval_writes_before_returning(self):
+        queue = self._queue(interval=0)
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(self._stored_values('BSUSC'), [20.0, 1.5, 40.0])
+
+    def test_no_interval_records_a_failed_write(self):
+        queue = self._queue(interval=0)
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+
+        with patch.object(MeasuredDataService, 'update_columns_many', side_effect=RuntimeError('database is down')):
+            queue.enqueue_measured_data(self.sample, self.specimen_item)
+
+        self.assertEqual(len(queue), 1)
+        self.assertIn('database is down', queue.pop_error(1).reason)
+
+    def test_failed_write_is_retried_under_newer_edits(self):
+        queue = self._queue()
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+
+        with patch.object(MeasuredDataService, 'update_columns_many', side_effect=RuntimeError('database is down')):
+            self.assertEqual(queue.flush(), 0)
+        error = queue.pop_error(1)
+        self.assertIsInstance(error, WriteBehindError)
+        self.assertIn('database is down', error.reason)
+        self.assertIsNone(queue.pop_error(1))
+
+        self.specimen_item.update_point({'BSUSC': 2.5}, 2, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+        self.assertEqual(queue.flush(), 1)
+
+        self.assertEqual(self._stored_values('BSUSC'), [20.0, 1.5, 2.5])
+        self.assertIsNone(queue.pop_error(1))
+
+    def test_edits_are_dropped_after_the_last_failure(self):
+        queue = self._queue(max_failures=1)
+        self.specimen_item.update_point({'BSUSC': 1.5}, 1, 0)
+        queue.enqueue_measured_data(self.sample, self.specimen_item)
+
+        with patch.object(MeasuredDataService, 'update_columns_many', side_effect=RuntimeError('database is down')):
+            with self.assertRaises(WriteBehindError):
+                queue.flush(raise_errors=True)
+
+        self.assertEqual(len(queue), 0)
+        self.assertIn('discarded', queue.pop_error(1).reason)
+
+    def test_curie_point_deletions_are_written_with_one_query(self):
+        repository = CuriePointRepository(self.session)
+        curie_point_ids = [
+            repository.add_curie_point(self.specimen_item.specimen_item_id, 'CSUSC', 0, temperature, 1.0).curie_point_id
+            for temperature in (570.0, 580.0, 590.0)]
+        queue = self._queue()
+        self.statements.clear()
+
+        queue.enqueue_curie_point_deletion(self.sample, curie_point_ids[0])
+        queue.enqueue_curie_point_deletion(self.sample, curie_point_ids[2])
+        self.assertEqual(queue.flush(), 2)
+
+        self.assertEqual(len([statement for statement in self.statements if statement.startswith('DELETE')]), 1)
+        self.assertEqual([point.curie_point_id for point in self.session.query(CuriePoint)], [curie_point_ids[1]])
+
+    def test_flush_and_discard_select_the_edits(self):
+        queue = self._queue()
+        with patch.object(write_behind, 'get_session_scope', return_value=('kernel', 0)):
+            queue.enqueue_curie_point_deletion(self.sample, 1)
+        queue.enqueue_curie_point_deletion(MagicMock(sample_id=2), 2)
+
+        self.assertEqual(queue.flush(context_id='another kernel'), 0)
+        self.assertEqual(queue.flush(sample_id=1, context_id='kernel'), 1)
+        self.assertEqual(queue.discard(2), 1)
+        self.assertEqual(len(queue), 0)
+
+    def test_background_thread_writes_the_queue(self):
+        queue = self._queue(interval=0.01)
+        written = threading.Event()
+        threads = []
+
+        def write(measured_data, curie_point_deletions):
+            threads.append(threading.current_thread())
+            written.set()
+
+        with patch.object(queue, '_write', side_effect=write):
+            queue.enqueue_curie_point_deletion(self.sample, 1)
+            self.assertTrue(written.wait(5))
+
+        self.assertIsNot(threads[0], threading.current_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
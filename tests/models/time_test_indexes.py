@@ -0,0 +1,104 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from tma.core.model.migrations.upgrade import upgrade_database
+
+
+class TestLookupIndexes(unittest.TestCase):
+    """
+    Times the lookups of the repositories on 10^5 specimen items before and after the migration adding the
+    indexes, on an SQLite stand-in for PostgreSQL.
+    """
+    specimen_items = 100_000
+    specimen_items_per_sample = 10
+    lookups = 200
+
+    lookup_queries = {
+        'users.session_id': ('SELECT user_id FROM users WHERE session_id = :key', 'session'),
+        'samples.user_id': ('SELECT sample_id FROM samples WHERE user_id = :key', 'user'),
+        'specimenitems.sample_id': ('SELECT specimen_item_id FROM specimenitems WHERE sample_id = :key', 'sample'),
+        'measurements.specimen_item_id': (
+            'SELECT measurement_id FROM measurements WHERE specimen_item_id = :key', 'specimen_item'),
+        'measured_data.specimen_item_id': (
+            'SELECT measurement_data_id FROM measured_data WHERE specimen_item_id = :key', 'specimen_item'),
+        'measured_data.measurement_id': (
+            'SELECT measurement_data_id FROM measured_data WHERE measurement_id = :key', 'specimen_item'),
+        'curie_points.specimen_item_id': (
+            'SELECT curie_point_id FROM curie_points WHERE specimen_item_id = :key', 'specimen_item'),
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.engine = create_engine(f'sqlite:///{Path(directory.name) / "tma.db"}')
+        self.addCleanup(self.engine.dispose)
+        upgrade_database(self.engine, '0002')
+        self._fill()
+
+    def _fill(self):
+        samples = self.specimen_items // self.specimen_items_per_sample
+        ids = range(1, self.specimen_items + 1)
+        with self.engine.begin() as connection:
+            connection.execute(text('INSERT INTO users (user_id, session_id) VALUES (:id, :session_id)'),
+                               [{'id': index, 'session_id': f'session-{index}'} for index in range(1, samples + 1)])
+            connection.execute(
+                text("INSERT INTO samples (sample_id, user_id, x_column, y_column, selected_file_index) "
+                     "VALUES (:id, :id, 'TEMP', 'CSUSC', 0)"),
+                [{'id': index} for index in range(1, samples + 1)])
+            connection.execute(
+                text("INSERT INTO specimenitems (specimen_item_id, sample_id, filename) VALUES (:id, :sample_id, :name)"),
+                [{'id': index, 'sample_id': (index - 1) // self.specimen_items_per_sample + 1,
+                  'name': f'file_{index}.clw'} for index in ids])
+            connection.execute(
+                text("INSERT INTO measurements (measurement_id, specimen_item_id, measurement_type) "
+                     "VALUES (:id, :id, 'clw')"),
+                [{'id': index} for index in ids])
+            connection.execute(
+                text("INSERT INTO measured_data (measurement_id, specimen_item_id, column_name, data) "
+                     "VALUES (:id, :id, :column, '{}')"),
+                [{'id': index, 'column': column} for index in ids for column in ('TEMP', 'CSUSC')])
+            connection.execute(
+                text("INSERT INTO curie_points (specimen_item_id, column_name, id_plot_selected, temperature_value, "
+                     "magnetization_value) VALUES (:id, 'CSUSC', 0, 580.0, 1.0)"),
+                [{'id': index} for index in ids[::10]])
+
+    def _keys(self, kind):
+        rng = random.Random(0)
+        if kind == 'session':
+            return [f'session-{rng.randint(1, self.specimen_items // self.specimen_items_per_sample)}'
+                    for _ in range(self.lookups)]
+        if kind in ('user', 'sample'):
+            return [rng.randint(1, self.specimen_items // self.specimen_items_per_sample)
+                    for _ in range(self.lookups)]
+        return [rng.randint(1, self.specimen_items) for _ in range(self.lookups)]
+
+    def _time_lookups(self):
+        durations = {}
+        with self.engine.connect() as connection:
+            for name, (query, kind) in self.lookup_queries.items():
+                statement = text(query)
+                keys = self._keys(kind)
+                start_time = time.perf_counter()
+                for key in keys:
+                    connection.execute(statement, {'key': key}).all()
+                durations[name] = (time.perf_counter() - start_time) / self.lookups
+        return durations
+
+    def test_lookups(self):
+        before = self._time_lookups()
+        upgrade_database(self.engine)
+        after = self._time_lookups()
+
+        print(f'Lookups on {self.specimen_items} specimen items, seconds per lookup:')
+        for name in self.lookup_queries:
+            print(f'{name}: before {before[name]:.6f}, after {after[name]:.6f}, '
+                  f'speed-up x{before[name] / after[name]:.1f}')
+
+
+if __name__ == '__main__':
+    unittest.main()
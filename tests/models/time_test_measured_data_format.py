@@ -0,0 +1,60 @@
+import json
+import time
+import unittest
+
+import numpy as np
+
+from tma.core.model.column_codec import encode_columns, decode_columns, encode_measurement, decode_measurement
+
+
+class TestMeasuredDataFormat(unittest.TestCase):
+    repeats = 50
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # One column of a typical specimen: heating and cooling curves of 5000 points each
+        self.data = {'increasing': rng.normal(size=5000), 'decreasing': rng.normal(size=5000)}
+
+    def test_json(self):
+        self._measure('JSON', lambda: json.dumps({key: value.tolist() for key, value in self.data.items()}),
+                      lambda text: {key: np.array(value) for key, value in json.loads(text).items()})
+
+    def test_binary(self):
+        self._measure('Binary float64', lambda: encode_columns(self.data), decode_columns)
+
+    def test_binary_float32(self):
+        self._measure('Binary float32', lambda: encode_columns(self.data, dtype='float32'), decode_columns)
+
+    def test_binary_zlib(self):
+        self._measure('Binary zlib', lambda: encode_columns(self.data, compression='zlib'), decode_columns)
+
+    def test_measurement_rows_json(self):
+        measured_data = {column: self.data for column in ('TEMP', 'BSUSC', 'CSUSC', 'TSUSC', 'NSUSC')}
+        self._measure('Measurement as JSON rows',
+                      lambda: [json.dumps({key: value.tolist() for key, value in data.items()})
+                               for data in measured_data.values()],
+                      lambda rows: [{key: np.array(value) for key, value in json.loads(row).items()} for row in rows])
+
+    def test_measurement_blob(self):
+        measured_data = {column: self.data for column in ('TEMP', 'BSUSC', 'CSUSC', 'TSUSC', 'NSUSC')}
+        self._measure('Measurement as one blob', lambda: encode_measurement(measured_data),
+                      lambda blob: decode_measurement(blob, writable=True))
+
+    def _measure(self, name, encode, decode):
+        start_time = time.perf_counter()
+        for _ in range(self.repeats):
+            stored = encode()
+        encode_duration = (time.perf_counter() - start_time) / self.repeats
+
+        start_time = time.perf_counter()
+        for _ in range(self.repeats):
+            decode(stored)
+        decode_duration = (time.perf_counter() - start_time) / self.repeats
+
+        size = sum(len(item) for item in stored) if isinstance(stored, list) else len(stored)
+        print(f"{name}: size {size} bytes, encode {encode_duration:.6f} seconds, "
+              f"decode {decode_duration:.6f} seconds")
+
+
+if __name__ == '__main__':
+    unittest.main()